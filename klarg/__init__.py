@@ -0,0 +1,2319 @@
+import os
+import sys
+
+# Annotations that need typing are written as strings, and the names in
+# them are only imported by type checkers, so that importing klarg does not
+# import typing, which takes longer than klarg. Every module of klarg does
+# the same
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from array import array
+    from typing import Callable, Union
+    from klarg._files import file_value
+    from klarg._parsed import parsed
+
+# Some information about this package
+__version__ = "1.1.0"
+
+# Functions and classes that are only loaded the first time they are used
+_LAZY_NAMES = {
+    "iter_paths": "klarg._paths",
+    "validate": "klarg._validate",
+    "cache_parse": "klarg._cache",
+    "base_cache_parse": "klarg._cache",
+    "dispatch": "klarg._dispatch",
+    "base_dispatch": "klarg._dispatch",
+    "get_parsed": "klarg._parsed",
+    "base_get_parsed": "klarg._parsed",
+    "parsed": "klarg._parsed",
+    "export_parsed": "klarg._parsed",
+    "base_export_parsed": "klarg._parsed",
+    "codegen": "klarg._codegen",
+    "find_plugins": "klarg._plugins",
+    "cli": "klarg._cli",
+    "get_into": "klarg._cli",
+    "base_get_into": "klarg._cli",
+    "serve": "klarg._daemon",
+    "client": "klarg._daemon",
+    "get_file": "klarg._files",
+    "base_get_file": "klarg._files",
+    "file_value": "klarg._files",
+}
+
+
+# The type of a read only view of a dictionary, without importing types
+_MappingProxy = type(type.__dict__)
+
+
+def _frozen(key: str, value):
+    # A dictionary in CONFIG could be changed in place without CONFIG
+    # seeing it, so a read only copy of it is kept instead
+    if key == "prefix_schemes" and hasattr(value, "keys"):
+        return _MappingProxy(dict(value))
+
+    return value
+
+
+class _Config(dict):
+    """
+    The type of `CONFIG`, a dictionary that throws away the compiled
+    settings whenever it is changed, so that they are compiled again the
+    next time they are needed. `"prefix_schemes"` is kept as a read only
+    copy, so that it can only be changed by setting it again.
+    """
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, {
+            key: _frozen(key, value)
+            for key, value in dict(*args, **kwargs).items()
+        })
+
+    def changed(self) -> None:
+        globals()["_SETTINGS"] = None
+
+    def __setitem__(self, key: str, value) -> None:
+        dict.__setitem__(self, key, _frozen(key, value))
+        self.changed()
+
+    def __delitem__(self, key: str) -> None:
+        dict.__delitem__(self, key)
+        self.changed()
+
+    def __ior__(self, other: dict) -> "_Config":
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs) -> None:
+        dict.update(self, {
+            key: _frozen(key, value)
+            for key, value in dict(*args, **kwargs).items()
+        })
+        self.changed()
+
+    def setdefault(self, key: str, default=None):
+        value = dict.setdefault(self, key, _frozen(key, default))
+        self.changed()
+        return value
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self.changed()
+        return value
+
+    def popitem(self) -> tuple:
+        item = dict.popitem(self)
+        self.changed()
+        return item
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self.changed()
+
+
+# The configuration settings, this can be changed with the configure function
+CONFIG = _Config({
+    "needs_short_flags": False,
+    "long_prefix": "--",
+    "short_prefix": "-",
+    "help_flag": ("--help", "-h"),
+    "version_flag": ("--version", "-v"),
+    "bytes_mode": False,
+    "prefix_schemes": {},
+    "index_workers": 1
+})
+
+# The compiled CONFIG, see _settings()
+_SETTINGS = None
+
+# The kinds of arguments stored in _ArgIndex.kinds
+_VALUE = 0
+_LONG_FLAG = 1
+_SHORT_FLAG = 2
+
+# Added to the kind of a flag given with a prefix that turns it off
+_NEGATED = 4
+
+# The fewest arguments that are indexed in each part of a list, when
+# "index_workers" is more than 1. Forking a process for a part took about
+# 6 ms and indexing an argument about 0.45 us when this was measured, so
+# lists are only split when every part saves more than its process costs
+_INDEX_CHUNK = 1 << 16
+
+# The kinds of flags that can be given in "prefix_schemes"
+_SCHEME_KINDS = {"long": _LONG_FLAG, "short": _SHORT_FLAG}
+
+
+class _Settings():
+    """
+    `CONFIG` compiled for the base functions, with the prefixes and the
+    help and version flags in the same type as the arguments, and every
+    flag name only put together once. It can't be changed, a new one is
+    compiled when `CONFIG` is. The settings for `bytes` arguments are
+    compiled along with the ones for `str` and can be found with
+    `typed()`.
+
+    Every prefix, the long and short prefix and the ones in
+    `"prefix_schemes"`, is put in `schemes` under its first character,
+    longest first, so that an argument is classified by looking up its
+    first character and trying the few prefixes that start with it.
+    """
+
+    __slots__ = (
+        "config",
+        "binary",
+        "text",
+        "bytes",
+        "needs_short_flags",
+        "bytes_mode",
+        "long_prefix",
+        "short_prefix",
+        "help_flag",
+        "version_flag",
+        "reserved",
+        "schemes",
+        "plain",
+        "index_workers",
+        "long_names",
+        "short_names",
+    )
+
+    def __init__(self, config: dict, text: "Union[_Settings, None]" = None):
+        binary = text is not None
+        encode = os.fsencode if binary else str
+        init = object.__setattr__
+
+        init(self, "config", config)
+        init(self, "binary", binary)
+        init(self, "needs_short_flags", config["needs_short_flags"])
+        init(self, "bytes_mode", config["bytes_mode"])
+        init(self, "long_prefix", encode(config["long_prefix"]))
+        init(self, "short_prefix", encode(config["short_prefix"]))
+        init(self, "help_flag", tuple(map(encode, config["help_flag"])))
+        init(self, "version_flag", tuple(map(encode, config["version_flag"])))
+
+        # Values can't be any of the help or version flags
+        init(self, "reserved", frozenset(self.help_flag + self.version_flag))
+
+        # Maps every prefix to the kind of flag it gives and the prefix the
+        # flag is looked up with
+        prefixes = {
+            self.long_prefix: (_LONG_FLAG, self.long_prefix),
+            self.short_prefix: (_SHORT_FLAG, self.short_prefix),
+        }
+        for prefix, scheme in config["prefix_schemes"].items():
+            if type(scheme) == str:
+                scheme = (scheme, True)
+
+            kind, enables = scheme
+            if kind not in _SCHEME_KINDS or not prefix:
+                raise Exception(
+                    f"Unknown prefix scheme \"{prefix}\": {scheme}, the kind "
+                    f"has to be one of {', '.join(_SCHEME_KINDS)}"
+                )
+
+            kind = _SCHEME_KINDS[kind]
+            primary = self.long_prefix if kind == _LONG_FLAG else (
+                self.short_prefix
+            )
+            prefixes[encode(prefix)] = (
+                kind if enables else kind | _NEGATED,
+                primary
+            )
+
+        schemes = {}
+        for prefix in sorted(prefixes, key=len, reverse=True):
+            kind, primary = prefixes[prefix]
+            schemes.setdefault(prefix[0:1], []).append((prefix, kind, primary))
+
+        init(self, "schemes", {
+            first: tuple(found) for first, found in schemes.items()
+        })
+
+        # Only the long and short prefix are used
+        init(self, "plain", not config["prefix_schemes"])
+
+        # None uses every CPU
+        workers = config.get("index_workers", 1)
+        if workers is None:
+            workers = _usable_cpus()
+        if type(workers) != int or workers < 1:
+            raise Exception(
+                f"\"index_workers\" has to be a number above 0 or None, "
+                f"not {workers!r}"
+            )
+        init(self, "index_workers", workers)
+
+        # Maps names to the flag names made from them
+        init(self, "long_names", {})
+        init(self, "short_names", {})
+
+        init(self, "text", text if binary else self)
+        init(self, "bytes", self if binary else _Settings(config, self))
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Compiled settings can't be changed")
+
+    def typed(self, binary: bool) -> "_Settings":
+        """
+        Returns the settings for arguments that are `bytes` or `str`.
+        """
+
+        return self.bytes if binary else self.text
+
+    def encode(self, text: "Union[str, bytes]") -> "Union[str, bytes]":
+        """
+        Returns `text` as the same type as the arguments.
+        """
+
+        if type(text) == str:
+            return os.fsencode(text) if self.binary else text
+
+        return text if self.binary else os.fsdecode(text)
+
+    def intern(self, arg: "Union[str, bytes]") -> "Union[str, bytes]":
+        # Only text can be interned, bytes keep the first copy of a flag
+        return arg if self.binary else sys.intern(arg)
+
+    def flag_name(
+        self,
+        names: dict,
+        prefix: "Union[str, bytes]",
+        name: "Union[str, bytes]"
+    ) -> "Union[str, bytes]":
+        flag = names.get(name)
+        if flag is None:
+            # Keeps names made up while running from piling up
+            if len(names) >= 1024:
+                names.clear()
+
+            flag = names[name] = self.intern(prefix + self.encode(name))
+
+        return flag
+
+    def long_name(self, name: "Union[str, bytes]") -> "Union[str, bytes]":
+        return self.flag_name(self.long_names, self.long_prefix, name)
+
+    def short_name(self, name: "Union[str, bytes]") -> "Union[str, bytes]":
+        return self.flag_name(self.short_names, self.short_prefix, name)
+
+    def classify(self, arg: "Union[str, bytes]") -> tuple:
+        """
+        Returns the kind of `arg` and the name it is looked up with, which
+        has the long or short prefix in place of the prefix it was given
+        with.
+        """
+
+        for prefix, kind, primary in self.schemes.get(arg[0:1], ()):
+            if arg.startswith(prefix):
+                if prefix != primary:
+                    arg = primary + arg[len(prefix):]
+
+                return kind, arg
+
+        return _VALUE, arg
+
+    def kind(self, arg: "Union[str, bytes]") -> int:
+        return self.classify(arg)[0]
+
+    def is_value(self, arg: "Union[str, bytes]") -> bool:
+        # Flags and the help and version flags can't be values
+        return self.kind(arg) == _VALUE and arg not in self.reserved
+
+
+def _settings() -> _Settings:
+    """
+    Returns the compiled `CONFIG`, compiling it again if it was changed
+    since it was last compiled.
+    """
+
+    settings = _SETTINGS
+    if settings is None or settings.config is not CONFIG:
+        config = CONFIG
+
+        # A plain dictionary put in place of CONFIG can't tell when it is
+        # changed, so it is wrapped once
+        if type(config) != _Config:
+            config = globals()["CONFIG"] = _Config(config)
+
+        settings = _Settings(config)
+        globals()["_SETTINGS"] = settings
+
+    return settings
+
+
+def _all_args() -> list:
+    """
+    Returns `ALL_ARGS`, copying it from `sys.argv` the first time it is
+    needed instead of when klarg is imported.
+    """
+
+    all_args = globals().get("ALL_ARGS")
+    if all_args is None:
+        all_args = sys.argv[1: len(sys.argv)]
+
+        # The bytes the arguments were given as, before they were decoded
+        if _settings().bytes_mode:
+            all_args = [os.fsencode(arg) for arg in all_args]
+
+        globals()["ALL_ARGS"] = all_args
+
+    return all_args
+
+
+def __getattr__(name: str):
+    # All the command line arguments
+    if name == "ALL_ARGS":
+        return _all_args()
+
+    if name in _LAZY_NAMES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_NAMES[name]), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module 'klarg' has no attribute '{name}'")
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_NAMES) | {"ALL_ARGS"})
+
+
+# Token indexes built by _index_for(), keyed by the id of the argument list
+_INDEXES = {}
+
+
+def _index_range(
+    args_list: list,
+    start: int,
+    end: int,
+    settings: _Settings
+) -> tuple:
+    """
+    Returns the kind of every argument from `start` to `end` and the
+    positions every flag occurs at in them, the loop of `_ArgIndex.add()`
+    written out because it runs for every argument.
+    """
+
+    from array import array
+
+    long_prefix = settings.long_prefix
+    short_prefix = settings.short_prefix if settings.plain else None
+    schemes = settings.schemes
+    intern = settings.intern
+    kinds = bytearray(end - start)
+    positions = {}
+
+    if start != 0 or end != len(args_list):
+        args_list = args_list[start:end]
+
+    for position, arg in enumerate(args_list, start):
+        # Only the long and short prefix are checked directly, which is
+        # quicker than looking them up
+        if short_prefix is not None:
+            if arg.startswith(long_prefix):
+                kinds[position - start] = _LONG_FLAG
+            elif arg.startswith(short_prefix):
+                kinds[position - start] = _SHORT_FLAG
+            else:
+                continue
+
+        else:
+            found = schemes.get(arg[0:1])
+            if found is None:
+                continue
+
+            for prefix, kind, primary in found:
+                if arg.startswith(prefix):
+                    break
+            else:
+                continue
+
+            kinds[position - start] = kind
+            if prefix != primary:
+                arg = primary + arg[len(prefix):]
+
+        flag_positions = positions.get(arg)
+        if flag_positions is None:
+            # Every flag name is only stored once
+            arg = intern(arg)
+            flag_positions = positions[arg] = array("I")
+
+        flag_positions.append(position)
+
+    return kinds, positions
+
+
+# The argument list being indexed by _index_parallel(), which processes
+# forked to index part of it read instead of being sent a copy
+_PARALLEL_ARGS = None
+
+
+def _index_chunk(bounds: tuple) -> tuple:
+    """
+    Indexes part of `_PARALLEL_ARGS` for `_index_parallel()`, and returns
+    the kinds, the flags in the order they were first given, how many
+    times each was given and all their positions one flag after another.
+    A few flat buffers are sent back much faster than an array for every
+    flag.
+    """
+
+    from array import array
+
+    start, end, binary = bounds
+    kinds, positions = _index_range(
+        _PARALLEL_ARGS,
+        start,
+        end,
+        _settings().typed(binary)
+    )
+
+    counts = array("I")
+    flat = array("I")
+    for flag_positions in positions.values():
+        counts.append(len(flag_positions))
+        flat += flag_positions
+
+    return bytes(kinds), list(positions), counts.tobytes(), flat.tobytes()
+
+
+def _usable_cpus() -> int:
+    # The CPUs this process can run on, which can be fewer than the
+    # machine has
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def _index_parallel(args_list: list, settings: _Settings, workers: int):
+    """
+    Returns what `_index_range()` does for the whole list, indexing parts
+    of it at the same time in processes forked for it, or threads on
+    builds of Python without the GIL, and joining them in order. Every
+    argument is classified on its own and values are found next to their
+    flag when they are looked up, so a flag and its value can be in
+    different parts. Returns the list indexed in this process when there
+    is only one CPU to use, or when processes are not started with `fork`,
+    since any other way would copy the arguments to every process.
+    """
+
+    global _PARALLEL_ARGS
+
+    workers = min(workers, _usable_cpus())
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    context = None
+    if workers > 1 and gil_enabled:
+        import multiprocessing
+
+        # The start method the program chose, or the default one, without
+        # choosing it for the program
+        method = multiprocessing.get_start_method(allow_none=True)
+        if method is None:
+            method = multiprocessing.get_all_start_methods()[0]
+        if method == "fork":
+            context = multiprocessing.get_context(method)
+
+    if workers < 2 or (gil_enabled and context is None):
+        return _index_range(args_list, 0, len(args_list), settings)
+
+    size = len(args_list)
+    chunk = max(_INDEX_CHUNK, -(-size // (workers * 4)))
+    bounds = [
+        (start, min(start + chunk, size), settings.binary)
+        for start in range(0, size, chunk)
+    ]
+
+    _PARALLEL_ARGS = args_list
+    try:
+        if gil_enabled:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = ProcessPoolExecutor(
+                max_workers=min(workers, len(bounds)),
+                mp_context=context
+            )
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            executor = ThreadPoolExecutor(
+                max_workers=min(workers, len(bounds))
+            )
+
+        with executor:
+            parts = list(executor.map(_index_chunk, bounds))
+
+    finally:
+        _PARALLEL_ARGS = None
+
+    from array import array
+
+    # Parts are joined in order, so the positions of every flag stay in
+    # order and flags are found in the order they were first given
+    kinds = bytearray()
+    positions = {}
+    intern = settings.intern
+    for part_kinds, flags, counts, flat in parts:
+        kinds += part_kinds
+
+        part_counts = array("I")
+        part_counts.frombytes(counts)
+        part_positions = array("I")
+        part_positions.frombytes(flat)
+
+        offset = 0
+        for flag, count in zip(flags, part_counts):
+            flag_positions = part_positions[offset:offset + count]
+            offset += count
+
+            found = positions.get(flag)
+            if found is None:
+                positions[intern(flag)] = flag_positions
+            else:
+                found += flag_positions
+
+    return kinds, positions
+
+
+class _ArgIndex():
+    """
+    A single pass over an argument list that records where every flag
+    occurs and how many times it was given, so that the base functions
+    can answer lookups without scanning the list again. It is kept small
+    for very long lists, the kind of every argument takes a byte and every
+    occurrence of a flag takes 4 bytes. A list of `bytes` is indexed as
+    `bytes`, with the settings compiled for `bytes`.
+    """
+
+    def __init__(self, args_list: list):
+        from array import array
+
+        self.args_list = args_list
+        self.config = _settings()
+        self.set_binary(bool(args_list) and type(args_list[0]) == bytes)
+        self.new_positions = array
+
+        # Maps every flag to the number of times it was given, stacked
+        # short flags such as -vvv count once for every letter
+        self.counts = {}
+
+        # The kind of every argument, see _VALUE, _LONG_FLAG, _SHORT_FLAG and
+        # _NEGATED, and a map of every flag to the positions it occurs at,
+        # found in parts at the same time for very long lists
+        workers = self.settings.index_workers
+        if workers > 1 and len(args_list) >= 2 * _INDEX_CHUNK:
+            self.kinds, self.positions = _index_parallel(
+                args_list,
+                self.settings,
+                workers
+            )
+        else:
+            self.kinds, self.positions = _index_range(
+                args_list,
+                0,
+                len(args_list),
+                self.settings
+            )
+
+        # Counting once for every different flag is cheaper than counting
+        # every argument
+        long_prefix = self.long_prefix
+        for flag, flag_positions in self.positions.items():
+            self.counts[flag] = self.counts.get(flag, 0) + len(flag_positions)
+            if not flag.startswith(long_prefix):
+                self.count_stacked(flag, len(flag_positions))
+
+    @property
+    def size(self) -> int:
+        return len(self.kinds)
+
+    def set_binary(self, binary: bool) -> None:
+        self.binary = binary
+        self.settings = self.config.typed(binary)
+        self.long_prefix = self.settings.long_prefix
+        self.short_prefix = self.settings.short_prefix
+        self.intern = self.settings.intern
+        self.encode = self.settings.encode
+        self.classify = self.settings.classify
+        self.kind = self.settings.kind
+
+    def is_flag(self, arg: str) -> bool:
+        return self.kind(arg) != _VALUE
+
+    def is_flag_at(self, position: int) -> bool:
+        return self.kinds[position] != _VALUE
+
+    def count_stacked(self, arg: str, times: int) -> None:
+        # Stacked short flags (-vvv) also count towards the single letter
+        letters = arg[len(self.short_prefix):]
+        if len(letters) > 1 and letters == letters[0:1] * len(letters):
+            stacked = self.intern(self.short_prefix + letters[0:1])
+            self.counts[stacked] = self.counts.get(stacked, 0) + (
+                times * len(letters)
+            )
+
+            if not self.counts[stacked]:
+                del self.counts[stacked]
+
+    def add(self, arg: str) -> None:
+        if not self.kinds and self.binary != (type(arg) == bytes):
+            self.set_binary(type(arg) == bytes)
+
+        kind, arg = self.classify(arg)
+        position = len(self.kinds)
+        self.kinds.append(kind)
+
+        if kind == _VALUE:
+            return
+
+        if arg not in self.positions:
+            arg = self.intern(arg)
+            self.positions[arg] = self.new_positions("I")
+
+        self.positions[arg].append(position)
+        self.counts[arg] = self.counts.get(arg, 0) + 1
+
+        if kind & _SHORT_FLAG:
+            self.count_stacked(arg, 1)
+
+    def remove(self, arg: str) -> None:
+        """
+        Undoes `add()` for the last argument in the list.
+        """
+
+        kind = self.kinds.pop()
+
+        if kind == _VALUE:
+            return
+
+        arg = self.classify(arg)[1]
+        positions = self.positions[arg]
+        positions.pop()
+        if not positions:
+            del self.positions[arg]
+
+        if self.counts[arg] == 1:
+            del self.counts[arg]
+        else:
+            self.counts[arg] -= 1
+
+        if kind & _SHORT_FLAG:
+            self.count_stacked(arg, -1)
+
+    def count(self, flag: str) -> int:
+        return self.counts.get(flag, 0)
+
+    def is_on(self, *flags: str) -> "Union[bool, None]":
+        """
+        Returns whether the last of `flags` given was turned on or off, or
+        None if none of them were given.
+        """
+
+        last = None
+        for flag in flags:
+            positions = self.positions.get(flag)
+            if positions and (last is None or positions[-1] > last):
+                last = positions[-1]
+
+        if last is None:
+            return None
+
+        return not self.kinds[last] & _NEGATED
+
+    def occurrences(self, flag: str) -> "array":
+        return self.positions.get(flag, ())
+
+
+def _reindex(args_list: list) -> _ArgIndex:
+    index = _ArgIndex(args_list)
+    _INDEXES[id(args_list)] = index
+    return index
+
+
+def _index_for(args_list: list) -> _ArgIndex:
+    index = _INDEXES.get(id(args_list))
+
+    # The list was replaced, changed size or CONFIG was changed
+    if (
+        index is None
+        or index.args_list is not args_list
+        or index.size != len(args_list)
+        or index.config is not _settings()
+    ):
+        # Keeps the cache from growing without bound
+        if len(_INDEXES) >= 64:
+            _INDEXES.clear()
+
+        index = _reindex(args_list)
+
+    return index
+
+
+"""
+Here is a list of all the base functions
+"""
+
+
+def base_exists(name: str, args_list: list) -> bool:
+    index = _index_for(args_list)
+    kind, flag = index.classify(index.encode(name))
+
+    # Flags are answered by the index, anything else needs a scan
+    if kind != _VALUE:
+        return flag in index.positions
+
+    return flag in args_list
+
+
+def base_get_all(args_list: list) -> list:  # bigoof
+    # A copy, the index of a list is kept until it changes size, so the
+    # list itself must not be changed in place
+    return list(args_list)
+
+
+def base_get_bool(
+    name: str,
+    args_list: list,
+    short: str = "default-str"
+) -> bool:
+    index = _index_for(args_list)
+    long_name = index.settings.long_name(name)
+    short_name = index.settings.short_name(short)
+
+    # The last time the flag was given decides, it is False if it was
+    # given with a prefix that turns it off
+    if short == "default-short":
+        if (index.settings.needs_short_flags):
+            raise Exception(
+                "No short flag for get_bool()"
+            )
+
+        else:
+            return bool(index.is_on(long_name))
+    else:
+        return bool(index.is_on(long_name, short_name))
+
+
+def base_on_help(action: "Callable", args_list: list) -> None:
+    """
+    `action: function: NEEDED`
+
+    The `action` is run when klarg detects the help flag.
+    What klarg looks for can be configured in `CONFIG`
+    with the option `"help_flag"`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    def display_help_message():
+        print("Here you go")
+
+    klarg.on_help(display_help_message)
+
+    # python docs_example.py --help
+    # Here you go
+    ```
+
+    """
+
+    long_help, short_help = _index_for(args_list).settings.help_flag
+
+    if base_exists(long_help, args_list):
+        action()
+
+    if base_exists(short_help, args_list):
+        action()
+
+
+def base_on_version(message: str, args_list: list) -> None:
+    """
+    `message: str: NEEDED`
+
+    Klarg displays the `message` when the version flag is detected.
+    What klarg looks for can be configured in `CONFIG`
+    with the option `"version_flag"`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    klarg.project_version("This project version is 1.2.3")
+
+    # python docs_example.py --version
+    # This project version is 1.2.3
+    ```
+
+    """
+
+    long_version, short_version = _index_for(args_list).settings.version_flag
+
+    if exists(long_version) or exists(short_version):
+        print(message)
+
+    if base_exists(short_version, args_list):
+        print(message)
+
+
+# What get_str prints when there is no handler in on_error for an error
+_ERROR_MESSAGES = {
+    "ERR_NONE": "ERR_NONE: There is no value provided for {}",
+    "ERR_MUL": "ERR_MUL: There are multiple values provided for {}",
+}
+
+
+def _handle_error(
+    on_error: dict,
+    error: str,
+    long_name: "Union[str, bytes]"
+) -> None:
+    # Runs the handler given in on_error, or prints the error and exits,
+    # without changing the dictionary, which is often the shared default
+    # of a function
+    handler = on_error.get(error)
+    if handler is not None:
+        handler()
+        return
+
+    print(_ERROR_MESSAGES[error].format(os.fsdecode(long_name)))
+    exit(1)
+
+
+def _next_value(
+    positions: "array",
+    args_list: list,
+    settings: _Settings,
+    on_error: dict,
+    long_name: "Union[str, bytes]"
+) -> "Union[str, None]":
+    """
+    Returns the value after the first position of a flag, or handles
+    `ERR_NONE` when it is the last argument or is followed by a flag.
+    """
+
+    index_point = positions[0]
+
+    # ERR_NONE
+    # The flag is the last argument
+    if index_point + 1 >= len(args_list):
+        _handle_error(on_error, "ERR_NONE", long_name)
+        return None
+
+    next_value = args_list[(index_point + 1)]
+
+    # Makes sure it is not a flag or one of the help or version flags
+    if (settings.is_value(next_value)):
+        return next_value
+
+    else:  # ERR_NONE
+        # If there is no argument passed to
+        # long_args
+        _handle_error(on_error, "ERR_NONE", long_name)
+
+
+def base_get_str(
+    name: str,
+    args_list: list,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> "Union[str, None]":
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `on_error: function: optional`
+
+    `get_str` is a function that collects a `name`,
+     which is the multi letter flag, a `short`, which is the
+     shortened version of the flag. There is only one type of
+     errors it can encounter, which is when no value is provided.
+     Because of this, `on_error` is not a dictionary,
+     but a special function that handles when no value is provided.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    def handle_error_none():
+        print(f"No values provided")
+
+    some_str = klarg.get_str("--some-str", "-s", on_error=handle_error_none)
+
+    print(f"{some_str} is cool")
+
+    # python docs_example.py --some-str
+    # No values provided
+
+    # python docs_example.py -s "klarg"
+    # klarg is cool
+    ```
+
+    """
+
+    index = _index_for(args_list)
+    settings = index.settings
+    long_name = settings.long_name(name)
+
+    long_positions = index.occurrences(long_name)
+    short_positions = index.occurrences(settings.short_name(short))
+
+    non_existent_long_name = not long_positions
+    non_existent_short_name = not short_positions
+
+    # Does not exist in command line args
+    if non_existent_long_name and non_existent_short_name:
+        return None
+
+    # ERR_NONE
+    # Ther cannot be enough space for the argument and
+    # it's value
+    if len(args_list) < 2:
+        _handle_error(on_error, "ERR_NONE", long_name)
+
+    # ERR_MUL
+    # If there is more than one occurence of short_name or long_name
+    if (len(long_positions) > 1) or (len(short_positions) > 1):
+        _handle_error(on_error, "ERR_MUL", long_name)
+
+    # ERR_MUL
+    # if both short and long arguments exists
+    if long_positions and short_positions:
+        _handle_error(on_error, "ERR_MUL", long_name)
+
+    if short == "default-short":
+        if (settings.needs_short_flags):
+            raise Exception(
+                f"No short flag for {os.fsdecode(long_name)}"
+            )
+        else:
+            return _next_value(
+                long_positions, args_list, settings, on_error, long_name
+            )
+    else:
+        if long_positions:
+            return _next_value(
+                long_positions, args_list, settings, on_error, long_name
+            )
+
+        elif short_positions:
+            return _next_value(
+                short_positions, args_list, settings, on_error, long_name
+            )
+
+        else:  # If it does not exist
+            return None
+
+
+def base_get_num(
+    name: str,
+    args_list: dict,
+    short: str = "default-short",
+    on_error: dict = {},
+) -> "Union[int, float, None]":
+
+    def to_num(string: str) -> "Union[int, float, str]":
+        if (b"." if type(string) == bytes else ".") in string:
+            return float(string)
+        else:
+            try:
+                return int(string)
+            except ValueError:
+                return string
+
+    # Default handling for ERR_NUM
+    def default_handle_num(value):
+        print(f"ERR_NUM: \"{value}\" is not a number")
+        exit(1)
+
+    handle_num = on_error.get("ERR_NUM", default_handle_num)
+
+    value = base_get_str(
+        name=name,
+        short=short,
+        on_error=on_error,
+        args_list=args_list
+    )
+
+    if value is None:
+        return None
+
+    num = to_num(value)
+
+    if type(num) in (str, bytes):
+        handle_num(value)
+    else:
+        return num
+
+
+def base_get_count(
+    name: str,
+    args_list: list,
+    short: str = "default-short"
+) -> int:
+    index = _index_for(args_list)
+    long_name = index.settings.long_name(name)
+    short_name = index.settings.short_name(short)
+
+    if short == "default-short":
+        if (index.settings.needs_short_flags):
+            raise Exception(
+                f"No short flag for {_settings().long_name(name)}"
+            )
+
+        return index.count(long_name)
+
+    return index.count(long_name) + index.count(short_name)
+
+
+def base_get_list(
+    name: str,
+    args_list: list,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> list:
+    settings = _settings()
+    long_name = settings.long_name(name)
+
+    # Default handling for ERR_NONE
+    def default_handle_none():
+        print(f"ERR_NONE: There is no value provided for {long_name}")
+        exit(1)
+
+    handle_none = on_error.get("ERR_NONE", default_handle_none)
+
+    if (short == "default-short") and (settings.needs_short_flags):
+        raise Exception(
+            f"No short flag for {long_name}"
+        )
+
+    index = _index_for(args_list)
+    positions = index.occurrences(index.settings.long_name(name))
+
+    if short != "default-short":
+        # Keeps the values in the order they were given
+        short_positions = index.occurrences(index.settings.short_name(short))
+        positions = sorted([*positions, *short_positions])
+
+    values = []
+    for position in positions:
+        if position + 1 >= len(args_list) or index.is_flag_at(position + 1):
+            handle_none()
+            continue
+
+        values.append(args_list[position + 1])
+
+    return values
+
+
+"""
+-------------------------------------------- KLARG BASIC
+"""
+
+
+def configure(**settings) -> None:
+    """
+    `**settings: any: optional`
+
+    Changes the settings in `CONFIG` given as keyword arguments and
+    compiles them at once, so that a mistake in them is found here and
+    not by the first function that uses them. The flag names klarg puts
+    together and the arguments it has already looked through are worked
+    out again after `CONFIG` changes, whether it was changed with
+    `configure` or by setting a key of `CONFIG`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    klarg.configure(long_prefix="+", needs_short_flags=True)
+
+    name = klarg.get_str("name", "n")
+    print(f"Your name is: {name}")
+
+    # python docs_example.py +name klarg
+    # Your name is: klarg
+    ```
+
+    """
+
+    config = _settings().config
+
+    for name in settings:
+        if name not in config:
+            raise Exception(
+                f"Unknown setting \"{name}\", it has to be one of "
+                f"{', '.join(config)}"
+            )
+
+    # Settings that can't be compiled are found before CONFIG is changed
+    _Settings({**config, **settings})
+
+    config.update(settings)
+
+
+def exists(name: str) -> bool:
+    """
+    `name: str: NEEDED`
+
+    Checks if the `name` exists in the list of command line arguments given,
+    this was designed to be an internal function for making things more
+    readable, but then I realized that it could potentially be helpful.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    something_exists = klarg.exists("something")
+    if something_exists:
+        print("Something exists")
+    else:
+        print("Nothing exists (that's kind of dark)")
+
+    # python docs_example.py does something exist
+    # Something exists
+
+    # python docs_example.py does nothing exist
+    # Nothing exists (that's kind of dark)
+```
+
+    """
+
+    return base_exists(name=name, args_list=_all_args())
+
+
+def get_all() -> list:
+    """
+    Collects all the arguments passed and returns a copy of them as a
+    list full of strings. This is useful when a program needs to collect
+    a list of all the arguments passed on to operate on,
+    it passes everything single option passed to the file
+
+    Example:
+`   ```py
+    # docs_example.py
+    import klarg
+
+    all_args = klarg.get_all()
+    print(f"All args {all_args}")
+
+    # python docs_example.py -a -b "c" -d --efgh --ijklmn 0
+    # All args ['-a', '-b', 'c', '-d', '--efgh', '--ijklmn', '0']
+    ```
+
+    """
+
+    return base_get_all(_all_args())
+
+
+def get_bool(name: str, short: str = "default-short") -> bool:
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `get_bool` is a function that collects `name`, a string, and `short`,
+    also a string. `name` is the long name for the command line argument,
+    i.e. (`--long-name`). `short` is the shorter name for the command
+    line argument (`-s`). Normally, if `short` is not given,
+    then it will not raise an error, unless `"needs_short_flags"`
+    is set to `True` in `CONFIG`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    is_there = klarg.bool("--is-there", "-i")
+
+    if (is_there):
+        print("Is there")
+    else:
+        print("Is not there")
+
+    # python docs_example.py
+    # Is not there
+
+    # python docs_example.py --is-there
+    # is there
+    ```
+
+    """
+
+    return base_get_bool(
+        name=name,
+        short=short,
+        args_list=_all_args()
+    )
+
+
+def on_help(action: "Callable") -> None:
+    """
+    `action: function: NEEDED`
+
+    The `action` is run when klarg detects the help flag.
+    What klarg looks for can be configured in `CONFIG`
+    with the option `"help_flag"`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    def display_help_message():
+        print("Here you go")
+
+    klarg.on_help(display_help_message)
+
+    # python docs_example.py --help
+    # Here you go
+    ```
+
+    """
+
+    return base_on_help(
+        action=action,
+        args_list=_all_args()
+    )
+
+
+def on_version(message: str) -> None:
+    """
+    `message: str: NEEDED`
+
+    Klarg displays the `message` when the version flag is detected.
+    What klarg looks for can be configured in `CONFIG`
+    with the option `"version_flag"`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    klarg.project_version("This project version is 1.2.3")
+
+    # python docs_example.py --version
+    # This project version is 1.2.3
+    ```
+
+    """
+
+    return base_on_version(
+        message=message,
+        args_list=_all_args()
+    )
+
+
+def get_str(
+    name: str,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> "Union[str, None]":
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `on_error: function: optional`
+
+    `get_str` is a function that collects a `name`,
+     which is the multi letter flag, a `short`, which is the
+     shortened version of the flag. There is only one type of
+     errors it can encounter, which is when no value is provided.
+     Because of this, `on_error` is not a dictionary,
+     but a special function that handles when no value is provided.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    def handle_error_none():
+        print(f"No values provided")
+
+    some_str = klarg.get_str("--some-str", "-s", on_error=handle_error_none)
+
+    print(f"{some_str} is cool")
+
+    # python docs_example.py --some-str
+    # No values provided
+
+    # python docs_example.py -s "klarg"
+    # klarg is cool
+    ```
+
+    """
+
+    return base_get_str(
+        name=name,
+        short=short,
+        on_error=on_error,
+        args_list=_all_args()
+    )
+
+
+def get_num(
+    name: str,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> "Union[int, float, None]":
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `on_error: dict: optional`
+
+    `get_num` is a function that collects a `name`,
+    which is the multi letter flag, a `short`,
+    which is the shortened version of the flag.
+    There are two possible types of errors it can encounter,
+    one being that the value it got was not a number, it did not
+    get a value at all, or that there are multiple declarations of that flag.
+    he error names are `ERR_NUM`, `ERR_NONE` and `ERR_MUL` respectively.
+    `on_error` is a dictionary, all three keys,
+    `ERR_NUM`,`ERR_NONE` and `ERR_MUL` are not all needed,
+    because there is default handling for those types of errors.
+    However, if there is no flag with the name of `name`,
+    then `get_num` returns None.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+    def handle_error_num(value):
+        print(f"{value} is not a number")
+
+    def handle_error_none():
+        print("No values provided")
+
+    error_handlers = {
+        "ERR_NUM": handle_error_num(),
+        "ERR_NONE": handle_error_none()
+    }
+
+    number_something = klarg.get_num(
+        name="--number-something",
+        short="-n", on_error=error_handlers
+        )
+    print(f"The suprise number is {number_something}")
+
+    # python docs_example.py -n 1a
+    # 1a is not a number
+
+    # python docs_example.py -n
+    # No values provided
+
+    # python docs_example.py -n 12345
+    # The suprise number is 12345
+    ```
+
+    """
+
+    return base_get_num(
+        name=name,
+        short=short,
+        on_error=on_error,
+        args_list=_all_args()
+    )
+
+
+def get_count(name: str, short: str = "default-short") -> int:
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `get_count` counts how many times a flag was given. Every
+    occurrence of the long or short flag counts once, and stacked
+    short flags such as `-vvv` count once for every letter.
+    If the flag is not there, `get_count` returns 0.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    verbosity = klarg.get_count("verbose", "v")
+    print(f"Verbosity level {verbosity}")
+
+    # python docs_example.py -vvv --verbose
+    # Verbosity level 4
+    ```
+
+    """
+
+    return base_get_count(
+        name=name,
+        short=short,
+        args_list=_all_args()
+    )
+
+
+def get_list(
+    name: str,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> list:
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `on_error: dict: optional`
+
+    `get_list` collects the value of every occurrence of a flag, in the
+    order they were given, so a flag can be repeated to pass more than one
+    value. Unlike `get_str`, repeating the flag is not an error. The only
+    error it can encounter is `ERR_NONE`, when an occurrence of the flag
+    has no value. If the flag is not there, `get_list` returns an empty list.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    tags = klarg.get_list("tag", "t")
+    print(f"Tags {tags}")
+
+    # python docs_example.py --tag fast -t small --tag new
+    # Tags ['fast', 'small', 'new']
+    ```
+
+    """
+
+    return base_get_list(
+        name=name,
+        short=short,
+        on_error=on_error,
+        args_list=_all_args()
+    )
+
+
+def read_args(path: str) -> list:
+    """
+    `path: str: NEEDED`
+
+    `read_args` reads a response file, a file with one argument on every
+    line, and returns the arguments as `bytes`, exactly as they are in the
+    file. This is useful for very long lists of arguments, or for file names
+    that are not valid UTF-8. The list can be given to `parser.parse()`,
+    and everything a parser returns will then be `bytes` as well.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    files = klarg.parser()
+    files.parse(klarg.read_args("arguments.txt"))
+    print(files.get_str("output", "o"))
+
+    # python docs_example.py
+    # b'caf\xe9.txt'
+    ```
+
+    """
+
+    with open(path, "rb") as response_file:
+        return response_file.read().splitlines()
+
+
+class command():
+    """
+    `name: str: NEEDED`
+
+    This creates a class with the command line that has the functions
+    `project_version()`, `on_help()`, `get_num()`, `get_str()`,
+    `get_bool()`, `get_count()`, `get_list()`, `get_file()`,
+    `cache_parse()`, `dispatch()`, `get_parsed()`, `export_parsed()`,
+    `get_into()` and `get_all()`. The only difference is
+    that the arguments are parsed after the declaration of the command.
+    This means that if you have a list of command line arguments
+    `["-f", "reply", "-n", "12", "example.txt"]`,
+    and the command name is `reply`. The available command line arguments
+    are `["-n", "12", "example.txt"]`. `args_list` can be given to look for
+    the command in a list other than `ALL_ARGS`.
+    """
+
+    # Commands made with cli(name=...), run by dispatch() when it is not
+    # given any handlers
+    handlers = {}
+
+    def __init__(self, name: str, args_list: "Union[list, None]" = None):
+        all_args = _all_args() if args_list is None else args_list
+
+        # With bytes_mode the name is looked for as bytes
+        binary = len(all_args) > 0 and type(all_args[0]) == bytes
+        name = _settings().typed(binary).encode(name)
+        beginning_index = all_args.index(name) + 1
+        self.all_arguments = all_args[beginning_index: len(all_args)]
+
+    def exists(self, name: str) -> bool:
+        """
+        `name: str: NEEDED`
+
+        Checks if the `name` exists in the list of command line
+        arguments given, this was designed to be an
+        internal function for making things more readable, but then
+        I realized that it could potentially be helpful.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+
+        something_exists = klarg.exists("something")
+        if something_exists:
+            print("Something exists")
+        else:
+            print("Nothing exists (that's kind of dark)")
+
+        # python docs_example.py does something exist
+        # Something exists
+
+        # python docs_example.py does nothing exist
+        # Nothing exists (that's kind of dark)
+    ```
+
+        """
+
+        return base_exists(name=name, args_list=self.all_arguments)
+
+    def get_all(self) -> list:
+        """
+        Collects all the arguments passed and returns a copy of them as a
+        list full of strings. This is useful when a program needs to collect
+        a list of all the arguments passed on to operate on,
+        it passes everything single option passed to the file
+
+        Example:
+    `   ```py
+        # docs_example.py
+        import klarg
+
+        all_args = klarg.get_all()
+        print(f"All args {all_args}")
+
+        # python docs_example.py -a -b "c" -d --efgh --ijklmn 0
+        # All args ['-a', '-b', 'c', '-d', '--efgh', '--ijklmn', '0']
+        ```
+
+        """
+
+        return base_get_all(self.all_arguments)
+
+    def get_bool(self, name: str, short: str = "default-short") -> bool:
+        """
+        `name: str: NEEDED`
+
+        `short: str: optional`
+
+        `get_bool` is a function that collects `name`, a string, and `short`,
+        also a string. `name` is the long name for the command line argument,
+        i.e. (`--long-name`). `short` is the shorter name for the command
+        line argument (`-s`). Normally, if `short` is not given,
+        then it will not raise an error, unless `"needs_short_flags"`
+        is set to `True` in `CONFIG`.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+
+        is_there = klarg.bool("--is-there", "-i")
+
+        if (is_there):
+            print("Is there")
+        else:
+            print("Is not there")
+
+        # python docs_example.py
+        # Is not there
+
+        # python docs_example.py --is-there
+        # is there
+        ```
+
+        """
+
+        return base_get_bool(
+            name=name,
+            short=short,
+            args_list=self.all_arguments
+        )
+
+    def on_help(self, action: "Callable") -> None:
+        """
+        `action: function: NEEDED`
+
+        The `action` is run when klarg detects the help flag.
+        What klarg looks for can be configured in `CONFIG`
+        with the option `"help_flag"`.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+        def display_help_message():
+            print("Here you go")
+
+        klarg.on_help(display_help_message)
+
+        # python docs_example.py --help
+        # Here you go
+        ```
+
+        """
+
+        return base_on_help(
+            action=action,
+            args_list=self.all_arguments
+        )
+
+    def on_version(self, message: str) -> None:
+        """
+        `message: str: NEEDED`
+
+        Klarg displays the `message` when the version flag is detected.
+        What klarg looks for can be configured in `CONFIG`
+        with the option `"version_flag"`.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+        klarg.project_version("This project version is 1.2.3")
+
+        # python docs_example.py --version
+        # This project version is 1.2.3
+        ```
+
+        """
+
+        return base_on_version(
+            message=message,
+            args_list=self.all_arguments
+        )
+
+    def get_str(
+        self,
+        name: str,
+        short: str = "default-short",
+        on_error: dict = {}
+    ) -> "Union[str, None]":
+        """
+        `name: str: NEEDED`
+
+        `short: str: optional`
+
+        `on_error: function: optional`
+
+        `get_str` is a function that collects a `name`,
+         which is the multi letter flag, a `short`, which is the
+         shortened version of the flag. There is only one type of
+         errors it can encounter, which is when no value is provided.
+         Because of this, `on_error` is not a dictionary,
+         but a special function that handles when no value is provided.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+        def handle_error_none():
+            print(f"No values provided")
+
+        some_str = klarg.get_str(
+            "--some-str",
+            "-s",
+            on_error=handle_error_none
+            )
+
+        print(f"{some_str} is cool")
+
+        # python docs_example.py --some-str
+        # No values provided
+
+        # python docs_example.py -s "klarg"
+        # klarg is cool
+        ```
+
+        """
+
+        return base_get_str(
+            name=name,
+            short=short,
+            on_error=on_error,
+            args_list=self.all_arguments
+        )
+
+    def get_num(
+        self,
+        name: str,
+        short: str = "default-short",
+        on_error: dict = {}
+    ) -> "Union[int, float, None]":
+        """
+        `name: str: NEEDED`
+
+        `short: str: optional`
+
+        `on_error: dict: optional`
+
+        `get_num` is a function that collects a `name`,
+        which is the multi letter flag, a `short`,
+        which is the shortened version of the flag.
+        There are two possible types of errors it can encounter,
+        one being that the value it got was not a number, it did not
+        get a value at all, or that there are multiple declarations of that
+        flag. he error names are `ERR_NUM`, `ERR_NONE` and `ERR_MUL`
+        respectively. `on_error` is a dictionary, all three keys,
+        `ERR_NUM`,`ERR_NONE` and `ERR_MUL` are not all needed,
+        because there is default handling for those types of errors.
+        However, if there is no flag with the name of `name`,
+        then `get_num` returns None.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+        def handle_error_num(value):
+            print(f"{value} is not a number")
+
+        def handle_error_none():
+            print("No values provided")
+
+        error_handlers = {
+            "ERR_NUM": handle_error_num(),
+            "ERR_NONE": handle_error_none()
+        }
+
+        number_something = klarg.get_num(
+            name="--number-something",
+            short="-n", on_error=error_handlers
+            )
+        print(f"The suprise number is {number_something}")
+
+        # python docs_example.py -n 1a
+        # 1a is not a number
+
+        # python docs_example.py -n
+        # No values provided
+
+        # python docs_example.py -n 12345
+        # The suprise number is 12345
+        ```
+
+        """
+
+        return base_get_num(
+            name=name,
+            short=short,
+            on_error=on_error,
+            args_list=self.all_arguments
+        )
+
+    def get_count(self, name: str, short: str = "default-short") -> int:
+        """
+        `name: str: NEEDED`
+
+        `short: str: optional`
+
+        `get_count` counts how many times a flag was given. Every
+        occurrence of the long or short flag counts once, and stacked
+        short flags such as `-vvv` count once for every letter.
+        If the flag is not there, `get_count` returns 0.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+
+        verbosity = klarg.get_count("verbose", "v")
+        print(f"Verbosity level {verbosity}")
+
+        # python docs_example.py -vvv --verbose
+        # Verbosity level 4
+        ```
+
+        """
+
+        return base_get_count(
+            name=name,
+            short=short,
+            args_list=self.all_arguments
+        )
+
+    def get_list(
+        self,
+        name: str,
+        short: str = "default-short",
+        on_error: dict = {}
+    ) -> list:
+        """
+        `name: str: NEEDED`
+
+        `short: str: optional`
+
+        `on_error: dict: optional`
+
+        `get_list` collects the value of every occurrence of a flag, in the
+        order they were given, so a flag can be repeated to pass more than
+        one value. Unlike `get_str`, repeating the flag is not an error.
+        The only error it can encounter is `ERR_NONE`, when an occurrence
+        of the flag has no value. If the flag is not there, `get_list`
+        returns an empty list.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+
+        tags = klarg.get_list("tag", "t")
+        print(f"Tags {tags}")
+
+        # python docs_example.py --tag fast -t small --tag new
+        # Tags ['fast', 'small', 'new']
+        ```
+
+        """
+
+        return base_get_list(
+            name=name,
+            short=short,
+            on_error=on_error,
+            args_list=self.all_arguments
+        )
+
+    def get_file(
+        self,
+        name: str,
+        short: str = "default-short",
+        on_error: dict = {}
+    ) -> "Union[file_value, None]":
+        """
+        `name: str: NEEDED`
+
+        `short: str: optional`
+
+        `on_error: dict: optional`
+
+        `get_file` collects a value like `get_str`, and returns it as a
+        `file_value`, or None if the flag is not there. When the value is
+        `@path`, the file is only opened when the value is used, and is
+        mapped into memory instead of read: `view()` returns a `memoryview`
+        of it and `lines()` goes over its lines without copying the rest of
+        the file, while `bytes()` and `text()` copy it.
+
+        Example:
+        ```py
+        # docs_example.py
+        import klarg
+
+        load = klarg.command("load")
+        keys = load.get_file("keys", "k")
+        with keys:
+            print(f"Loading {sum(1 for key in keys.lines())} keys")
+
+        # python docs_example.py load --keys @keys.txt
+        # Loading 3 keys
+        ```
+
+        """
+
+        from klarg._files import base_get_file
+
+        return base_get_file(
+            name=name,
+            short=short,
+            on_error=on_error,
+            args_list=self.all_arguments
+        )
+
+    def cache_parse(
+        self,
+        parse: "Callable",
+        schema: str = "",
+        files: list = [],
+        env: list = [],
+        cache_dir: "Union[str, None]" = None
+    ):
+        """
+        `parse: function: NEEDED`
+
+        `schema: str: optional`
+
+        `files: list: optional`
+
+        `env: list: optional`
+
+        `cache_dir: str: optional`
+
+        `cache_parse` runs `parse`, a function that collects and checks all
+        the arguments a program needs and returns them, and saves what it
+        returned to a file. The next time the program is run with the same
+        arguments, the saved result is returned without running `parse`.
+        `parse` is run again when the arguments, `schema` (any string that
+        describes the flags, like a version number), the code of `parse`,
+        `CONFIG`, the modification time of any path in `files` or the value of
+        any environment variable in `env` changes. The results are saved in
+        `cache_dir`, by default a `klarg` folder in `$XDG_CACHE_HOME` or
+        `~/.cache`. Whatever `parse` returns must be able to be pickled, and
+        should only depend on things that are part of the key.
+
+        Example:
+        ```py
+        # docs_example.py
+        import os
+        import klarg
+
+        def parse_arguments():
+            config = klarg.get_str("config", "c")
+            klarg.validate([(config, os.path.isfile)])
+            return {"config": config, "jobs": klarg.get_num("jobs", "j")}
+
+        arguments = klarg.cache_parse(
+            parse_arguments,
+            schema="1",
+            files=["setup.cfg"],
+            env=["HOME"]
+        )
+
+        print(f"Running {arguments['jobs']} jobs")
+
+        # python docs_example.py -c setup.cfg -j 4
+        # Running 4 jobs
+        ```
+
+        """
+
+        from klarg._cache import base_cache_parse
+
+        return base_cache_parse(
+            parse=parse,
+            schema=schema,
+            files=files,
+            env=env,
+            cache_dir=cache_dir,
+            args_list=self.all_arguments
+        )
+
+    def dispatch(
+        self,
+        handlers: "Union[dict, None]" = None,
+        resolvers: dict = {}
+    ):
+        """
+        `handlers: dict: optional`
+
+        `resolvers: dict: optional`
+
+        `dispatch` runs the handler of the command that was given. `handlers`
+        is a dictionary of command names and functions, and the first argument
+        that is one of the command names picks the function. The function is
+        called with a `command` for that name, and returns what it returned.
+        If no command was given, `dispatch` returns None. Plugins from
+        `find_plugins` can be given as handlers, and are only imported if
+        their command was given. Without `handlers`, the commands made with
+        `cli` are used.
+
+        `resolvers` is a dictionary of names and functions that collect
+        something the handler needs, like loading a config file or checking
+        the values with `validate`. They are called with the same `command`
+        and all run at the same time, and what they return is given to the
+        handler as keyword arguments. Handlers and resolvers can be `async`
+        functions, in which case they all run in a single event loop (using
+        `uvloop` if it is installed), and the resolvers that are not `async`
+        run on threads. An `async` handler is started right away and gets the
+        resolvers as tasks, which it can `await` when it needs their values.
+
+        Example:
+        ```py
+        # docs_example.py
+        import asyncio
+        import klarg
+
+        async def load_config(command):
+            await asyncio.sleep(0.1)
+            return {"name": command.get_str("name", "n")}
+
+        async def greet(command, config):
+            print("Starting up")
+            print(f"Hello {(await config)['name']}")
+
+        klarg.dispatch({"greet": greet}, resolvers={"config": load_config})
+
+        # python docs_example.py greet -n klarg
+        # Starting up
+        # Hello klarg
+        ```
+
+        """
+
+        from klarg._dispatch import base_dispatch
+
+        return base_dispatch(
+            handlers=handlers,
+            resolvers=resolvers,
+            args_list=self.all_arguments
+        )
+
+    def get_parsed(
+        self,
+        schema: dict,
+        on_error: dict = {},
+        share: bool = False
+    ) -> "parsed":
+        """
+        `schema: dict: NEEDED`
+
+        `on_error: dict: optional`
+
+        `share: bool: optional`
+
+        `get_parsed` collects all the flags in `schema` at once and returns
+        them as a `parsed` result, which can't be changed and is cheap to send
+        to other processes, like the workers of a `multiprocessing.Pool`.
+        `schema` is a dictionary of flag names and their kind, which is one of
+        `"bool"`, `"str"`, `"num"`, `"count"` or `"list"`, or a `(kind, short)`
+        tuple to also give the short flag. Every flag is collected with the
+        `get_` function of its kind, with the same `on_error` handling, and
+        lists are returned as tuples. If `share` is `True`, the result (and
+        everything else that exists at that point) is moved out of the reach of
+        the garbage collector with `gc.freeze()`, so that processes forked
+        afterwards don't copy memory when the collector runs. If a parent
+        process handed down its result for the same schema and arguments with
+        `export_parsed`, that result is returned (with `inherited` set)
+        without looking at the arguments again.
+
+        Example:
+        ```py
+        # docs_example.py
+        import multiprocessing
+        import klarg
+
+        def start_worker(arguments):
+            global ARGUMENTS
+            ARGUMENTS = arguments
+
+        def work(number):
+            return number * ARGUMENTS.scale
+
+        if __name__ == "__main__":
+            arguments = klarg.get_parsed(
+            {"scale": ("num", "s"), "verbose": "count"}
+        )
+            with multiprocessing.Pool(
+                initializer=start_worker,
+                initargs=(arguments,)
+            ) as pool:
+                print(pool.map(work, [1, 2, 3]))
+
+        # python docs_example.py --scale 10
+        # [10, 20, 30]
+        ```
+
+        """
+
+        from klarg._parsed import base_get_parsed
+
+        return base_get_parsed(
+            schema=schema,
+            on_error=on_error,
+            share=share,
+            args_list=self.all_arguments
+        )
+
+    def export_parsed(
+        self,
+        result: "parsed",
+        schema: dict,
+        environ: "Union[dict, None]" = None
+    ) -> "Union[str, None]":
+        """
+        `result: parsed: NEEDED`
+
+        `schema: dict: NEEDED`
+
+        `environ: dict: optional`
+
+        `export_parsed` hands a result of `get_parsed` down to child
+        processes, so that a child that calls `get_parsed` with the same
+        schema and the same arguments gets it back without parsing them
+        again. The result is written into the `KLARG_PARSED` variable of
+        `environ`, `os.environ` by default, and the new value of the variable
+        is returned, or None when it is too long to hand down.
+
+        Example:
+        ```py
+        # docs_example.py
+        import subprocess
+        import sys
+        import klarg
+
+        SCHEMA = {"jobs": ("num", "j")}
+
+        command = klarg.command("build")
+        arguments = command.get_parsed(SCHEMA)
+        if arguments.inherited:
+            print(f"Child got {arguments.jobs} jobs from its parent")
+        else:
+            command.export_parsed(arguments, SCHEMA)
+            subprocess.run([sys.executable, *sys.argv])
+
+        # python docs_example.py build -j 4
+        # Child got 4 jobs from its parent
+        ```
+
+        """
+
+        from klarg._parsed import base_export_parsed
+
+        return base_export_parsed(
+            result=result,
+            schema=schema,
+            environ=environ,
+            args_list=self.all_arguments
+        )
+
+    def get_into(self, cls: type, short: dict = {}, on_error: dict = {}):
+        """
+        `cls: type: NEEDED`
+
+        `short: dict: optional`
+
+        `on_error: dict: optional`
+
+        `get_into` collects a flag for every field of `cls`, a dataclass (like
+        one with `slots=True`) or a `NamedTuple`, and returns an instance of
+        `cls` made from them, without collecting them in a dictionary first.
+        Fields are collected like the flags of `cli`, and fields without a
+        default are handled as `ERR_NONE` when their flag is not given.
+        `short` is a dictionary of field names and their short flags.
+
+        Example:
+        ```py
+        # docs_example.py
+        from typing import NamedTuple
+        import klarg
+
+        class BuildOptions(NamedTuple):
+            jobs: int = 1
+            dry_run: bool = False
+
+        def build(command):
+            print(command.get_into(BuildOptions, short={"jobs": "j"}))
+
+        klarg.dispatch({"build": build})
+
+        # python docs_example.py build -j 4
+        # BuildOptions(jobs=4, dry_run=False)
+        ```
+
+        """
+
+        from klarg._cli import base_get_into
+
+        return base_get_into(
+            cls=cls,
+            short=short,
+            on_error=on_error,
+            args_list=self.all_arguments
+        )
+
+
+class parser(command):
+    """
+    `commands: list: optional`
+
+    A long lived version of `command` for programs that parse many
+    lists of arguments, like an interactive shell that splits every line
+    it reads. The `commands` are collected once, and every call to
+    `parse()` only indexes the new arguments. `append()` and `pop()`
+    update the index one argument at a time, which is useful when a line
+    is being edited. It has all the functions of `command`, which work on
+    the arguments that were last given to the parser.
+
+    Example:
+    ```py
+    # docs_example.py
+    import shlex
+    import klarg
+
+    shell = klarg.parser(["add", "remove"])
+    while True:
+        shell.parse(shlex.split(input("> ")))
+        if shell.get_command() == "add":
+            print(f"Adding {shell.get_str('name', 'n')}")
+
+    # > add --name klarg
+    # Adding klarg
+    ```
+
+    """
+
+    def __init__(self, commands: list = []):
+        self.commands = frozenset(commands)
+        self.all_arguments = []
+
+    def parse(self, args_list: list) -> None:
+        """
+        `args_list: list: NEEDED`
+
+        Replaces the arguments of the parser with `args_list`.
+        """
+
+        # Keeps the same list so its index can be replaced in the cache
+        self.all_arguments[:] = args_list
+        _reindex(self.all_arguments)
+
+    def append(self, arg: str) -> None:
+        """
+        `arg: str: NEEDED`
+
+        Adds `arg` to the end of the arguments.
+        """
+
+        index = _index_for(self.all_arguments)
+        self.all_arguments.append(arg)
+        index.add(arg)
+
+    def pop(self, position: int = -1) -> str:
+        """
+        `position: int: optional`
+
+        Removes the argument at `position` and returns it, the last
+        argument by default. Only removing the last argument updates the
+        index in place, anything else indexes the arguments again.
+        """
+
+        index = _index_for(self.all_arguments)
+        last = len(self.all_arguments) - 1
+        if position < 0:
+            position += len(self.all_arguments)
+
+        arg = self.all_arguments.pop(position)
+
+        if position == last:
+            index.remove(arg)
+        else:
+            _reindex(self.all_arguments)
+
+        return arg
+
+    def get_command(self) -> "Union[str, None]":
+        """
+        Returns the first argument that is one of the `commands` given
+        to the parser, or None if there is none. When the arguments are
+        `bytes`, the command is returned as `bytes` too.
+        """
+
+        args_list = self.all_arguments
+        commands = self.commands
+        if len(args_list) > 0 and type(args_list[0]) == bytes:
+            encode = _settings().bytes.encode
+            commands = frozenset(encode(name) for name in commands)
+
+        for arg in args_list:
+            if arg in commands:
+                return arg
+
+        return None
@@ -0,0 +1,138 @@
+"""
+The command line of klarg, run with `python -m klarg`.
+"""
+
+import sys
+import klarg
+
+USAGE = """\
+usage: python -m klarg codegen --schema MODULE:NAME [--commands MODULE:NAME]
+                               [--output PATH] [--check]
+       python -m klarg serve --socket PATH [--handlers MODULE:NAME]
+                             [--preload MODULE]...
+
+codegen writes a parser module for the schema MODULE:NAME, a dictionary in
+the format of get_parsed, to PATH or to the standard output. With --check,
+exits with 1 if PATH is not what would be written now.
+
+serve imports the modules given with --preload and runs the commands that
+klarg.client sends to the socket at PATH, with the handlers MODULE:NAME or
+the commands made with klarg.cli in the preloaded modules."""
+
+
+def _load(reference: str):
+    """
+    Returns the object that `module:name` refers to.
+    """
+
+    import importlib
+
+    module_name, _, name = reference.partition(":")
+    if not name:
+        raise Exception(f"{reference} has to be written as MODULE:NAME")
+
+    value = importlib.import_module(module_name)
+    for part in name.split("."):
+        value = getattr(value, part)
+
+    return value
+
+
+def codegen(args_list: list) -> int:
+    def show_usage():
+        print(USAGE, file=sys.stderr)
+        sys.exit(2)
+
+    on_error = {"ERR_NONE": show_usage, "ERR_MUL": show_usage}
+
+    schema = klarg.base_get_str("schema", args_list, "s", on_error)
+    commands = klarg.base_get_str("commands", args_list, "c", on_error)
+    output = klarg.base_get_str("output", args_list, "o", on_error)
+    check = klarg.base_get_bool("check", args_list, "default-short")
+
+    if schema is None or (check and output is None):
+        show_usage()
+
+    # Modules next to where the command is run from can be found
+    if "" not in sys.path:
+        sys.path.insert(0, "")
+
+    code = klarg.codegen(
+        _load(schema),
+        [] if commands is None else _load(commands),
+        source=schema
+    )
+
+    if check:
+        try:
+            with open(output) as file:
+                up_to_date = file.read() == code
+        except OSError:
+            up_to_date = False
+
+        if not up_to_date:
+            print(
+                f"{output} is out of date, run python -m klarg codegen again",
+                file=sys.stderr
+            )
+            return 1
+
+        return 0
+
+    if output is None:
+        sys.stdout.write(code)
+    else:
+        with open(output, "w") as file:
+            file.write(code)
+
+    return 0
+
+
+def serve(args_list: list) -> int:
+    def show_usage():
+        print(USAGE, file=sys.stderr)
+        sys.exit(2)
+
+    on_error = {"ERR_NONE": show_usage, "ERR_MUL": show_usage}
+
+    socket_path = klarg.base_get_str("socket", args_list, "s", on_error)
+    handlers = klarg.base_get_str(
+        "handlers",
+        args_list,
+        "default-short",
+        on_error
+    )
+    preload = klarg.base_get_list("preload", args_list, "p", on_error)
+
+    if socket_path is None:
+        show_usage()
+
+    # Modules next to where the command is run from can be found
+    if "" not in sys.path:
+        sys.path.insert(0, "")
+
+    klarg.serve(
+        socket_path,
+        None if handlers is None else _load(handlers),
+        preload=preload
+    )
+    return 0
+
+
+def main(args_list: list) -> int:
+    if klarg.base_get_bool("help", args_list, "h") or not args_list:
+        print(USAGE)
+        return 0
+
+    if args_list[0] == "codegen":
+        return codegen(args_list[1:])
+
+    if args_list[0] == "serve":
+        return serve(args_list[1:])
+
+    print(f"Unknown command {args_list[0]}\n\n{USAGE}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(klarg.get_all()))
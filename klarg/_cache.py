@@ -0,0 +1,261 @@
+"""
+The on disk cache for `klarg.cache_parse`, loaded the first time it is
+used.
+"""
+
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Union
+
+# The most results cache_parse() keeps in a folder, and how many seconds it
+# keeps them, older ones are removed when a new one is saved
+_MAX_RESULTS = 256
+_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _default_cache_dir() -> str:
+    """
+    Returns the `klarg` folder in `$XDG_CACHE_HOME` or `~/.cache`.
+    """
+
+    import os
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"),
+        ".cache"
+    )
+    return os.path.join(cache_home, "klarg")
+
+
+def _prune(cache_dir: str) -> None:
+    """
+    Removes the results in `cache_dir` that are older than `_MAX_AGE`, and
+    the oldest of the rest when there are more than `_MAX_RESULTS`.
+    """
+
+    import os
+    import time
+
+    results = []
+    with os.scandir(cache_dir) as scanner:
+        for entry in scanner:
+            if entry.name.endswith(".pickle"):
+                try:
+                    results.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+
+    results.sort(reverse=True)
+    oldest = time.time() - _MAX_AGE
+    for number, (changed, path) in enumerate(results):
+        if number >= _MAX_RESULTS or changed < oldest:
+            # Another process can remove the same result at the same time
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def base_cache_parse(
+    parse: "Callable",
+    args_list: list,
+    schema: str = "",
+    files: list = [],
+    env: list = [],
+    cache_dir: "Union[str, None]" = None
+):
+    """
+    `parse: function: NEEDED`
+
+    `schema: str: optional`
+
+    `files: list: optional`
+
+    `env: list: optional`
+
+    `cache_dir: str: optional`
+
+    `cache_parse` runs `parse`, a function that collects and checks all
+    the arguments a program needs and returns them, and saves what it
+    returned to a file. The next time the program is run with the same
+    arguments, the saved result is returned without running `parse`.
+    `parse` is run again when the arguments, the current directory,
+    `schema` (any string that describes the flags, like a version number),
+    the code of `parse`, `CONFIG`, the modification time of any path in
+    `files` or the value of any environment variable in `env` changes. The
+    results are saved in `cache_dir`, by default a `klarg` folder in
+    `$XDG_CACHE_HOME` or `~/.cache`, which keeps the 256 newest results
+    from the last 30 days. Whatever `parse` returns is only saved if it can
+    be pickled, and should only depend on things that are part of the key.
+
+    Example:
+    ```py
+    # docs_example.py
+    import os
+    import klarg
+
+    def parse_arguments():
+        config = klarg.get_str("config", "c")
+        klarg.validate([(config, os.path.isfile)])
+        return {"config": config, "jobs": klarg.get_num("jobs", "j")}
+
+    arguments = klarg.cache_parse(
+        parse_arguments,
+        schema="1",
+        files=["setup.cfg"],
+        env=["HOME"]
+    )
+
+    print(f"Running {arguments['jobs']} jobs")
+
+    # python docs_example.py -c setup.cfg -j 4
+    # Running 4 jobs
+    ```
+
+    """
+
+    import os
+    import pickle
+    import hashlib
+
+    def file_stamp(path: str) -> tuple:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return (path, None, None)
+
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    # Changing the code of parse should not return stale results
+    code = getattr(parse, "__code__", None)
+    if code is not None:
+        import marshal
+        code = marshal.dumps(code)
+
+    key_parts = (
+        klarg.__version__,
+        list(args_list),
+        # Relative paths in the arguments or files mean something else in
+        # another directory
+        os.getcwd(),
+        schema,
+        getattr(parse, "__module__", None),
+        getattr(parse, "__qualname__", None),
+        code,
+        repr(sorted(klarg.CONFIG.items())),
+        [file_stamp(path) for path in files],
+        [(name, os.environ.get(name)) for name in env]
+    )
+    key = hashlib.sha256(pickle.dumps(key_parts, protocol=4)).hexdigest()
+
+    if cache_dir is None:
+        cache_dir = _default_cache_dir()
+
+    cache_path = os.path.join(cache_dir, key + ".pickle")
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            return pickle.load(cache_file)
+
+    # Missing or unreadable results are parsed again
+    except Exception:
+        pass
+
+    result = parse()
+
+    temporary_path = None
+    try:
+        import tempfile
+
+        os.makedirs(cache_dir, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=cache_dir)
+        with os.fdopen(descriptor, "wb") as cache_file:
+            pickle.dump(result, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Replacing the file means other processes never read half of it
+        os.replace(temporary_path, cache_path)
+        temporary_path = None
+        _prune(cache_dir)
+
+    # Not being able to save the result, or a result that can't be
+    # pickled, should not stop the program
+    except Exception:
+        pass
+
+    finally:
+        if temporary_path is not None:
+            try:
+                os.unlink(temporary_path)
+            except OSError:
+                pass
+
+    return result
+
+
+def cache_parse(
+    parse: "Callable",
+    schema: str = "",
+    files: list = [],
+    env: list = [],
+    cache_dir: "Union[str, None]" = None
+):
+    """
+    `parse: function: NEEDED`
+
+    `schema: str: optional`
+
+    `files: list: optional`
+
+    `env: list: optional`
+
+    `cache_dir: str: optional`
+
+    `cache_parse` runs `parse`, a function that collects and checks all
+    the arguments a program needs and returns them, and saves what it
+    returned to a file. The next time the program is run with the same
+    arguments, the saved result is returned without running `parse`.
+    `parse` is run again when the arguments, the current directory,
+    `schema` (any string that describes the flags, like a version number),
+    the code of `parse`, `CONFIG`, the modification time of any path in
+    `files` or the value of any environment variable in `env` changes. The
+    results are saved in `cache_dir`, by default a `klarg` folder in
+    `$XDG_CACHE_HOME` or `~/.cache`, which keeps the 256 newest results
+    from the last 30 days. Whatever `parse` returns is only saved if it can
+    be pickled, and should only depend on things that are part of the key.
+
+    Example:
+    ```py
+    # docs_example.py
+    import os
+    import klarg
+
+    def parse_arguments():
+        config = klarg.get_str("config", "c")
+        klarg.validate([(config, os.path.isfile)])
+        return {"config": config, "jobs": klarg.get_num("jobs", "j")}
+
+    arguments = klarg.cache_parse(
+        parse_arguments,
+        schema="1",
+        files=["setup.cfg"],
+        env=["HOME"]
+    )
+
+    print(f"Running {arguments['jobs']} jobs")
+
+    # python docs_example.py -c setup.cfg -j 4
+    # Running 4 jobs
+    ```
+
+    """
+
+    return base_cache_parse(
+        parse=parse,
+        schema=schema,
+        files=files,
+        env=env,
+        cache_dir=cache_dir,
+        args_list=klarg._all_args()
+    )
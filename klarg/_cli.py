@@ -0,0 +1,727 @@
+"""
+Command lines made from the parameters of a function for `klarg.cli`, and
+from the fields of a class for `klarg.get_into`, loaded the first time
+they are used.
+"""
+
+import sys
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Union
+
+# Flags in a code object's co_flags
+_VARARGS = 0x04
+
+# The type of functions written in Python, without importing types
+_FUNCTION = type(lambda: None)
+
+# Annotations that are looked up with get_bool and the list functions,
+# anything else is a str converted with the annotation
+_LIST_TYPES = (list, tuple, set, frozenset)
+
+# Returned by _flag_value() when the default of a flag is used
+_DEFAULT = object()
+
+# The bindings of the classes given to get_into()
+_CLASS_BINDINGS = {}
+
+
+def _resolve(annotation, namespace: dict):
+    """
+    Returns the annotation a string annotation refers to, like
+    `typing.get_type_hints`, but without importing typing.
+    """
+
+    if type(annotation) == str:
+        try:
+            return eval(annotation, namespace)
+
+        # Names that can't be found are treated as not being annotated
+        except Exception:
+            return None
+
+    return annotation
+
+
+def _unwrap_optional(annotation):
+    # Optional[int] and int | None are collected as int
+    args = getattr(annotation, "__args__", None)
+    typing = sys.modules.get("typing")
+    is_union = (
+        (typing is not None and getattr(annotation, "__origin__", None) is (
+            typing.Union
+        ))
+        or type(annotation).__name__ == "UnionType"
+    )
+
+    if is_union and args:
+        others = [arg for arg in args if arg is not type(None)]
+        if len(others) == 1:
+            return others[0]
+
+    return annotation
+
+
+def _converter(annotation) -> "Union[Callable, None]":
+    # str and missing annotations don't need to be converted
+    if annotation in (None, str) or not callable(annotation):
+        return None
+
+    return annotation
+
+
+def _kind(annotation, default, has_default: bool) -> tuple:
+    """
+    Returns the kind of flag a parameter is collected with, the function
+    that converts every value and the type of list the values are put in.
+    """
+
+    if annotation is None and has_default and default is not None:
+        annotation = type(default)
+
+    annotation = _unwrap_optional(annotation)
+    origin = getattr(annotation, "__origin__", None)
+
+    if annotation is bool:
+        return "bool", None, None
+
+    if annotation in _LIST_TYPES or origin in _LIST_TYPES:
+        args = [
+            arg for arg in getattr(annotation, "__args__", None) or ()
+            if arg is not Ellipsis
+        ]
+        element = _converter(args[0] if len(args) == 1 else None)
+        return "list", element, origin or annotation
+
+    return "str", _converter(annotation), None
+
+
+def _flag(
+    name: str,
+    annotation,
+    has_default: bool,
+    default,
+    short: dict,
+    namespace: dict
+) -> tuple:
+    """
+    Returns how the parameter or field `name` is collected, see
+    `_flag_value()`.
+    """
+
+    annotation = _resolve(annotation, namespace)
+    kind, convert, container = _kind(annotation, default, has_default)
+    return (
+        name,
+        name.replace("_", "-"),
+        short.get(name, "default-short"),
+        kind,
+        convert,
+        container,
+        has_default
+    )
+
+
+def _flag_value(flag: tuple, args_list: list, on_error: dict):
+    """
+    Returns the value of a flag made by `_flag()`, converted, or `_DEFAULT`
+    when it is not there and has a default.
+    """
+
+    name, flag_name, short, kind, convert, container, has_default = flag
+
+    if kind == "bool":
+        value = klarg.base_get_bool(flag_name, args_list, short)
+        return value if value or not has_default else _DEFAULT
+
+    if kind == "list":
+        values = klarg.base_get_list(flag_name, args_list, short, on_error)
+        if not values and has_default:
+            return _DEFAULT
+
+        return container(
+            _convert(convert, value, on_error) for value in values
+        )
+
+    value = klarg.base_get_str(flag_name, args_list, short, on_error)
+    if value is None:
+        if not has_default:
+            _missing(klarg._settings().long_name(flag_name), on_error)
+            return None
+
+        return _DEFAULT
+
+    return _convert(convert, value, on_error)
+
+
+def _parameters(function: "Callable") -> tuple:
+    """
+    Returns the parameters of `function` that can be given arguments, as
+    their name, whether they are positional, whether they have a default
+    and the default, the name of the parameter that takes the rest of the
+    positional arguments, or None, and the annotations of all of them.
+    """
+
+    # Plain functions are read from their code, which is much quicker than
+    # importing inspect
+    if (
+        type(function) == _FUNCTION
+        and not hasattr(function, "__wrapped__")
+        and not hasattr(function, "__signature__")
+    ):
+        code = function.__code__
+        defaults = function.__defaults__ or ()
+        keyword_defaults = function.__kwdefaults__ or {}
+
+        positional_count = code.co_argcount
+        names = code.co_varnames[:positional_count + code.co_kwonlyargcount]
+        first_default = positional_count - len(defaults)
+
+        parameters = []
+        for number, name in enumerate(names):
+            if number < positional_count:
+                has_default = number >= first_default
+                default = None
+                if has_default:
+                    default = defaults[number - first_default]
+            else:
+                has_default = name in keyword_defaults
+                default = keyword_defaults.get(name)
+
+            parameters.append(
+                (name, number < positional_count, has_default, default)
+            )
+
+        rest = None
+        if code.co_flags & _VARARGS:
+            rest = code.co_varnames[len(names)]
+
+        return (
+            parameters,
+            rest,
+            getattr(function, "__annotations__", None) or {}
+        )
+
+    # Anything else, like a functools.partial, a bound method (without
+    # self) or an object with a __call__ method
+    import inspect
+
+    parameters = []
+    rest = None
+    annotations = {}
+    for parameter in inspect.signature(function).parameters.values():
+        kind = parameter.kind
+        if kind == parameter.VAR_KEYWORD:
+            continue
+
+        if parameter.annotation is not parameter.empty:
+            annotations[parameter.name] = parameter.annotation
+
+        if kind == parameter.VAR_POSITIONAL:
+            rest = parameter.name
+            continue
+
+        has_default = parameter.default is not parameter.empty
+        parameters.append((
+            parameter.name,
+            kind != parameter.KEYWORD_ONLY,
+            has_default,
+            parameter.default if has_default else None
+        ))
+
+    return parameters, rest, annotations
+
+
+def _namespace(function: "Callable") -> dict:
+    """
+    Returns the globals of the function that is really called, which
+    string annotations are looked up in.
+    """
+
+    # Deep enough for any real chain, and stops the ones that never end
+    for _ in range(16):
+        wrapped = getattr(function, "__wrapped__", None)
+        if wrapped is not None:
+            function = wrapped
+            continue
+
+        namespace = getattr(function, "__globals__", None)
+        if namespace is not None:
+            return namespace
+
+        wrapped = getattr(function, "func", None)
+        if wrapped is None:
+            wrapped = getattr(type(function), "__call__", None)
+        if wrapped is None:
+            break
+
+        function = wrapped
+
+    return {}
+
+
+class _Binding():
+    """
+    How the arguments are turned into the parameters of a function, worked
+    out once from its parameters, defaults and annotations. `flags` are the
+    parameters collected with `_flag_value()` and `positionals` the ones
+    taken from the arguments that are not flags.
+    """
+
+    def __init__(self, function: "Callable", short: dict):
+        parameters, rest, annotations = _parameters(function)
+        namespace = _namespace(function)
+
+        self.flags = []
+        self.positionals = []
+        self.rest = None
+
+        for name, positional, has_default, default in parameters:
+            flag = _flag(
+                name,
+                annotations.get(name),
+                has_default,
+                default,
+                short,
+                namespace
+            )
+
+            # Positional parameters without a default are positional
+            # arguments, everything else is a flag
+            if positional and not has_default:
+                self.positionals.append((name, flag[4]))
+            else:
+                self.flags.append(flag)
+
+        if rest is not None:
+            annotation = _resolve(annotations.get(rest), namespace)
+            self.rest = (rest, _kind(annotation, None, False)[1])
+
+        # The flags that are followed by a value
+        self.value_flags = [
+            (flag_name, short)
+            for name, flag_name, short, kind, *_ in self.flags
+            if kind != "bool"
+        ]
+
+
+class _ClassBinding():
+    """
+    How the arguments are turned into the fields of a dataclass or a
+    NamedTuple, worked out once for every class given to `get_into`.
+    `flags` are the fields the class is made with in order, `defaults`
+    what they are when their flag is not there (a value and a function
+    that makes it) and `keywords` the number of fields at the end that
+    are given by name.
+    """
+
+    def __init__(self, cls: type, short: dict):
+        module = sys.modules.get(cls.__module__)
+        namespace = getattr(module, "__dict__", {})
+
+        self.flags = []
+        self.defaults = []
+        self.keywords = 0
+
+        fields = getattr(cls, "__dataclass_fields__", None)
+        if fields is not None:
+            # dataclasses was imported to make the class, so this doesn't
+            # import anything
+            dataclasses = sys.modules["dataclasses"]
+            missing = dataclasses.MISSING
+            class_var = getattr(dataclasses, "_FIELD_CLASSVAR", None)
+
+            fields = [
+                field for field in fields.values()
+                if field.init
+                and getattr(field, "_field_type", None) is not class_var
+            ]
+
+            # Keyword only fields come after the others in __init__
+            keyword_fields = [
+                field for field in fields if getattr(field, "kw_only", False)
+                is True
+            ]
+            fields = [
+                field for field in fields if field not in keyword_fields
+            ] + keyword_fields
+            self.keywords = len(keyword_fields)
+
+            for field in fields:
+                default = field.default
+                factory = field.default_factory
+                has_default = default is not missing or factory is not missing
+                if default is missing:
+                    default = None
+                if factory is missing:
+                    factory = None
+
+                field_short = short
+                if "short" in field.metadata:
+                    field_short = {field.name: field.metadata["short"]}
+
+                self.flags.append(_flag(
+                    field.name,
+                    field.type,
+                    has_default,
+                    default,
+                    field_short,
+                    namespace
+                ))
+                self.defaults.append((default, factory))
+
+        elif isinstance(getattr(cls, "_fields", None), tuple):
+            annotations = getattr(cls, "__annotations__", {})
+            field_defaults = getattr(cls, "_field_defaults", {})
+
+            for name in cls._fields:
+                default = field_defaults.get(name)
+                self.flags.append(_flag(
+                    name,
+                    annotations.get(name),
+                    name in field_defaults,
+                    default,
+                    short,
+                    namespace
+                ))
+                self.defaults.append((default, None))
+
+        else:
+            raise Exception(
+                f"{cls.__qualname__} is not a dataclass or a NamedTuple"
+            )
+
+        self.positional_count = len(self.flags) - self.keywords
+        self.keyword_names = [flag[0] for flag in self.flags][
+            self.positional_count:
+        ]
+
+
+def _convert(convert: "Callable", value, on_error: dict):
+    if convert is None:
+        return value
+
+    try:
+        return convert(value)
+
+    # Values that can't be converted are handled like get_num handles them
+    except (TypeError, ValueError):
+        handle_num = on_error.get("ERR_NUM")
+        if handle_num is None:
+            if convert in (int, float):
+                print(f"ERR_NUM: \"{value}\" is not a number")
+            else:
+                name = getattr(convert, "__name__", convert)
+                print(f"ERR_NUM: \"{value}\" is not a valid {name}")
+            exit(1)
+
+        handle_num(value)
+        return None
+
+
+def _missing(name: str, on_error: dict) -> None:
+    handle_none = on_error.get("ERR_NONE")
+    if handle_none is None:
+        print(f"ERR_NONE: There is no value provided for {name}")
+        exit(1)
+
+    handle_none()
+
+
+class _Cli():
+    """
+    A function made into a command line by `cli`. Calling it calls the
+    function as it is, unless it is given a single `command`, which is
+    what `dispatch` does, in which case the parameters are collected from
+    the arguments of the command.
+    """
+
+    def __init__(
+        self,
+        function: "Callable",
+        name: "Union[str, None]",
+        short: dict,
+        on_error: dict
+    ):
+        self.function = function
+        self.name = name
+        self.short = short
+        self.on_error = on_error
+        self.binding = None
+
+        # Looks like the function to dispatch and help()
+        self.__wrapped__ = function
+        self.__doc__ = function.__doc__
+        self.__name__ = getattr(function, "__name__", name)
+        self.__qualname__ = getattr(function, "__qualname__", name)
+        self.__module__ = getattr(function, "__module__", None)
+
+    def __repr__(self) -> str:
+        return f"<cli {self.__qualname__}>"
+
+    def __call__(self, *args, **kwargs):
+        if len(args) == 1 and isinstance(args[0], klarg.command):
+            return self.run(args[0].all_arguments, **kwargs)
+
+        return self.function(*args, **kwargs)
+
+    def bind(self, args_list: list) -> tuple:
+        """
+        Returns the positional and keyword arguments the function is
+        called with for `args_list`.
+        """
+
+        # Worked out the first time the function is run, so that a program
+        # with many commands only looks at the one that was given
+        binding = self.binding
+        if binding is None:
+            binding = self.binding = _Binding(self.function, self.short)
+
+        on_error = self.on_error
+
+        kwargs = {}
+        for flag in binding.flags:
+            value = _flag_value(flag, args_list, on_error)
+            if value is not _DEFAULT:
+                kwargs[flag[0]] = value
+
+        # Every value that is not a flag or the value of one is positional
+        index = klarg._index_for(args_list)
+        taken = set()
+        for flag, short in binding.value_flags:
+            for name in (
+                index.settings.long_name(flag),
+                index.settings.short_name(short)
+            ):
+                for position in index.occurrences(name):
+                    taken.add(position + 1)
+
+        positionals = [
+            arg for position, arg in enumerate(args_list)
+            if not index.is_flag_at(position) and position not in taken
+        ]
+
+        args = []
+        for number, (name, convert) in enumerate(binding.positionals):
+            if number >= len(positionals):
+                _missing(name, on_error)
+                return args, kwargs
+
+            args.append(_convert(convert, positionals[number], on_error))
+
+        if binding.rest is not None:
+            name, convert = binding.rest
+            args.extend(
+                _convert(convert, arg, on_error)
+                for arg in positionals[len(binding.positionals):]
+            )
+
+        return args, kwargs
+
+    def run(self, args_list: "Union[list, None]" = None, **kwargs):
+        """
+        `args_list: list: optional`
+
+        Calls the function with the parameters collected from `args_list`,
+        `ALL_ARGS` by default, and returns what it returned.
+        """
+
+        if args_list is None:
+            args_list = klarg._all_args()
+
+        args, bound = self.bind(args_list)
+        bound.update(kwargs)
+        return self.function(*args, **bound)
+
+
+def cli(
+    function: "Union[Callable, None]" = None,
+    name: "Union[str, None]" = None,
+    short: dict = {},
+    on_error: dict = {}
+):
+    """
+    `function: function: NEEDED`
+
+    `name: str: optional`
+
+    `short: dict: optional`
+
+    `on_error: dict: optional`
+
+    `cli` makes the parameters of a function into a command line, so that
+    `main.run()` collects them from `ALL_ARGS` and calls `main` with them.
+    Parameters with a default and keyword only parameters are flags, with
+    `_` in the name written as `-`, and the other parameters are taken in
+    order from the arguments that are not flags or their values, with any
+    that are left going to `*args`. Parameters annotated (or defaulting to)
+    `bool` are collected with `get_bool` and `list` or `tuple` with
+    `get_list`, every other annotation, like `int` or `pathlib.Path`, is
+    called with the value. `short` is a dictionary of parameter names and
+    their short flags, and `on_error` is handled like by `get_num`, with
+    `ERR_NONE` for missing values and `ERR_NUM` for values the annotation
+    could not convert. The parameters are only looked at the first time
+    the function is run.
+
+    When `name` is given, the function is also a command that is run by
+    `dispatch` when it is not given any handlers. The function can still
+    be called as it is, and is given the arguments of the command when it
+    is called with a `command`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    @klarg.cli(name="build", short={"jobs": "j"})
+    def build(target: str, *, jobs: int = 1, dry_run: bool = False):
+        print(f"Building {target} with {jobs} jobs, dry run: {dry_run}")
+
+    @klarg.cli(name="clean")
+    def clean(*paths):
+        print(f"Removing {', '.join(paths)}")
+
+    klarg.dispatch()
+
+    # python docs_example.py build app -j 4 --dry-run
+    # Building app with 4 jobs, dry run: True
+
+    # python docs_example.py clean build dist
+    # Removing build, dist
+    ```
+
+    """
+
+    def decorate(function: "Callable") -> _Cli:
+        command_line = _Cli(function, name, short, on_error)
+        if name is not None:
+            klarg.command.handlers[name] = command_line
+
+        return command_line
+
+    if function is None:
+        return decorate
+
+    return decorate(function)
+
+
+def base_get_into(
+    cls: type,
+    args_list: list,
+    short: dict = {},
+    on_error: dict = {}
+):
+    """
+    `cls: type: NEEDED`
+
+    `short: dict: optional`
+
+    `on_error: dict: optional`
+
+    `get_into` collects a flag for every field of `cls`, a dataclass (like
+    one with `slots=True`) or a `NamedTuple`, and returns an instance of
+    `cls` made from them, without collecting them in a dictionary first.
+    Fields are collected like the flags of `cli`, with `_` in the name
+    written as `-`, `bool` fields collected with `get_bool`, `list` and
+    `tuple` fields with `get_list` and every other annotation called with
+    the value. Fields with a default (or a `default_factory`) keep it when
+    their flag is not given, and fields without one are handled as
+    `ERR_NONE`. `short` is a dictionary of field names and their short
+    flags, which a dataclass field can also give as `metadata={"short":
+    "j"}`. What every field is collected with is only worked out the first
+    time a class is given.
+
+    Example:
+    ```py
+    # docs_example.py
+    from dataclasses import dataclass
+    import klarg
+
+    @dataclass(frozen=True, slots=True)
+    class Options:
+        target: str
+        jobs: int = 1
+        dry_run: bool = False
+
+    options = klarg.get_into(Options, short={"jobs": "j"})
+    print(options)
+
+    # python docs_example.py --target app -j 4
+    # Options(target='app', jobs=4, dry_run=False)
+    ```
+
+    """
+
+    key = (cls, tuple(short.items()))
+    binding = _CLASS_BINDINGS.get(key)
+    if binding is None:
+        binding = _CLASS_BINDINGS[key] = _ClassBinding(cls, short)
+
+    values = []
+    for flag, (default, factory) in zip(binding.flags, binding.defaults):
+        value = _flag_value(flag, args_list, on_error)
+        if value is _DEFAULT:
+            value = default if factory is None else factory()
+
+        values.append(value)
+
+    if not binding.keywords:
+        return cls(*values)
+
+    count = binding.positional_count
+    return cls(
+        *values[:count],
+        **dict(zip(binding.keyword_names, values[count:]))
+    )
+
+
+def get_into(cls: type, short: dict = {}, on_error: dict = {}):
+    """
+    `cls: type: NEEDED`
+
+    `short: dict: optional`
+
+    `on_error: dict: optional`
+
+    `get_into` collects a flag for every field of `cls`, a dataclass (like
+    one with `slots=True`) or a `NamedTuple`, and returns an instance of
+    `cls` made from them, without collecting them in a dictionary first.
+    Fields are collected like the flags of `cli`, with `_` in the name
+    written as `-`, `bool` fields collected with `get_bool`, `list` and
+    `tuple` fields with `get_list` and every other annotation called with
+    the value. Fields with a default (or a `default_factory`) keep it when
+    their flag is not given, and fields without one are handled as
+    `ERR_NONE`. `short` is a dictionary of field names and their short
+    flags, which a dataclass field can also give as `metadata={"short":
+    "j"}`. What every field is collected with is only worked out the first
+    time a class is given.
+
+    Example:
+    ```py
+    # docs_example.py
+    from dataclasses import dataclass
+    import klarg
+
+    @dataclass(frozen=True, slots=True)
+    class Options:
+        target: str
+        jobs: int = 1
+        dry_run: bool = False
+
+    options = klarg.get_into(Options, short={"jobs": "j"})
+    print(options)
+
+    # python docs_example.py --target app -j 4
+    # Options(target='app', jobs=4, dry_run=False)
+    ```
+
+    """
+
+    return base_get_into(
+        cls=cls,
+        short=short,
+        on_error=on_error,
+        args_list=klarg._all_args()
+    )
@@ -0,0 +1,389 @@
+"""
+Generating parser modules for `klarg.codegen`, loaded the first time it
+is used.
+"""
+
+import klarg
+from klarg._parsed import _schema_fields
+
+# Put at the top of every generated module, before the parse function
+_HEADER = '''\
+# Generated by klarg {version} from {source}, do not edit.
+# Run `python -m klarg codegen` again after changing the schema, and
+# `python -m klarg codegen --check` to find out if this file is out of date.
+"""
+{description}
+"""
+
+import klarg
+from klarg._parsed import parsed
+
+NAMES = {names}
+COMMANDS = {commands}
+
+
+def _none(handle, flag):
+    if handle is None:
+        print(f"ERR_NONE: There is no value provided for {{flag}}")
+        exit(1)
+
+    handle()
+
+
+def _mul(handle, flag):
+    if handle is None:
+        print(f"ERR_MUL: There are multiple values provided for {{flag}}")
+        exit(1)
+
+    handle()
+
+
+def _num(handle, value):
+    if handle is None:
+        print(f"ERR_NUM: \\"{{value}}\\" is not a number")
+        exit(1)
+
+    handle(value)
+
+
+def get_command(args_list=None):
+    """
+    Returns the first argument that is one of `COMMANDS`, or None if
+    there is none.
+    """
+
+    if args_list is None:
+        args_list = klarg.get_all()
+
+    for arg in args_list:
+        if arg in COMMANDS:
+            return arg
+
+    return None
+'''
+
+
+class _Writer():
+    """
+    Collects the lines of generated code, indented by `indent()`.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.depth = 0
+
+    def line(self, text: str = "") -> None:
+        self.lines.append(("    " * self.depth + text) if text else "")
+
+    def indent(self, depth: int = 1) -> None:
+        self.depth += depth
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _check_settings(settings, fields: list) -> None:
+    if settings.bytes_mode:
+        raise Exception(
+            "Parsers can't be generated when \"bytes_mode\" is on"
+        )
+
+    if not settings.plain:
+        raise Exception(
+            "Parsers can't be generated with \"prefix_schemes\", only with "
+            "the long and short prefix"
+        )
+
+    if settings.needs_short_flags:
+        for name, kind, short in fields:
+            if short == "default-short":
+                raise Exception(
+                    f"No short flag for {settings.long_name(name)}"
+                )
+
+
+def _write_loop(out: _Writer, settings, fields: list) -> None:
+    long_prefix = settings.long_prefix
+    short_prefix = settings.short_prefix
+
+    # The code run for every flag, there can be more than one field for
+    # the same flag
+    branches = {}
+    stacked = []
+    for number, (name, kind, short) in enumerate(fields):
+        flags = [("long", settings.long_name(name))]
+        if short != "default-short":
+            flags.append(("short", settings.short_name(short)))
+
+        for side, flag in flags:
+            if kind in ("str", "num"):
+                code = [
+                    f"{side}{number}_count += 1",
+                    f"if {side}{number} < 0:",
+                    f"    {side}{number} = position",
+                ]
+            elif kind == "list":
+                code = [f"positions{number}.append(position)"]
+            elif kind == "bool":
+                code = [f"value{number} = True"]
+            else:
+                code = [f"value{number} += 1"]
+
+            branches.setdefault(flag, []).extend(code)
+
+        # Stacked short flags (-vvv) also count towards the single letter
+        if kind == "count" and short != "default-short" and len(short) == 1:
+            stacked.append((short, number))
+
+    if long_prefix.startswith(short_prefix):
+        prefixes = repr(short_prefix)
+    else:
+        prefixes = repr((long_prefix, short_prefix))
+
+    out.line("for position, arg in enumerate(args_list):")
+    out.indent()
+    out.line(f"if not arg.startswith({prefixes}):")
+    out.line("    continue")
+
+    # Flags that run the same code share a branch
+    shared = {}
+    for flag, code in branches.items():
+        shared.setdefault(tuple(code), []).append(flag)
+
+    keyword = "if"
+    for code, flags in shared.items():
+        checks = " or ".join(f"arg == {flag!r}" for flag in flags)
+        out.line()
+        out.line(f"{keyword} {checks}:")
+        for line in code:
+            out.line("    " + line)
+        keyword = "elif"
+
+    if stacked:
+        def is_stacked(flag: str) -> bool:
+            letters = flag[len(short_prefix):]
+            return (
+                flag.startswith(short_prefix)
+                and not flag.startswith(long_prefix)
+                and len(letters) > 1
+                and letters == letters[0] * len(letters)
+            )
+
+        # Stacked flags are only looked for in arguments that aren't any
+        # of the flags, unless one of the flags is stacked itself
+        out.line()
+        if any(map(is_stacked, branches)):
+            keyword = "if"
+
+        # Every argument here already starts with the short prefix when
+        # the long prefix does
+        checks = [f"not arg.startswith({long_prefix!r})"]
+        if not long_prefix.startswith(short_prefix):
+            checks.insert(0, f"arg.startswith({short_prefix!r})")
+
+        out.line(f"{keyword} {' and '.join(checks)}:")
+        out.indent()
+        out.line(f"letters = arg[{len(short_prefix)}:]")
+        out.line(
+            "if len(letters) > 1 and letters == letters[0] * len(letters):"
+        )
+        out.indent()
+        keyword = "if"
+        for letter, number in stacked:
+            out.line(f"{keyword} letters[0] == {letter!r}:")
+            out.line(f"    value{number} += len(letters)")
+            keyword = "elif"
+        out.indent(-2)
+
+    out.indent(-1)
+
+
+def _write_value(out: _Writer, settings, number: int, field: tuple) -> None:
+    name, kind, short = field
+    long_name = settings.long_name(name)
+    has_short = short != "default-short"
+
+    flags = f"({settings.long_prefix!r}, {settings.short_prefix!r})"
+    reserved = repr(settings.help_flag + settings.version_flag)
+
+    if kind in ("bool", "count"):
+        return
+
+    out.line()
+    out.line(f"# {long_name}")
+
+    if kind == "list":
+        out.line(f"value{number} = []")
+        out.line(f"for position in positions{number}:")
+        out.indent()
+        out.line("if position + 1 >= size or (")
+        out.line(f"    args_list[position + 1].startswith({flags})")
+        out.line("):")
+        out.line(f"    _none(handle_none, {long_name!r})")
+        out.line("    continue")
+        out.line()
+        out.line(f"value{number}.append(args_list[position + 1])")
+        out.indent(-1)
+        out.line(f"value{number} = tuple(value{number})")
+        return
+
+    found = f"long{number} >= 0"
+    if has_short:
+        found += f" or short{number} >= 0"
+
+    out.line(f"if not ({found}):")
+    out.line(f"    value{number} = None")
+    out.line("else:")
+    out.indent()
+
+    out.line("if size < 2:")
+    out.line(f"    _none(handle_none, {long_name!r})")
+
+    many = f"long{number}_count > 1"
+    if has_short:
+        many += f" or short{number}_count > 1"
+    out.line(f"if {many}:")
+    out.line(f"    _mul(handle_mul, {long_name!r})")
+
+    if has_short:
+        out.line(f"if long{number} >= 0 and short{number} >= 0:")
+        out.line(f"    _mul(handle_mul, {long_name!r})")
+        out.line(
+            f"position = long{number} if long{number} >= 0 else short{number}"
+        )
+    else:
+        out.line(f"position = long{number}")
+
+    out.line()
+    out.line("if position + 1 >= size:")
+    out.line(f"    _none(handle_none, {long_name!r})")
+    out.line(f"    value{number} = None")
+    out.line("else:")
+    out.indent()
+    out.line(f"value{number} = args_list[position + 1]")
+    out.line(f"if value{number}.startswith({flags}) or (")
+    out.line(f"    value{number} in {reserved}")
+    out.line("):")
+    out.line(f"    _none(handle_none, {long_name!r})")
+    out.line(f"    value{number} = None")
+
+    if kind == "num":
+        out.line(f"elif \".\" in value{number}:")
+        out.line(f"    value{number} = float(value{number})")
+        out.line("else:")
+        out.line("    try:")
+        out.line(f"        value{number} = int(value{number})")
+        out.line("    except ValueError:")
+        out.line(f"        _num(handle_num, value{number})")
+        out.line(f"        value{number} = None")
+
+    out.indent(-2)
+
+
+def codegen(schema: dict, commands: list = [], source: str = "") -> str:
+    """
+    `schema: dict: NEEDED`
+
+    `commands: list: optional`
+
+    `source: str: optional`
+
+    `codegen` returns the code of a Python module with a `parse` function
+    made for `schema`, in the same format as `get_parsed`. `parse` goes
+    over the arguments once, comparing them to the flags written out in
+    the code, and returns the same `parsed` result as `get_parsed` with
+    the same `on_error` handling, without building an index first. The
+    module also has a `get_command` function for `commands`. The current
+    `CONFIG` is written into the module, and `source`, where the schema
+    came from, is written at the top of it. Use `python -m klarg codegen`
+    to write the module to a file and to check that it is up to date.
+
+    Example:
+    ```py
+    # make_parser.py
+    import klarg
+
+    with open("fast_cli.py", "w") as file:
+        file.write(klarg.codegen({"jobs": ("num", "j"), "verbose": "count"}))
+
+    # docs_example.py
+    import fast_cli
+
+    arguments = fast_cli.parse()
+    print(f"Running {arguments.jobs} jobs")
+
+    # python docs_example.py -j 4
+    # Running 4 jobs
+    ```
+
+    """
+
+    import textwrap
+
+    settings = klarg._settings()
+    fields = _schema_fields(schema)
+    _check_settings(settings, fields)
+
+    names = tuple(name for name, _, _ in fields)
+    kinds = set(kind for _, kind, _ in fields)
+
+    out = _Writer()
+    out.lines.append(_HEADER.format(
+        version=klarg.__version__,
+        source=source or "a schema",
+        description=textwrap.fill(
+            "A parser generated by klarg for the flags "
+            + (", ".join(settings.long_name(name) for name in names) or "-")
+            + "."
+        ),
+        names=repr(names),
+        commands=f"frozenset({sorted(commands)!r})"
+    ))
+    out.line()
+    out.line("def parse(args_list=None, on_error={}):")
+    out.indent()
+    out.line('"""')
+    out.line("Returns the flags in `NAMES` as a `klarg.parsed` result, like")
+    out.line("`klarg.get_parsed` would.")
+    out.line('"""')
+    out.line()
+    out.line("if args_list is None:")
+    out.line("    args_list = klarg.get_all()")
+    out.line()
+    out.line("size = len(args_list)")
+    if fields:
+        out.line()
+
+    for number, (name, kind, short) in enumerate(fields):
+        if kind in ("str", "num"):
+            out.line(f"long{number} = short{number} = -1")
+            out.line(f"long{number}_count = short{number}_count = 0")
+        elif kind == "list":
+            out.line(f"positions{number} = []")
+        elif kind == "bool":
+            out.line(f"value{number} = False")
+        else:
+            out.line(f"value{number} = 0")
+
+    out.line()
+    _write_loop(out, settings, fields)
+
+    if kinds & {"str", "num", "list"}:
+        out.line()
+        out.line("handle_none = on_error.get(\"ERR_NONE\")")
+    if kinds & {"str", "num"}:
+        out.line("handle_mul = on_error.get(\"ERR_MUL\")")
+    if "num" in kinds:
+        out.line("handle_num = on_error.get(\"ERR_NUM\")")
+
+    for number, field in enumerate(fields):
+        _write_value(out, settings, number, field)
+
+    values = ", ".join(f"value{number}" for number in range(len(fields)))
+    if len(fields) == 1:
+        values += ","
+
+    out.line()
+    out.line(f"return parsed(NAMES, ({values}))")
+
+    return out.text()
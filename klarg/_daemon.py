@@ -0,0 +1,441 @@
+"""
+A server that keeps a program's commands imported for `klarg.serve`, and
+the client that runs them through it for `klarg.client`, loaded the first
+time they are used.
+"""
+
+import os
+import sys
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Union
+
+# Changes whenever the messages between the client and the server change
+_PROTOCOL = 1
+
+# The longest request a client can send, its arguments and environment
+_MAX_REQUEST = 16 * 1024 * 1024
+
+# How many seconds a client has to send its request
+_REQUEST_TIMEOUT = 10
+
+
+def _send_request(connection, request: bytes, stdio: tuple) -> None:
+    import socket
+    from array import array
+
+    message = len(request).to_bytes(4, "big") + request
+
+    # The descriptors go with the first part of the message, sendmsg can
+    # send less than all of it like send can
+    sent = connection.sendmsg(
+        [message],
+        [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array("i", stdio))]
+    )
+    connection.sendall(message[sent:])
+
+
+def _receive_request(connection) -> tuple:
+    """
+    Returns the request a client sent and the descriptors of its standard
+    input, output and error.
+    """
+
+    import socket
+    from array import array
+
+    descriptors = array("i")
+    data, ancillary, _, _ = connection.recvmsg(
+        65536,
+        socket.CMSG_SPACE(3 * descriptors.itemsize)
+    )
+
+    for level, kind, value in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            usable = len(value) - len(value) % descriptors.itemsize
+            descriptors.frombytes(value[:usable])
+
+    try:
+        if len(data) < 4:
+            raise ConnectionError("The request was cut short")
+
+        size = int.from_bytes(data[:4], "big")
+        if size > _MAX_REQUEST:
+            raise ConnectionError("The request is too large")
+
+        chunks = [data[4:]]
+        received = len(data) - 4
+        while received < size:
+            chunk = connection.recv(min(size - received, 1024 * 1024))
+            if not chunk:
+                raise ConnectionError("The request was cut short")
+
+            chunks.append(chunk)
+            received += len(chunk)
+
+        if len(descriptors) != 3:
+            raise ConnectionError("The request has no standard streams")
+
+    except Exception:
+        for descriptor in descriptors:
+            os.close(descriptor)
+        raise
+
+    import marshal
+
+    return marshal.loads(b"".join(chunks)), tuple(descriptors)
+
+
+def _reopen_stdio() -> None:
+    # The streams are made again so that they are line buffered when they
+    # are a terminal of the client, like in a program that was run
+    for number, name, mode in (
+        (0, "stdin", "r"),
+        (1, "stdout", "w"),
+        (2, "stderr", "w")
+    ):
+        old = getattr(sys, name)
+        interactive = name == "stderr" or os.isatty(number)
+        setattr(sys, name, open(
+            number,
+            mode,
+            buffering=1 if interactive and mode == "w" else -1,
+            encoding=getattr(old, "encoding", None),
+            errors=getattr(old, "errors", None),
+            closefd=False
+        ))
+
+
+def _exit_code(value) -> int:
+    # Works out the exit code of a SystemExit like the interpreter does
+    if value is None:
+        return 0
+
+    if type(value) == int:
+        return value
+
+    print(value, file=sys.stderr)
+    return 1
+
+
+def _run_request(
+    request: tuple,
+    stdio: tuple,
+    handlers: "Union[dict, None]",
+    resolvers: dict
+) -> int:
+    """
+    Runs the command of a request in the process forked for it, with the
+    standard streams, directory, environment and arguments of the client,
+    and returns its exit code.
+    """
+
+    import signal
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    # The streams come first, so that whatever goes wrong is shown to the
+    # client
+    for number, descriptor in enumerate(stdio):
+        os.dup2(descriptor, number)
+        os.close(descriptor)
+
+    _reopen_stdio()
+
+    protocol, argv, cwd, environ = request
+    if protocol != _PROTOCOL:
+        raise Exception(f"Unknown klarg client protocol {protocol}")
+
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(environ)
+
+    # ALL_ARGS is copied from the new sys.argv the next time it is needed
+    sys.argv = list(argv)
+    vars(klarg).pop("ALL_ARGS", None)
+
+    try:
+        result = klarg.base_dispatch(handlers, klarg._all_args(), resolvers)
+        return result if type(result) == int else 0
+
+    except SystemExit as error:
+        return _exit_code(error.code)
+
+    except KeyboardInterrupt:
+        return 130
+
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+
+
+def _listen(socket_path: str):
+    import socket
+
+    # A socket left behind by a server that stopped is replaced, one that
+    # is still being served is not
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            raise Exception(f"{socket_path} is already being served")
+        finally:
+            probe.close()
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    # Anyone who can connect can run the commands as this user
+    old_mask = os.umask(0o177)
+    try:
+        listener.bind(socket_path)
+    finally:
+        os.umask(old_mask)
+
+    listener.listen(64)
+    return listener
+
+
+def serve(
+    socket_path: str,
+    handlers: "Union[dict, None]" = None,
+    resolvers: dict = {},
+    preload: list = [],
+    ready: "Union[Callable, None]" = None
+) -> None:
+    """
+    `socket_path: str: NEEDED`
+
+    `handlers: dict: optional`
+
+    `resolvers: dict: optional`
+
+    `preload: list: optional`
+
+    `ready: function: optional`
+
+    `serve` keeps a program warm in the background, so that running one of
+    its commands doesn't pay for starting Python and importing everything
+    again. It imports the modules in `preload` and the plugins in
+    `handlers`, compiles `CONFIG`, and then waits for `client` to connect
+    to the Unix socket at `socket_path`. Every request is run in a process
+    forked from the server, with the arguments, directory, environment and
+    standard streams of the client, and goes through `dispatch` with
+    `handlers` and `resolvers` (the commands made with `cli` without
+    `handlers`). What the handler returns, if it is an `int`, or what it
+    gives `sys.exit()` is the exit code the client returns, and a
+    request that can't be run returns `1` with the error shown to the
+    client. `ready` is called once the socket can be connected to.
+    `serve` runs until it is stopped with `SIGTERM` or `SIGINT`, and
+    removes the socket when it stops. Only the user running the server can
+    connect to the socket. This needs `fork` and Unix sockets, so it does
+    not work on Windows.
+
+    Example:
+    ```py
+    # my_tool_server.py
+    import klarg
+    import my_tool
+
+    klarg.serve("/tmp/my-tool.sock", my_tool.HANDLERS, preload=["numpy"])
+
+    # my_tool_client.py
+    import sys
+    import klarg
+
+    try:
+        sys.exit(klarg.client("/tmp/my-tool.sock"))
+    except OSError:
+        # Not being served, runs the commands the usual way
+        import my_tool
+        klarg.dispatch(my_tool.HANDLERS)
+
+    # python my_tool_server.py &
+    # python my_tool_client.py build -j 4
+    ```
+
+    """
+
+    import gc
+    import signal
+    import marshal
+    import importlib
+
+    if not hasattr(os, "fork") or not hasattr(os, "dup2"):
+        raise Exception("serve needs fork, which this platform doesn't have")
+
+    for module_name in preload:
+        importlib.import_module(module_name)
+
+    # Plugins are imported now instead of for every request
+    if handlers is not None:
+        handlers = {
+            name: handler.load()
+            if not callable(handler) and hasattr(handler, "load")
+            else handler
+            for name, handler in handlers.items()
+        }
+
+    klarg._settings()
+    listener = _listen(socket_path)
+
+    def stop(signal_number, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Finished requests are cleaned up by the system, and whatever was
+    # imported is left out of the garbage collector, so forked processes
+    # share its memory instead of copying it
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    gc.freeze()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    if ready is not None:
+        ready()
+
+    try:
+        while True:
+            try:
+                connection, _ = listener.accept()
+            except InterruptedError:
+                continue
+
+            # The request is read in the forked process, so a client that
+            # is slow to send it doesn't hold up the others
+            pid = os.fork()
+            if pid != 0:
+                connection.close()
+                continue
+
+            # In the forked process, which never goes back to the loop
+            code = 1
+            try:
+                listener.close()
+                connection.settimeout(_REQUEST_TIMEOUT)
+                request, stdio = _receive_request(connection)
+                connection.settimeout(None)
+
+                try:
+                    code = _run_request(
+                        request,
+                        stdio,
+                        handlers,
+                        resolvers
+                    )
+                except BaseException:
+                    # Shown on the standard error of the client, which
+                    # _run_request has switched to before anything can fail
+                    import traceback
+
+                    traceback.print_exc()
+                    sys.stderr.flush()
+                    code = 1
+
+                connection.sendall(marshal.dumps(code))
+
+            # A client that never sent a whole request or went away has
+            # nothing to be told
+            except BaseException:
+                pass
+            finally:
+                os._exit(code & 0xFF if type(code) == int else 1)
+
+    finally:
+        listener.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def client(
+    socket_path: str,
+    args_list: "Union[list, None]" = None,
+    stdio: "Union[tuple, None]" = None
+) -> int:
+    """
+    `socket_path: str: NEEDED`
+
+    `args_list: list: optional`
+
+    `stdio: tuple: optional`
+
+    `client` runs a command through the `serve` server listening at
+    `socket_path`, and returns the exit code of the command. The server is
+    given `args_list` (`sys.argv[1:]` by default), the current directory,
+    the environment and the standard input, output and error of this
+    process, or the descriptors in `stdio`, which the command reads and
+    writes directly. `client` only imports `socket` and `marshal`, so a
+    program that only calls it starts about as fast as Python does. An
+    `OSError` is raised when nothing is being served at `socket_path`.
+
+    Example:
+    ```py
+    # my_tool_client.py
+    import sys
+    import klarg
+
+    sys.exit(klarg.client("/tmp/my-tool.sock"))
+
+    # python my_tool_client.py build -j 4
+    # (runs the build command in the server started with serve)
+    ```
+
+    """
+
+    import socket
+    import marshal
+
+    if args_list is None:
+        args_list = sys.argv[1:]
+
+    if stdio is None:
+        stdio = (0, 1, 2)
+
+    for stream in (sys.stdout, sys.stderr):
+        if stream is not None:
+            stream.flush()
+
+    request = marshal.dumps((
+        _PROTOCOL,
+        [sys.argv[0] if sys.argv else "", *args_list],
+        os.getcwd(),
+        dict(os.environ)
+    ))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        _send_request(connection, request, tuple(stdio))
+        connection.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = connection.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+    # A command that was stopped before it finished sends nothing back
+    try:
+        return marshal.loads(b"".join(chunks))
+    except (EOFError, ValueError, TypeError):
+        return 1
@@ -0,0 +1,261 @@
+"""
+Running the handler of a command for `klarg.dispatch`, loaded the first
+time it is used.
+"""
+
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Union
+
+
+def _is_async(function: "Callable") -> bool:
+    # Checks for CO_COROUTINE without importing asyncio or inspect, for
+    # the function that is really called: the function itself when it is
+    # wrapped (like by cli()), the function of a functools.partial and the
+    # __call__ method of any other object
+    from functools import partial
+
+    # Deep enough for any real chain, and stops the ones that never end
+    for _ in range(16):
+        function = getattr(function, "__wrapped__", function)
+        if isinstance(function, partial):
+            function = function.func
+            continue
+
+        code = getattr(function, "__code__", None)
+        if code is not None:
+            return bool(code.co_flags & 0x80)
+
+        function = getattr(type(function), "__call__", None)
+        if function is None:
+            return False
+
+    return False
+
+
+def _is_awaitable(value) -> bool:
+    # What a function that is async in a way _is_async() can't see returns
+    return hasattr(type(value), "__await__")
+
+
+def _new_event_loop():
+    # uvloop is faster than the default event loop, when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+        return asyncio.new_event_loop()
+
+    return uvloop.new_event_loop()
+
+
+def _run_in_loop(awaitable):
+    import asyncio
+
+    loop = _new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(awaitable)
+
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+async def _dispatch_async(handler: "Callable", command, resolvers: dict):
+    import asyncio
+    import functools
+
+    loop = asyncio.get_event_loop()
+
+    # Every resolver starts now, functions that aren't async run on threads
+    tasks = {}
+    for name, resolver in resolvers.items():
+        if _is_async(resolver):
+            tasks[name] = asyncio.ensure_future(resolver(command))
+        else:
+            tasks[name] = loop.run_in_executor(
+                None,
+                functools.partial(resolver, command)
+            )
+
+    try:
+        # An async handler starts right away and waits for values itself
+        if _is_async(handler):
+            return await handler(command, **tasks)
+
+        values = await asyncio.gather(*tasks.values())
+        result = handler(command, **dict(zip(tasks, values)))
+        if _is_awaitable(result):
+            result = await result
+
+        return result
+
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+def base_dispatch(
+    handlers: "Union[dict, None]",
+    args_list: list,
+    resolvers: dict = {}
+):
+    """
+    `handlers: dict: optional`
+
+    `resolvers: dict: optional`
+
+    `dispatch` runs the handler of the command that was given. `handlers`
+    is a dictionary of command names and functions, and the first argument
+    that is one of the command names picks the function. The function is
+    called with a `command` for that name, and returns what it returned.
+    If no command was given, `dispatch` returns None. Plugins from
+    `find_plugins` can be given as handlers, and are only imported if their
+    command was given. Without `handlers`, the commands made with `cli`
+    are used.
+
+    `resolvers` is a dictionary of names and functions that collect
+    something the handler needs, like loading a config file or checking
+    the values with `validate`. They are called with the same `command`
+    and all run at the same time, and what they return is given to the
+    handler as keyword arguments. Handlers and resolvers can be `async`
+    functions, in which case they all run in a single event loop (using
+    `uvloop` if it is installed), and the resolvers that are not `async`
+    run on threads. An `async` handler is started right away and gets the
+    resolvers as tasks, which it can `await` when it needs their values.
+
+    Example:
+    ```py
+    # docs_example.py
+    import asyncio
+    import klarg
+
+    async def load_config(command):
+        await asyncio.sleep(0.1)
+        return {"name": command.get_str("name", "n")}
+
+    async def greet(command, config):
+        print("Starting up")
+        print(f"Hello {(await config)['name']}")
+
+    klarg.dispatch({"greet": greet}, resolvers={"config": load_config})
+
+    # python docs_example.py greet -n klarg
+    # Starting up
+    # Hello klarg
+    ```
+
+    """
+
+    if handlers is None:
+        handlers = klarg.command.handlers
+
+    # With bytes_mode the arguments are compared with the names as bytes
+    names = handlers
+    if len(args_list) > 0 and type(args_list[0]) == bytes:
+        encode = klarg._settings().bytes.encode
+        names = {encode(name): name for name in handlers}
+
+    for arg in args_list:
+        if arg in names:
+            name = names[arg] if names is not handlers else arg
+            break
+    else:
+        return None
+
+    handler = handlers[name]
+
+    # Plugins (and entry points) are only imported when they are given
+    if not callable(handler) and hasattr(handler, "load"):
+        handler = handler.load()
+
+    command = klarg.command(name, args_list=args_list)
+
+    needs_loop = _is_async(handler) or any(
+        _is_async(resolver) for resolver in resolvers.values()
+    )
+
+    if needs_loop:
+        return _run_in_loop(_dispatch_async(handler, command, resolvers))
+
+    if not resolvers:
+        result = handler(command)
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=len(resolvers)) as executor:
+            futures = {
+                name: executor.submit(resolver, command)
+                for name, resolver in resolvers.items()
+            }
+            values = {
+                name: future.result() for name, future in futures.items()
+            }
+
+        result = handler(command, **values)
+
+    # The handler was async after all, instead of handing back a coroutine
+    # that never runs it is run in an event loop
+    if _is_awaitable(result):
+        return _run_in_loop(result)
+
+    return result
+
+
+def dispatch(handlers: "Union[dict, None]" = None, resolvers: dict = {}):
+    """
+    `handlers: dict: optional`
+
+    `resolvers: dict: optional`
+
+    `dispatch` runs the handler of the command that was given. `handlers`
+    is a dictionary of command names and functions, and the first argument
+    that is one of the command names picks the function. The function is
+    called with a `command` for that name, and returns what it returned.
+    If no command was given, `dispatch` returns None. Plugins from
+    `find_plugins` can be given as handlers, and are only imported if their
+    command was given. Without `handlers`, the commands made with `cli`
+    are used.
+
+    `resolvers` is a dictionary of names and functions that collect
+    something the handler needs, like loading a config file or checking
+    the values with `validate`. They are called with the same `command`
+    and all run at the same time, and what they return is given to the
+    handler as keyword arguments. Handlers and resolvers can be `async`
+    functions, in which case they all run in a single event loop (using
+    `uvloop` if it is installed), and the resolvers that are not `async`
+    run on threads. An `async` handler is started right away and gets the
+    resolvers as tasks, which it can `await` when it needs their values.
+
+    Example:
+    ```py
+    # docs_example.py
+    import asyncio
+    import klarg
+
+    async def load_config(command):
+        await asyncio.sleep(0.1)
+        return {"name": command.get_str("name", "n")}
+
+    async def greet(command, config):
+        print("Starting up")
+        print(f"Hello {(await config)['name']}")
+
+    klarg.dispatch({"greet": greet}, resolvers={"config": load_config})
+
+    # python docs_example.py greet -n klarg
+    # Starting up
+    # Hello klarg
+    ```
+
+    """
+
+    return base_dispatch(
+        handlers=handlers,
+        resolvers=resolvers,
+        args_list=klarg._all_args()
+    )
@@ -0,0 +1,266 @@
+"""
+Values read from files for `klarg.get_file`, loaded the first time they
+are used.
+"""
+
+import os
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Union
+
+
+class file_value():
+    """
+    The value of a flag that can be given as `@path`, returned by
+    `get_file`. Nothing is opened until the value is used, and the file is
+    mapped into memory instead of read, so it is only copied into `bytes`
+    or `str` when `bytes()` or `text()` is called. A value without `@` is
+    used as it is, and `@@` starts a value that begins with `@`.
+    """
+
+    __slots__ = ("path", "data", "file", "map")
+
+    def __init__(self, argument: "Union[str, bytes]"):
+        binary = type(argument) == bytes
+        at = b"@" if binary else "@"
+
+        if argument.startswith(at) and not argument.startswith(at * 2):
+            # Relative paths are relative to where the flag was given, even
+            # if the directory changes before the file is used
+            self.path = os.path.abspath(argument[1:])
+            self.data = None
+        else:
+            self.path = None
+            if argument.startswith(at * 2):
+                argument = argument[1:]
+            # Arguments that were not valid UTF-8 get their bytes back
+            self.data = argument if binary else os.fsencode(argument)
+
+        self.file = None
+        self.map = None
+
+    def __repr__(self) -> str:
+        if self.path is None:
+            return f"file_value({self.data!r})"
+
+        return f"file_value(@{self.path})"
+
+    def __reduce__(self) -> tuple:
+        if self.path is not None:
+            return (file_value, ("@" + os.fsdecode(self.path),))
+
+        # Written the way it was given, with values starting with @ escaped
+        if self.data.startswith(b"@"):
+            return (file_value, (b"@" + self.data,))
+
+        return (file_value, (self.data,))
+
+    def __enter__(self) -> "file_value":
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        if self.path is None:
+            return len(self.data)
+
+        if self.map is not None:
+            return len(self.map)
+
+        return os.stat(self.path).st_size
+
+    def _buffer(self):
+        """
+        Returns the memory map of the file, opening it the first time, or
+        the value when it was not given as a file.
+        """
+
+        if self.data is not None:
+            return self.data
+
+        if self.map is None:
+            import mmap
+
+            file = open(self.path, "rb")
+            try:
+                # Empty files can't be mapped
+                if os.fstat(file.fileno()).st_size == 0:
+                    file.close()
+                    self.data = b""
+                    return self.data
+
+                self.map = mmap.mmap(
+                    file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ
+                )
+            except BaseException:
+                file.close()
+                raise
+
+            self.file = file
+
+        return self.map
+
+    def view(self) -> memoryview:
+        """
+        Returns a `memoryview` of the whole value, without copying it. The
+        view has to be released before the value is closed.
+        """
+
+        return memoryview(self._buffer())
+
+    def bytes(self) -> bytes:
+        """
+        Returns the whole value as `bytes`, which copies it.
+        """
+
+        buffer = self._buffer()
+        return buffer if type(buffer) == bytes else buffer[:]
+
+    def text(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """
+        Returns the whole value decoded as `encoding`.
+        """
+
+        with self.view() as view:
+            return str(view, encoding, errors)
+
+    def lines(self, keepends: bool = False):
+        """
+        Returns an iterator over the lines of the value as `bytes`, which
+        only copies one line at a time.
+        """
+
+        buffer = self._buffer()
+        start = 0
+        end = len(buffer)
+        while start < end:
+            newline = buffer.find(b"\n", start)
+            if newline == -1:
+                yield buffer[start:end]
+                return
+
+            yield buffer[start:newline + 1 if keepends else newline]
+            start = newline + 1
+
+    def close(self) -> None:
+        """
+        Closes the file, if it was opened. It is opened again if the value
+        is used afterwards.
+        """
+
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def base_get_file(
+    name: str,
+    args_list: list,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> "Union[file_value, None]":
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `on_error: dict: optional`
+
+    `get_file` collects a value like `get_str`, and returns it as a
+    `file_value`, or None if the flag is not there. When the value is
+    `@path`, like `--payload @data.json`, the file is only opened when the
+    value is used, and is mapped into memory instead of read: `view()`
+    returns a `memoryview` of it and `lines()` goes over its lines without
+    copying the rest of the file, while `bytes()` and `text()` copy it.
+    A value without `@` is used as it is, and `@@` starts a value that
+    begins with `@`. The file can be closed with `close()` or by using the
+    value in a `with` block. `file_value` can also be used as an
+    annotation with `cli` and `get_into`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    keys = klarg.get_file("keys", "k")
+    if klarg.get_bool("dry-run"):
+        print("Not reading the keys")
+    else:
+        with keys:
+            print(f"Checking {sum(1 for key in keys.lines())} keys")
+
+    # python docs_example.py --keys @keys.txt
+    # Checking 3 keys
+    ```
+
+    """
+
+    value = klarg.base_get_str(
+        name=name,
+        short=short,
+        on_error=on_error,
+        args_list=args_list
+    )
+
+    if value is None:
+        return None
+
+    return file_value(value)
+
+
+def get_file(
+    name: str,
+    short: str = "default-short",
+    on_error: dict = {}
+) -> "Union[file_value, None]":
+    """
+    `name: str: NEEDED`
+
+    `short: str: optional`
+
+    `on_error: dict: optional`
+
+    `get_file` collects a value like `get_str`, and returns it as a
+    `file_value`, or None if the flag is not there. When the value is
+    `@path`, like `--payload @data.json`, the file is only opened when the
+    value is used, and is mapped into memory instead of read: `view()`
+    returns a `memoryview` of it and `lines()` goes over its lines without
+    copying the rest of the file, while `bytes()` and `text()` copy it.
+    A value without `@` is used as it is, and `@@` starts a value that
+    begins with `@`. The file can be closed with `close()` or by using the
+    value in a `with` block. `file_value` can also be used as an
+    annotation with `cli` and `get_into`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    keys = klarg.get_file("keys", "k")
+    if klarg.get_bool("dry-run"):
+        print("Not reading the keys")
+    else:
+        with keys:
+            print(f"Checking {sum(1 for key in keys.lines())} keys")
+
+    # python docs_example.py --keys @keys.txt
+    # Checking 3 keys
+    ```
+
+    """
+
+    return base_get_file(
+        name=name,
+        short=short,
+        on_error=on_error,
+        args_list=klarg._all_args()
+    )
@@ -0,0 +1,613 @@
+"""
+Frozen parse results for `klarg.get_parsed`, loaded the first time they
+are used.
+"""
+
+import os
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Union
+
+# The functions used for every kind of flag in a schema
+_KINDS = {
+    "bool": "base_get_bool",
+    "str": "base_get_str",
+    "num": "base_get_num",
+    "count": "base_get_count",
+    "list": "base_get_list",
+}
+
+# Maps the names of every schema to the position of every name, so that
+# results parsed with the same schema share one dictionary
+_FIELDS = {}
+
+# The environment variable that results are handed to child processes in
+_ENVIRON_NAME = "KLARG_PARSED"
+
+# The last value of _ENVIRON_NAME that was read and what it holds
+_INHERITED = (None, {})
+
+# The longest value of _ENVIRON_NAME that export_parsed() writes, well below
+# the 128 KiB a single environment variable of a new process can be on
+# Linux, so that starting child processes doesn't fail with E2BIG
+_MAX_EXPORT = 32 * 1024
+
+# The start of every value of _ENVIRON_NAME, changed with the format
+_EXPORT_MAGIC = b"K1"
+
+# How deep tuples can be nested in a value of _ENVIRON_NAME
+_MAX_DEPTH = 8
+
+
+def _schema_fields(schema: dict) -> list:
+    """
+    Returns `(name, kind, short)` for every flag in a schema, where a flag
+    is either a kind or a `(kind, short)` tuple.
+    """
+
+    fields = []
+    for name, spec in schema.items():
+        if type(spec) == str:
+            kind, short = spec, "default-short"
+        else:
+            kind, short = spec
+
+        if kind not in _KINDS:
+            raise Exception(
+                f"Unknown kind \"{kind}\" for {name}, it has to be one of "
+                f"{', '.join(_KINDS)}"
+            )
+
+        fields.append((name, kind, short))
+
+    return fields
+
+
+def _field_positions(names: tuple) -> dict:
+    positions = _FIELDS.get(names)
+    if positions is None:
+        positions = {}
+        for position, name in enumerate(names):
+            positions[name] = position
+
+            # Flags with dashes can also be used as attributes
+            positions.setdefault(name.replace("-", "_"), position)
+
+        _FIELDS[names] = positions
+
+    return positions
+
+
+def _encode(value, out: list) -> None:
+    """
+    Adds `value`, None, a bool, int, float, str, bytes or a tuple of them,
+    to `out` in the format `_decode()` reads, where every value starts with
+    its kind and every value of varying size with its size.
+    """
+
+    kind = type(value)
+    if value is None:
+        out.append(b"N")
+    elif kind == bool:
+        out.append(b"T" if value else b"F")
+    elif kind == int or kind == float:
+        text = repr(value).encode("ascii")
+        tag = b"i" if kind == int else b"f"
+        out.append(b"%s%d:%s" % (tag, len(text), text))
+    elif kind == str:
+        # Arguments that were not valid UTF-8 are kept as they are
+        data = value.encode("utf-8", "surrogatepass")
+        out.append(b"s%d:" % len(data))
+        out.append(data)
+    elif kind == bytes:
+        out.append(b"b%d:" % len(value))
+        out.append(value)
+    elif kind == tuple or kind == list:
+        out.append(b"(%d:" % len(value))
+        for item in value:
+            _encode(item, out)
+    else:
+        raise TypeError(
+            f"{kind.__name__} values can't be handed to child processes"
+        )
+
+
+def _decode(data: bytes, start: int, depth: int = 0) -> tuple:
+    """
+    Returns the value `_encode()` wrote at `start` in `data` and where the
+    value after it starts. Raises ValueError for anything else, so that a
+    value that was changed or cut short is never trusted.
+    """
+
+    kind = data[start:start + 1]
+    if kind == b"N":
+        return None, start + 1
+    if kind == b"T":
+        return True, start + 1
+    if kind == b"F":
+        return False, start + 1
+
+    colon = data.find(b":", start + 1, start + 22)
+    if colon == -1 or not data[start + 1:colon].isdigit():
+        raise ValueError("Not a value handed down by klarg")
+
+    size = int(data[start + 1:colon])
+    if kind == b"(":
+        if depth >= _MAX_DEPTH:
+            raise ValueError("Values are nested too deeply")
+
+        items = []
+        position = colon + 1
+        for _ in range(size):
+            item, position = _decode(data, position, depth + 1)
+            items.append(item)
+
+        return tuple(items), position
+
+    end = colon + 1 + size
+    if end > len(data):
+        raise ValueError("The value was cut short")
+
+    chunk = data[colon + 1:end]
+    if kind == b"s":
+        return chunk.decode("utf-8", "surrogatepass"), end
+    if kind == b"b":
+        return chunk, end
+    if kind == b"i":
+        return int(chunk), end
+    if kind == b"f":
+        return float(chunk), end
+
+    raise ValueError("Not a value handed down by klarg")
+
+
+def _digest(value) -> bytes:
+    """
+    Returns a hash of `value`, which can be anything `_encode()` takes.
+    """
+
+    # _blake2 is what hashlib uses, without the time hashlib takes to import
+    try:
+        from _blake2 import blake2b
+    except ImportError:
+        from hashlib import blake2b
+
+    out = []
+    _encode(value, out)
+    return blake2b(b"".join(out), digest_size=16).digest()
+
+
+def _schema_key(fields: list) -> bytes:
+    """
+    Returns what a result handed to a child process is looked up by, a hash
+    of the schema and everything else that changes how it is parsed.
+    """
+
+    settings = klarg._settings()
+    return _digest((
+        klarg.__version__,
+        tuple(fields),
+        repr(sorted(settings.config.items()))
+    ))
+
+
+def _read_inherited(environ: dict) -> dict:
+    """
+    Returns the results that a parent process left in `environ`, as a
+    dictionary of `_schema_key()` and a hash of the arguments, the names
+    and the values, reading the variable again only when it changed.
+    """
+
+    global _INHERITED
+
+    value = environ.get(_ENVIRON_NAME)
+    if value is None:
+        return {}
+
+    if _INHERITED[0] != value:
+        import binascii
+
+        # Results that can't be read are parsed again
+        results = {}
+        try:
+            data = binascii.a2b_base64(value)
+            if not data.startswith(_EXPORT_MAGIC):
+                raise ValueError("Not a value handed down by klarg")
+
+            entries, end = _decode(data, len(_EXPORT_MAGIC))
+            if end != len(data) or type(entries) != tuple:
+                raise ValueError("Not a value handed down by klarg")
+
+            for entry in entries:
+                if type(entry) != tuple or len(entry) != 4:
+                    raise ValueError("Not a value handed down by klarg")
+
+                key, args_key, names, values = entry
+                if (
+                    type(names) != tuple
+                    or type(values) != tuple
+                    or len(names) != len(values)
+                ):
+                    raise ValueError("Not a value handed down by klarg")
+
+                results[key] = (args_key, names, values)
+
+        except ValueError:
+            results = {}
+
+        _INHERITED = (value, results)
+
+    return _INHERITED[1]
+
+
+class parsed():
+    """
+    The values of all the flags in a schema, returned by `get_parsed`.
+    Values can be read as attributes (with `_` in place of `-`), like a
+    dictionary, or with `as_dict()`, but not changed. It can be pickled
+    cheaply, as the names of the flags and a tuple of values. `inherited` is
+    True when it was handed down by a parent process with `export_parsed`.
+    """
+
+    __slots__ = ("names", "values", "positions", "inherited")
+
+    def __init__(self, names: tuple, values: tuple, inherited: bool = False):
+        object.__setattr__(self, "names", names)
+        object.__setattr__(self, "values", values)
+        object.__setattr__(self, "positions", _field_positions(names))
+        object.__setattr__(self, "inherited", inherited)
+
+    def __getattr__(self, name: str):
+        try:
+            return self.values[self.positions[name]]
+        except KeyError:
+            raise AttributeError(f"No flag named {name}") from None
+
+    def __getitem__(self, name: str):
+        return self.values[self.positions[name]]
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("Parsed results can't be changed")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Parsed results can't be changed")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.positions
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, parsed):
+            return NotImplemented
+
+        return self.names == other.names and self.values == other.values
+
+    def __hash__(self) -> int:
+        return hash((self.names, self.values))
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={value!r}" for name, value in zip(self.names, self.values)
+        )
+        return f"parsed({values})"
+
+    def __reduce__(self) -> tuple:
+        return (parsed, (self.names, self.values))
+
+    def get(self, name: str, default=None):
+        position = self.positions.get(name)
+        if position is None:
+            return default
+
+        return self.values[position]
+
+    def as_dict(self) -> dict:
+        return dict(zip(self.names, self.values))
+
+
+def _collect(fields: list, args_list: list, on_error: dict) -> parsed:
+    values = []
+    for name, kind, short in fields:
+        get_value = getattr(klarg, _KINDS[kind])
+
+        if kind in ("bool", "count"):
+            value = get_value(name=name, short=short, args_list=args_list)
+        else:
+            value = get_value(
+                name=name,
+                short=short,
+                on_error=on_error,
+                args_list=args_list
+            )
+
+        if kind == "list":
+            value = tuple(value)
+
+        values.append(value)
+
+    return parsed(tuple(name for name, _, _ in fields), tuple(values))
+
+
+def base_get_parsed(
+    schema: dict,
+    args_list: list,
+    on_error: dict = {},
+    share: bool = False
+) -> parsed:
+    """
+    `schema: dict: NEEDED`
+
+    `on_error: dict: optional`
+
+    `share: bool: optional`
+
+    `get_parsed` collects all the flags in `schema` at once and returns them as
+    a `parsed` result, which can't be changed and is cheap to send to other
+    processes, like the workers of a `multiprocessing.Pool`. `schema` is a
+    dictionary of flag names and their kind, which is one of `"bool"`, `"str"`,
+    `"num"`, `"count"` or `"list"`, or a `(kind, short)` tuple to also give the
+    short flag. Every flag is collected with the `get_` function of its kind,
+    with the same `on_error` handling, and lists are returned as tuples. If
+    `share` is `True`, the result (and everything else that exists at that
+    point) is moved out of the reach of the garbage collector with
+    `gc.freeze()`, so that processes forked afterwards don't copy memory when
+    the collector runs. If a parent process handed down its result for the
+    same schema and arguments with `export_parsed`, that result is returned
+    (with `inherited` set) without looking at the arguments again.
+
+    Example:
+    ```py
+    # docs_example.py
+    import multiprocessing
+    import klarg
+
+    def start_worker(arguments):
+        global ARGUMENTS
+        ARGUMENTS = arguments
+
+    def work(number):
+        return number * ARGUMENTS.scale
+
+    if __name__ == "__main__":
+        arguments = klarg.get_parsed(
+            {"scale": ("num", "s"), "verbose": "count"}
+        )
+        with multiprocessing.Pool(
+            initializer=start_worker,
+            initargs=(arguments,)
+        ) as pool:
+            print(pool.map(work, [1, 2, 3]))
+
+    # python docs_example.py --scale 10
+    # [10, 20, 30]
+    ```
+
+    """
+
+    fields = _schema_fields(schema)
+
+    # A parent process that parsed the same arguments with the same schema
+    # already collected (and checked) every value
+    result = None
+    if _ENVIRON_NAME in os.environ:
+        inherited = _read_inherited(os.environ).get(_schema_key(fields))
+        if (
+            inherited is not None
+            and inherited[1] == tuple(name for name, _, _ in fields)
+            and inherited[0] == _digest(args_list)
+        ):
+            result = parsed(inherited[1], inherited[2], inherited=True)
+
+    if result is None:
+        result = _collect(fields, args_list, on_error)
+
+    if share:
+        import gc
+        gc.freeze()
+
+    return result
+
+
+def get_parsed(
+    schema: dict,
+    on_error: dict = {},
+    share: bool = False
+) -> parsed:
+    """
+    `schema: dict: NEEDED`
+
+    `on_error: dict: optional`
+
+    `share: bool: optional`
+
+    `get_parsed` collects all the flags in `schema` at once and returns them as
+    a `parsed` result, which can't be changed and is cheap to send to other
+    processes, like the workers of a `multiprocessing.Pool`. `schema` is a
+    dictionary of flag names and their kind, which is one of `"bool"`, `"str"`,
+    `"num"`, `"count"` or `"list"`, or a `(kind, short)` tuple to also give the
+    short flag. Every flag is collected with the `get_` function of its kind,
+    with the same `on_error` handling, and lists are returned as tuples. If
+    `share` is `True`, the result (and everything else that exists at that
+    point) is moved out of the reach of the garbage collector with
+    `gc.freeze()`, so that processes forked afterwards don't copy memory when
+    the collector runs. If a parent process handed down its result for the
+    same schema and arguments with `export_parsed`, that result is returned
+    (with `inherited` set) without looking at the arguments again.
+
+    Example:
+    ```py
+    # docs_example.py
+    import multiprocessing
+    import klarg
+
+    def start_worker(arguments):
+        global ARGUMENTS
+        ARGUMENTS = arguments
+
+    def work(number):
+        return number * ARGUMENTS.scale
+
+    if __name__ == "__main__":
+        arguments = klarg.get_parsed(
+            {"scale": ("num", "s"), "verbose": "count"}
+        )
+        with multiprocessing.Pool(
+            initializer=start_worker,
+            initargs=(arguments,)
+        ) as pool:
+            print(pool.map(work, [1, 2, 3]))
+
+    # python docs_example.py --scale 10
+    # [10, 20, 30]
+    ```
+
+    """
+
+    return base_get_parsed(
+        schema=schema,
+        on_error=on_error,
+        share=share,
+        args_list=klarg._all_args()
+    )
+
+
+def base_export_parsed(
+    result: parsed,
+    schema: dict,
+    args_list: list,
+    environ: "Union[dict, None]" = None
+) -> "Union[str, None]":
+    """
+    `result: parsed: NEEDED`
+
+    `schema: dict: NEEDED`
+
+    `environ: dict: optional`
+
+    `export_parsed` hands a result of `get_parsed` down to child processes,
+    so that a child that calls `get_parsed` with the same schema and the
+    same arguments gets it back without parsing them again, or running the
+    checks the parent already ran. The result is written into the
+    `KLARG_PARSED` variable of `environ`, `os.environ` by default, which
+    child processes started afterwards inherit, along with the results
+    exported before it for other schemas. Only a hash of the arguments is
+    saved with the values, which can only be `None`, `bool`, `int`,
+    `float`, `str`, `bytes` and tuples of them, like the values
+    `get_parsed` returns. A child with a different schema, `CONFIG`,
+    version of klarg or different arguments parses them as usual. The new
+    value of the variable is returned, or None when it would be longer than
+    32 KiB, which would stop child processes from starting, and then
+    `environ` is left as it was.
+
+    Example:
+    ```py
+    # docs_example.py
+    import subprocess
+    import sys
+    import klarg
+
+    SCHEMA = {"jobs": ("num", "j"), "verbose": "count"}
+
+    arguments = klarg.get_parsed(SCHEMA)
+    if arguments.inherited:
+        print(f"Child got {arguments.jobs} jobs from its parent")
+    else:
+        klarg.export_parsed(arguments, SCHEMA)
+        subprocess.run([sys.executable, *sys.argv])
+
+    # python docs_example.py -j 4
+    # Child got 4 jobs from its parent
+    ```
+
+    """
+
+    import binascii
+
+    if environ is None:
+        environ = os.environ
+
+    results = dict(_read_inherited(environ))
+    results[_schema_key(_schema_fields(schema))] = (
+        _digest(args_list),
+        result.names,
+        result.values
+    )
+
+    out = [_EXPORT_MAGIC]
+    _encode(
+        tuple((key, *entry) for key, entry in results.items()),
+        out
+    )
+    value = binascii.b2a_base64(b"".join(out), newline=False).decode()
+
+    # Too large to be given to child processes, which parse the arguments
+    # themselves instead
+    if len(value) > _MAX_EXPORT:
+        return None
+
+    environ[_ENVIRON_NAME] = value
+    return value
+
+
+def export_parsed(
+    result: parsed,
+    schema: dict,
+    environ: "Union[dict, None]" = None
+) -> "Union[str, None]":
+    """
+    `result: parsed: NEEDED`
+
+    `schema: dict: NEEDED`
+
+    `environ: dict: optional`
+
+    `export_parsed` hands a result of `get_parsed` down to child processes,
+    so that a child that calls `get_parsed` with the same schema and the
+    same arguments gets it back without parsing them again, or running the
+    checks the parent already ran. The result is written into the
+    `KLARG_PARSED` variable of `environ`, `os.environ` by default, which
+    child processes started afterwards inherit, along with the results
+    exported before it for other schemas. Only a hash of the arguments is
+    saved with the values, which can only be `None`, `bool`, `int`,
+    `float`, `str`, `bytes` and tuples of them, like the values
+    `get_parsed` returns. A child with a different schema, `CONFIG`,
+    version of klarg or different arguments parses them as usual. The new
+    value of the variable is returned, or None when it would be longer than
+    32 KiB, which would stop child processes from starting, and then
+    `environ` is left as it was.
+
+    Example:
+    ```py
+    # docs_example.py
+    import subprocess
+    import sys
+    import klarg
+
+    SCHEMA = {"jobs": ("num", "j"), "verbose": "count"}
+
+    arguments = klarg.get_parsed(SCHEMA)
+    if arguments.inherited:
+        print(f"Child got {arguments.jobs} jobs from its parent")
+    else:
+        klarg.export_parsed(arguments, SCHEMA)
+        subprocess.run([sys.executable, *sys.argv])
+
+    # python docs_example.py -j 4
+    # Child got 4 jobs from its parent
+    ```
+
+    """
+
+    return base_export_parsed(
+        result=result,
+        schema=schema,
+        environ=environ,
+        args_list=klarg._all_args()
+    )
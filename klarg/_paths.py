@@ -0,0 +1,188 @@
+"""
+Glob expansion for `klarg.iter_paths`, loaded the first time it is used.
+"""
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Union
+
+
+def _has_magic(pattern: str) -> bool:
+    return ("*" in pattern) or ("?" in pattern) or ("[" in pattern)
+
+
+def _walk_glob(
+    directory: str,
+    parts: list,
+    sort: bool,
+    dirs_only: bool = False
+):
+    import os
+
+    part, rest = parts[0], parts[1:]
+    matches, include_hidden, recursive = part
+
+    def join(name: str) -> str:
+        return os.path.join(directory, name) if directory else name
+
+    def is_dir(entry) -> bool:
+        try:
+            return entry.is_dir()
+        except OSError:
+            return False
+
+    # A pattern that ends with a separator only matches directories, which
+    # are yielded with the separator like the shell does
+    def matched(entry):
+        if not dirs_only:
+            return join(entry.name)
+        if is_dir(entry):
+            return join(entry.name) + os.sep
+        return None
+
+    # Plain names are not matched against the directory contents
+    if type(matches) == str:
+        path = join(matches)
+        if rest:
+            if os.path.isdir(path):
+                yield from _walk_glob(path, rest, sort, dirs_only)
+        elif dirs_only:
+            if os.path.isdir(path):
+                yield path + os.sep
+        elif os.path.lexists(path):
+            yield path
+        return
+
+    # `**` also matches no directories at all
+    if recursive and rest:
+        yield from _walk_glob(directory, rest, sort, dirs_only)
+
+    try:
+        with os.scandir(directory or ".") as scanner:
+            entries = scanner
+            if sort:
+                entries = sorted(scanner, key=lambda entry: entry.name)
+
+            for entry in entries:
+                if entry.name.startswith(".") and not include_hidden:
+                    continue
+
+                if recursive:
+                    if not rest:
+                        path = matched(entry)
+                        if path is not None:
+                            yield path
+                    if is_dir(entry):
+                        yield from _walk_glob(
+                            join(entry.name),
+                            parts,
+                            sort,
+                            dirs_only
+                        )
+
+                elif matches(entry.name):
+                    if not rest:
+                        path = matched(entry)
+                        if path is not None:
+                            yield path
+                    elif entry.is_dir():
+                        yield from _walk_glob(
+                            join(entry.name),
+                            rest,
+                            sort,
+                            dirs_only
+                        )
+
+    # Directories that can't be read are skipped, like the shell does
+    except OSError:
+        return
+
+
+def _expand_glob(pattern: str, sort: bool):
+    import os
+    import re
+    import fnmatch
+
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+
+    if os.altsep:
+        pattern = pattern.replace(os.altsep, os.sep)
+
+    drive, rest = os.path.splitdrive(pattern)
+    root = drive
+    while rest.startswith(os.sep):
+        root += os.sep
+        rest = rest[1:]
+
+    # Every part is compiled once, before the walk starts
+    parts = []
+    for name in rest.split(os.sep):
+        if not name:
+            continue
+
+        if name == "**":
+            parts.append((None, False, True))
+        elif _has_magic(name):
+            matches = re.compile(fnmatch.translate(name), flags).match
+            parts.append((matches, name.startswith("."), False))
+        else:
+            parts.append((name, True, False))
+
+    if not parts:
+        return iter([pattern])
+
+    return _walk_glob(root, parts, sort, rest.endswith(os.sep))
+
+
+def iter_paths(patterns: "Union[str, list]", sort: bool = False):
+    """
+    `patterns: str or list: NEEDED`
+
+    `sort: bool: optional`
+
+    `iter_paths` expands glob patterns like `"logs/*.gz"` the way a shell
+    would, for programs that are run without one. `*`, `?` and `[...]`
+    match inside a single directory and `**` matches any number of
+    directories. Paths are yielded one at a time while the directories
+    are being read, so nothing waits for the whole list to be built.
+    When `sort` is `True` every directory is read in order of name,
+    otherwise paths come in the order the file system gives them.
+    Arguments without a pattern are yielded as they are, and patterns
+    that match nothing yield nothing. Hidden files are only matched by
+    patterns that start with a `.`. Patterns given as `bytes` yield `bytes`.
+
+    Example:
+    ```py
+    # docs_example.py
+    import klarg
+
+    for path in klarg.iter_paths(klarg.get_all(), sort=True):
+        print(path)
+
+    # python docs_example.py "logs/**/*.gz"
+    # logs/2021/april.gz
+    # logs/2021/may.gz
+    # logs/today.gz
+    ```
+
+    """
+
+    if type(patterns) in (str, bytes):
+        patterns = [patterns]
+
+    for pattern in patterns:
+        # Bytes are matched as text and given back as the same bytes
+        if type(pattern) == bytes:
+            import os
+
+            text_pattern = os.fsdecode(pattern)
+            if _has_magic(text_pattern):
+                for path in _expand_glob(text_pattern, sort):
+                    yield os.fsencode(path)
+            else:
+                yield pattern
+
+        elif _has_magic(pattern):
+            yield from _expand_glob(pattern, sort)
+        else:
+            yield pattern
@@ -0,0 +1,246 @@
+"""
+Plugin commands for `klarg.find_plugins`, loaded the first time it is
+used.
+"""
+
+import os
+import sys
+import klarg
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Union
+
+# The folders in sys.path that installed packages are described in
+_DIST_SUFFIXES = (".dist-info", ".egg-info", ".egg-link")
+
+
+class _Plugin():
+    """
+    A command from an installed package, found by `find_plugins`. The
+    function it runs is only imported when `load()` is called, which
+    `dispatch` does for the command that was given.
+    """
+
+    __slots__ = ("name", "value", "dist")
+
+    def __init__(self, name: str, value: str, dist: str):
+        self.name = name
+        self.value = value
+        self.dist = dist
+
+    def __repr__(self) -> str:
+        return f"<plugin {self.name} = {self.value} from {self.dist}>"
+
+    def load(self) -> "Callable":
+        import importlib
+
+        # Extras like "module:function [cli]" don't change what is loaded
+        module_name, _, attribute = self.value.split("[")[0].partition(":")
+
+        value = importlib.import_module(module_name.strip())
+        if attribute.strip():
+            for part in attribute.strip().split("."):
+                value = getattr(value, part)
+
+        return value
+
+
+def _entry_points_changed(path: str, dist: str):
+    # Reinstalling a package with the same version rewrites its entry
+    # points without changing the folder it is in
+    try:
+        return os.stat(
+            os.path.join(path or ".", dist, "entry_points.txt")
+        ).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _fingerprint(group: str) -> list:
+    """
+    Returns what the plugins found depend on, the folders in sys.path,
+    when they were last changed, the packages installed in them and when
+    their entry points were last changed.
+    """
+
+    fingerprint = [klarg.__version__, group]
+    for path in sys.path:
+        try:
+            changed = os.stat(path or ".").st_mtime_ns
+        except OSError:
+            fingerprint.append((path, None, ()))
+            continue
+
+        # Changing a folder changes its mtime, but not always in a way that
+        # can be seen, the names of the packages make up for that
+        try:
+            with os.scandir(path or ".") as scanner:
+                dists = sorted(
+                    (entry.name, _entry_points_changed(path, entry.name))
+                    for entry in scanner
+                    if entry.name.endswith(_DIST_SUFFIXES)
+                )
+        except OSError:
+            dists = []
+
+        fingerprint.append((path, changed, tuple(dists)))
+
+    return fingerprint
+
+
+def _dist_name(dist_path: str) -> str:
+    # The Name header of the package's metadata, which comes first
+    for metadata_name in ("METADATA", "PKG-INFO"):
+        try:
+            with open(
+                os.path.join(dist_path, metadata_name),
+                encoding="utf-8"
+            ) as metadata_file:
+                for line in metadata_file:
+                    if line.startswith("Name:"):
+                        return line[len("Name:"):].strip()
+                    if not line.strip():
+                        break
+        except (OSError, UnicodeDecodeError):
+            continue
+
+    # Folders are named name-version.dist-info
+    return os.path.basename(dist_path).partition("-")[0]
+
+
+def _scan(group: str) -> dict:
+    """
+    Returns the name, value and package of every entry point in `group`,
+    the slow way, by reading the `entry_points.txt` of every installed
+    package. They are read like `importlib.metadata` reads them, which
+    Python 3.7 doesn't have.
+    """
+
+    import configparser
+
+    plugins = {}
+    for path in sys.path:
+        try:
+            with os.scandir(path or ".") as scanner:
+                dist_paths = sorted(
+                    entry.path for entry in scanner
+                    if entry.name.endswith((".dist-info", ".egg-info"))
+                    and entry.is_dir()
+                )
+        except OSError:
+            continue
+
+        for dist_path in dist_paths:
+            entry_points = configparser.ConfigParser(
+                delimiters=("=",),
+                interpolation=None
+            )
+            # Entry point names are case sensitive
+            entry_points.optionxform = str
+
+            try:
+                entry_points.read(
+                    os.path.join(dist_path, "entry_points.txt"),
+                    encoding="utf-8"
+                )
+            except (configparser.Error, UnicodeDecodeError):
+                continue
+
+            if not entry_points.has_section(group):
+                continue
+
+            dist = _dist_name(dist_path)
+            for name, value in entry_points.items(group):
+                # The first package in sys.path wins, like imports do
+                if name not in plugins:
+                    plugins[name] = (value, dist)
+
+    return plugins
+
+
+def find_plugins(group: str, cache_dir: "Union[str, None]" = None) -> dict:
+    """
+    `group: str: NEEDED`
+
+    `cache_dir: str: optional`
+
+    `find_plugins` finds the commands that installed packages add to a
+    program, given as entry points in `group`, and returns a dictionary of
+    command names and plugins that can be given to `dispatch` along with
+    the program's own handlers. Reading every installed package takes a
+    while in large environments, so what was found is saved in
+    `cache_dir` (by default a `klarg` folder in `$XDG_CACHE_HOME` or
+    `~/.cache`) and only looked for again when a folder in `sys.path` or
+    the packages installed in it change. Nothing a plugin needs is
+    imported until `dispatch` runs it, so only the plugin for the command
+    that was given is imported.
+
+    Example:
+    ```py
+    # setup.py of my-tool-docker
+    setup(
+        name="my-tool-docker",
+        entry_points={"my_tool.commands": ["docker = my_tool_docker:main"]}
+    )
+
+    # docs_example.py
+    import klarg
+
+    def build(command):
+        print("Building")
+
+    klarg.dispatch({"build": build, **klarg.find_plugins("my_tool.commands")})
+
+    # python docs_example.py docker --name klarg
+    # (runs my_tool_docker.main with a command for "docker")
+    ```
+
+    """
+
+    import marshal
+
+    if cache_dir is None:
+        from klarg._cache import _default_cache_dir
+        cache_dir = _default_cache_dir()
+
+    safe_group = "".join(
+        letter if letter.isalnum() or letter in "._-" else "_"
+        for letter in group
+    )
+    cache_path = os.path.join(cache_dir, f"plugins-{safe_group}.marshal")
+    fingerprint = _fingerprint(group)
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_fingerprint, plugins = marshal.load(cache_file)
+
+        if cached_fingerprint != fingerprint:
+            plugins = None
+
+    # Missing or unreadable caches are looked for again
+    except Exception:
+        plugins = None
+
+    if plugins is None:
+        plugins = _scan(group)
+
+        try:
+            import tempfile
+
+            os.makedirs(cache_dir, exist_ok=True)
+            descriptor, temporary_path = tempfile.mkstemp(dir=cache_dir)
+            with os.fdopen(descriptor, "wb") as cache_file:
+                marshal.dump((fingerprint, plugins), cache_file)
+
+            # Replacing the file means other processes never read half of it
+            os.replace(temporary_path, cache_path)
+
+        # Not being able to save the plugins should not stop the program
+        except OSError:
+            pass
+
+    return {
+        name: _Plugin(name, value, dist)
+        for name, (value, dist) in plugins.items()
+    }
@@ -0,0 +1,97 @@
+"""
+Concurrent validation for `klarg.validate`, loaded the first time it is
+used.
+"""
+
+
+def _run_validator(check: tuple) -> bool:
+    value, validator = check
+    try:
+        return bool(validator(value))
+
+    # A validator that fails counts as the value not being valid
+    except Exception:
+        return False
+
+
+def validate(
+    checks: list,
+    on_error: dict = {},
+    max_workers: int = 8
+) -> bool:
+    """
+    `checks: list: NEEDED`
+
+    `on_error: dict: optional`
+
+    `max_workers: int: optional`
+
+    `validate` checks many values at once, which is useful when checking
+    a value is slow, like looking at files on a network file system.
+    `checks` is a list of `(value, validator)` pairs, where `value` is what
+    a function like `get_str` or `get_list` returned, and `validator` is a
+    function that returns `True` if the value is valid. Lists are checked
+    one value at a time, and `None` (a flag that was not given) is skipped.
+    The validators are run at the same time on up to `max_workers`
+    threads. There is one type of error, `ERR_VALID`, for a value that is
+    not valid or whose validator raised an exception. The errors are
+    always handled in the order of `checks`, no matter which validator
+    finished first. `validate` returns `True` if all the values are valid.
+
+    Example:
+    ```py
+    # docs_example.py
+    import os
+    import klarg
+
+    def handle_error_valid(value):
+        print(f"{value} does not exist")
+
+    klarg.validate(
+        [
+            (klarg.get_str("config", "c"), os.path.isfile),
+            (klarg.get_list("input", "i"), os.path.exists)
+        ],
+        on_error={"ERR_VALID": handle_error_valid}
+    )
+
+    # python docs_example.py -c setup.cfg -i a.txt -i missing.txt
+    # missing.txt does not exist
+    ```
+
+    """
+
+    # Default handling for ERR_VALID
+    def default_handle_valid(value):
+        print(f"ERR_VALID: \"{value}\" is not valid")
+        exit(1)
+
+    handle_valid = on_error.get("ERR_VALID", default_handle_valid)
+
+    flat_checks = []
+    for value, validator in checks:
+        if value is None:
+            continue
+
+        if type(value) == list:
+            flat_checks.extend((item, validator) for item in value)
+        else:
+            flat_checks.append((value, validator))
+
+    if len(flat_checks) < 2 or max_workers < 2:
+        results = [_run_validator(check) for check in flat_checks]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = min(max_workers, len(flat_checks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps the results in the order of the checks
+            results = list(executor.map(_run_validator, flat_checks))
+
+    all_valid = True
+    for (value, _), valid in zip(flat_checks, results):
+        if not valid:
+            all_valid = False
+            handle_valid(value)
+
+    return all_valid
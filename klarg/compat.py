@@ -0,0 +1,895 @@
+"""
+An `argparse` compatible front end for klarg.
+
+Programs written for `argparse` can use klarg by changing one line:
+
+```py
+from klarg.compat import ArgumentParser
+```
+
+Only the parts of `argparse` that most programs use are here. Anything
+else raises `NotImplementedError` instead of quietly doing something
+different.
+"""
+
+import os
+import sys
+
+import klarg
+
+SUPPRESS = "==SUPPRESS=="
+OPTIONAL = "?"
+ZERO_OR_MORE = "*"
+ONE_OR_MORE = "+"
+
+# Actions that never take a value
+_NO_VALUES = ("store_const", "store_true", "store_false", "append_const",
+              "count", "help", "version")
+
+_ACTIONS = ("store", "append", "extend") + _NO_VALUES
+
+_ARGUMENT_OPTIONS = ("action", "nargs", "const", "default", "type",
+                     "choices", "required", "help", "metavar", "dest",
+                     "version")
+
+_PARSER_OPTIONS = ("prog", "usage", "description", "epilog", "parents",
+                   "formatter_class", "add_help", "allow_abbrev")
+
+
+class ArgumentError(Exception):
+    """
+    Raised for an argument that could not be parsed.
+    """
+
+    def __init__(self, argument, message: str):
+        self.argument_name = None if argument is None else argument.name()
+        self.message = message
+
+    def __str__(self) -> str:
+        if self.argument_name is None:
+            return self.message
+
+        return f"argument {self.argument_name}: {self.message}"
+
+
+class ArgumentTypeError(Exception):
+    """
+    Raised by a `type` function for a value it can't convert.
+    """
+
+
+class Namespace():
+    """
+    The object `parse_args()` returns, with the parsed values as attributes.
+    """
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Namespace):
+            return NotImplemented
+
+        return vars(self) == vars(other)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dict__
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{key}={value!r}" for key, value in self.__dict__.items()
+        )
+        return f"Namespace({values})"
+
+
+def _unsupported(feature: str):
+    raise NotImplementedError(f"klarg.compat does not support {feature}")
+
+
+def _is_negative_number(arg: str) -> bool:
+    number = arg[1:]
+    if number.count(".") == 1:
+        number = number.replace(".", "", 1)
+
+    return arg.startswith("-") and number.isdigit()
+
+
+class _Action():
+    """
+    One argument given to `add_argument()`.
+    """
+
+    def __init__(self, option_strings: list, dest: str, **kwargs):
+        self.option_strings = option_strings
+        self.dest = dest
+        self.action = kwargs.get("action") or "store"
+        self.nargs = kwargs.get("nargs")
+        self.const = kwargs.get("const")
+        self.default = kwargs.get("default")
+        self.type = kwargs.get("type")
+        self.choices = kwargs.get("choices")
+        self.required = kwargs.get("required") or False
+        self.help = kwargs.get("help")
+        self.metavar = kwargs.get("metavar")
+        self.version = kwargs.get("version")
+
+        if self.action == "store_true":
+            self.const = True
+            if "default" not in kwargs:
+                self.default = False
+
+        elif self.action == "store_false":
+            self.const = False
+            if "default" not in kwargs:
+                self.default = True
+
+        elif self.action in ("help", "version"):
+            self.default = SUPPRESS
+
+        if self.action in _NO_VALUES:
+            if self.nargs is not None:
+                raise ValueError(f"nargs is not allowed with {self.action}")
+
+            self.nargs = 0
+
+        elif self.nargs == OPTIONAL and not option_strings:
+            # Positional arguments that are not given use the default
+            self.const = self.default
+
+        elif self.nargs == "...":
+            _unsupported("nargs=REMAINDER")
+
+        elif self.nargs == 0:
+            raise ValueError("nargs for store actions must be != 0")
+
+    def name(self) -> str:
+        if self.option_strings:
+            return "/".join(self.option_strings)
+
+        if self.metavar is not None:
+            return self.metavar
+
+        return self.dest
+
+    def value_range(self) -> tuple:
+        """
+        The smallest and largest number of values the action takes,
+        where None means there is no limit.
+        """
+
+        if self.nargs is None:
+            return (1, 1)
+
+        if self.nargs == OPTIONAL:
+            return (0, 1)
+
+        if self.nargs == ZERO_OR_MORE:
+            return (0, None)
+
+        if self.nargs == ONE_OR_MORE:
+            return (1, None)
+
+        return (self.nargs, self.nargs)
+
+    def metavar_name(self) -> str:
+        if self.metavar is not None:
+            return self.metavar
+
+        if self.choices is not None:
+            choices = ",".join(str(choice) for choice in self.choices)
+            return "{" + choices + "}"
+
+        if self.option_strings:
+            return self.dest.upper()
+
+        return self.dest
+
+    def format_values(self) -> str:
+        metavar = self.metavar_name()
+
+        if self.nargs is None:
+            return metavar
+
+        if self.nargs == OPTIONAL:
+            return f"[{metavar}]"
+
+        if self.nargs == ZERO_OR_MORE:
+            return f"[{metavar} ...]"
+
+        if self.nargs == ONE_OR_MORE:
+            return f"{metavar} [{metavar} ...]"
+
+        return " ".join([metavar] * self.nargs)
+
+
+class _SubParsers(_Action):
+    """
+    The action returned by `add_subparsers()`.
+    """
+
+    def __init__(self, prog: str, dest: str, **kwargs):
+        super().__init__([], dest, **kwargs)
+        self.prog = prog
+        self.nargs = "A..."
+        self.parsers = {}
+        self.names = []
+        self.helps = []
+
+    def value_range(self) -> tuple:
+        return (1, 1)
+
+    def metavar_name(self) -> str:
+        if self.metavar is not None:
+            return self.metavar
+
+        return "{" + ",".join(self.names) + "}"
+
+    def format_values(self) -> str:
+        return self.metavar_name() + " ..."
+
+    def add_parser(self, name: str, **kwargs):
+        aliases = kwargs.pop("aliases", ())
+        help = kwargs.pop("help", None)
+        kwargs.setdefault("prog", f"{self.prog} {name}")
+
+        sub_parser = ArgumentParser(**kwargs)
+        for parser_name in [name, *aliases]:
+            self.parsers[parser_name] = sub_parser
+
+        self.names.append(name)
+        self.helps.append((name, help))
+        return sub_parser
+
+
+class _ArgumentGroup():
+    """
+    The group returned by `add_argument_group()` and
+    `add_mutually_exclusive_group()`, it only changes how help is shown and
+    which arguments can be used together.
+    """
+
+    def __init__(self, parser, title=None, description=None, exclusive=False,
+                 required=False):
+        self.parser = parser
+        self.title = title
+        self.description = description
+        self.exclusive = exclusive
+        self.required = required
+        self.actions = []
+
+    def add_argument(self, *args, **kwargs):
+        action = self.parser.add_argument(*args, **kwargs)
+        self.actions.append(action)
+        return action
+
+    def add_argument_group(self, *args, **kwargs):
+        return self.parser.add_argument_group(*args, **kwargs)
+
+    def add_mutually_exclusive_group(self, **kwargs):
+        return self.parser.add_mutually_exclusive_group(**kwargs)
+
+
+class ArgumentParser():
+    """
+    A drop in replacement for `argparse.ArgumentParser`.
+
+    Arguments are collected from `klarg.ALL_ARGS` unless `parse_args()`
+    is given a list. Supported actions are `store`, `store_const`,
+    `store_true`, `store_false`, `append`, `append_const`, `extend`,
+    `count`, `help` and `version`, with `nargs` of `None`, `"?"`, `"*"`,
+    `"+"` or a number. `formatter_class` is accepted but ignored.
+    """
+
+    def __init__(self, prog=None, **kwargs):
+        for key in kwargs:
+            if key not in _PARSER_OPTIONS:
+                _unsupported(f"ArgumentParser({key}=...)")
+
+        if prog is None:
+            prog = os.path.basename(sys.argv[0]) if sys.argv else ""
+
+        self.prog = prog
+        self.usage = kwargs.get("usage")
+        self.description = kwargs.get("description")
+        self.epilog = kwargs.get("epilog")
+        self.allow_abbrev = kwargs.get("allow_abbrev", True)
+
+        self.actions = []
+        self.options = {}
+        self.defaults = {}
+        self.exclusive_groups = []
+        self.argument_groups = []
+        self.subparsers = None
+
+        if kwargs.get("add_help", True):
+            self.add_argument(
+                "-h",
+                "--help",
+                action="help",
+                help="show this help message and exit"
+            )
+
+        for parent in kwargs.get("parents", ()):
+            for action in parent.actions:
+                if action.action != "help":
+                    self.add_action(action)
+
+            self.defaults.update(parent.defaults)
+
+    def add_action(self, action: _Action) -> _Action:
+        for option in action.option_strings:
+            if option in self.options:
+                raise ArgumentError(
+                    action,
+                    f"conflicting option string: {option}"
+                )
+
+            self.options[option] = action
+
+        self.actions.append(action)
+        return action
+
+    def add_argument(self, *names: str, **kwargs) -> _Action:
+        for key in kwargs:
+            if key not in _ARGUMENT_OPTIONS:
+                _unsupported(f"add_argument({key}=...)")
+
+        action = kwargs.get("action")
+        if action is not None and action not in _ACTIONS:
+            _unsupported(f"action={action!r}")
+
+        if kwargs.get("type") is not None and not callable(kwargs["type"]):
+            raise ValueError(f"{kwargs['type']!r} is not callable")
+
+        if not names:
+            raise TypeError("add_argument() needs a name or flags")
+
+        # Positional arguments
+        if not names[0].startswith("-"):
+            if len(names) > 1:
+                raise ValueError("invalid option string: positional "
+                                 "arguments have a single name")
+
+            if "dest" in kwargs:
+                raise ValueError("dest supplied twice for positional argument")
+
+            if "required" in kwargs:
+                raise TypeError("'required' is an invalid argument for "
+                                "positionals")
+
+            required = kwargs.get("nargs") not in (OPTIONAL, ZERO_OR_MORE)
+            return self.add_action(
+                _Action([], names[0], required=required, **kwargs)
+            )
+
+        for name in names:
+            if not name.startswith("-"):
+                raise ValueError(f"invalid option string {name!r}: must "
+                                 "start with a character '-'")
+
+        dest = kwargs.pop("dest", None)
+        if dest is None:
+            long_names = [name for name in names if name.startswith("--")]
+            dest = (long_names or names)[0].lstrip("-").replace("-", "_")
+
+        return self.add_action(_Action(list(names), dest, **kwargs))
+
+    def add_argument_group(self, title=None, description=None):
+        group = _ArgumentGroup(self, title, description)
+        self.argument_groups.append(group)
+        return group
+
+    def add_mutually_exclusive_group(self, required: bool = False):
+        group = _ArgumentGroup(self, exclusive=True, required=required)
+        self.exclusive_groups.append(group)
+        return group
+
+    def add_subparsers(self, **kwargs) -> _SubParsers:
+        if self.subparsers is not None:
+            self.error("cannot have multiple subparser arguments")
+
+        for key in kwargs:
+            if key not in ("title", "description", "prog", "dest", "required",
+                           "help", "metavar"):
+                _unsupported(f"add_subparsers({key}=...)")
+
+        dest = kwargs.pop("dest", SUPPRESS) or SUPPRESS
+        if "prog" in kwargs:
+            prog = kwargs.pop("prog")
+        else:
+            positionals = [
+                action.format_values()
+                for action in self.actions if not action.option_strings
+            ]
+            prog = " ".join([self.prog] + positionals)
+
+        kwargs.pop("title", None)
+        kwargs.pop("description", None)
+
+        self.subparsers = _SubParsers(prog, dest, **kwargs)
+        self.actions.append(self.subparsers)
+        return self.subparsers
+
+    def set_defaults(self, **kwargs) -> None:
+        self.defaults.update(kwargs)
+
+        for action in self.actions:
+            if action.dest in kwargs:
+                action.default = kwargs[action.dest]
+
+    def get_default(self, dest: str):
+        for action in self.actions:
+            if action.dest == dest and action.default is not None:
+                return action.default
+
+        return self.defaults.get(dest)
+
+    """
+    Parsing
+    """
+
+    def parse_args(self, args=None, namespace=None) -> Namespace:
+        namespace, extras = self.parse_known_args(args, namespace)
+        if extras:
+            self.error(f"unrecognized arguments: {' '.join(extras)}")
+
+        return namespace
+
+    def parse_known_args(self, args=None, namespace=None) -> tuple:
+        if args is None:
+            args = klarg.ALL_ARGS
+
+        if namespace is None:
+            namespace = Namespace()
+
+        try:
+            # Defaults of the arguments and then of set_defaults()
+            for action in self.actions:
+                if action.dest is SUPPRESS or action.default is SUPPRESS:
+                    continue
+
+                if not hasattr(namespace, action.dest):
+                    setattr(namespace, action.dest, self.default_value(action))
+
+            for dest, value in self.defaults.items():
+                if not hasattr(namespace, dest):
+                    setattr(namespace, dest, value)
+
+            extras = self.parse_into(list(args), namespace)
+
+        except ArgumentError as error:
+            self.error(str(error))
+
+        return namespace, extras
+
+    def default_value(self, action: _Action):
+        default = action.default
+
+        if action.nargs == ZERO_OR_MORE and not action.option_strings:
+            if default is None:
+                return []
+
+        # String defaults are converted like values that were given
+        if type(default) == str and action.type is not None:
+            return self.convert(action, default)
+
+        return default
+
+    def is_option(self, arg: str) -> bool:
+        if not arg.startswith("-") or arg == "-":
+            return False
+
+        if arg in self.options:
+            return True
+
+        # Negative numbers are values, unless an option looks like one
+        if _is_negative_number(arg):
+            return any(_is_negative_number(option) for option in self.options)
+
+        return True
+
+    def find_option(self, arg: str) -> tuple:
+        """
+        Returns the action of an option and a value attached to it with
+        `=` or, for short options, written right after it.
+        """
+
+        if arg in self.options:
+            return self.options[arg], None
+
+        if "=" in arg:
+            option, value = arg.split("=", 1)
+            if option in self.options:
+                return self.options[option], value
+
+        if not arg.startswith("--") and len(arg) > 2:
+            option, value = arg[:2], arg[2:]
+            if option in self.options:
+                return self.options[option], value
+
+        if self.allow_abbrev and arg.startswith("--"):
+            option = arg.split("=", 1)[0]
+            matches = [
+                name for name in self.options
+                if name.startswith("--") and name.startswith(option)
+            ]
+
+            if len(matches) > 1:
+                raise ArgumentError(
+                    None,
+                    f"ambiguous option: {option} could match "
+                    f"{', '.join(matches)}"
+                )
+
+            if matches:
+                value = arg.split("=", 1)[1] if "=" in arg else None
+                return self.options[matches[0]], value
+
+        return None, None
+
+    def parse_into(self, args: list, namespace: Namespace) -> list:
+        extras = []
+        positional_values = []
+        seen = []
+
+        # Positional arguments that have to come before a subcommand
+        positionals = [
+            action for action in self.actions if not action.option_strings
+        ]
+        before_command = None
+        if self.subparsers is not None:
+            before_command = 0
+            for action in positionals[:positionals.index(self.subparsers)]:
+                minimum, maximum = action.value_range()
+                if minimum != maximum:
+                    _unsupported("positional arguments with a variable "
+                                 "nargs before subparsers")
+
+                before_command += minimum
+
+        command_args = None
+        position = 0
+        while position < len(args):
+            arg = args[position]
+            position += 1
+
+            # Everything after -- is a positional argument
+            if arg == "--":
+                positional_values.extend(args[position:])
+                break
+
+            if not self.is_option(arg):
+                if len(positional_values) == before_command:
+                    command_args = [arg] + args[position:]
+                    break
+
+                positional_values.append(arg)
+                continue
+
+            action, attached = self.find_option(arg)
+
+            if action is None:
+                extras.append(arg)
+                continue
+
+            # Short flags that take no values can be stacked, like -xvf
+            if attached is not None and action.nargs == 0:
+                if arg.startswith("--"):
+                    raise ArgumentError(
+                        action,
+                        f"ignored explicit argument {attached!r}"
+                    )
+
+                args.insert(position, "-" + attached)
+                attached = None
+
+            minimum, maximum = action.value_range()
+            if attached is not None:
+                values = [attached]
+            else:
+                values = []
+                while position < len(args) and (
+                    maximum is None or len(values) < maximum
+                ):
+                    if args[position] == "--" or self.is_option(
+                        args[position]
+                    ):
+                        break
+
+                    values.append(args[position])
+                    position += 1
+
+            if len(values) < minimum:
+                expected = {
+                    None: "expected one argument",
+                    ONE_OR_MORE: "expected at least one argument"
+                }.get(action.nargs, f"expected {minimum} arguments")
+                raise ArgumentError(action, expected)
+
+            seen.append(action)
+            self.take_action(action, values, namespace)
+
+        self.take_positionals(positionals, positional_values, namespace,
+                              extras, seen)
+
+        self.check_required(seen)
+
+        if command_args is not None:
+            extras.extend(self.take_command(command_args, namespace))
+
+        elif self.subparsers is not None and self.subparsers.required:
+            raise ArgumentError(
+                None,
+                "the following arguments are required: "
+                f"{self.subparsers.name()}"
+            )
+
+        return extras
+
+    def take_positionals(
+        self,
+        positionals: list,
+        values: list,
+        namespace: Namespace,
+        extras: list,
+        seen: list
+    ) -> None:
+        positionals = [
+            action for action in positionals if action is not self.subparsers
+        ]
+        ranges = [action.value_range() for action in positionals]
+
+        start = 0
+        for number, action in enumerate(positionals):
+            minimum, maximum = ranges[number]
+
+            # Leaves enough values for the arguments that come after
+            needed_later = sum(later[0] for later in ranges[number + 1:])
+            available = len(values) - start - needed_later
+
+            if available < minimum:
+                break
+
+            count = available if maximum is None else min(available, maximum)
+            action_values = values[start:start + count]
+            start += count
+
+            if action.nargs == OPTIONAL and not action_values:
+                continue
+
+            if action.nargs == ZERO_OR_MORE and not action_values:
+                if action.default is not None:
+                    continue
+
+            seen.append(action)
+            self.take_action(action, action_values, namespace)
+
+        extras.extend(values[start:])
+
+    def take_command(self, args: list, namespace: Namespace) -> list:
+        name = args[0]
+        sub_parser = self.subparsers.parsers.get(name)
+
+        if sub_parser is None:
+            choices = ", ".join(
+                repr(choice) for choice in self.subparsers.parsers
+            )
+            raise ArgumentError(
+                self.subparsers,
+                f"invalid choice: {name!r} (choose from {choices})"
+            )
+
+        if self.subparsers.dest is not SUPPRESS:
+            setattr(namespace, self.subparsers.dest, name)
+
+        # Like klarg.command, the subcommand gets everything after its name
+        sub_namespace, extras = sub_parser.parse_known_args(args[1:])
+        for key, value in vars(sub_namespace).items():
+            setattr(namespace, key, value)
+
+        return extras
+
+    def check_required(self, seen: list) -> None:
+        seen_ids = set(id(action) for action in seen)
+
+        missing = [
+            action.name() for action in self.actions
+            if action.required and id(action) not in seen_ids
+            and action is not self.subparsers
+        ]
+        if missing:
+            raise ArgumentError(
+                None,
+                f"the following arguments are required: {', '.join(missing)}"
+            )
+
+        for group in self.exclusive_groups:
+            used = [
+                action for action in group.actions if id(action) in seen_ids
+            ]
+
+            if len(used) > 1:
+                raise ArgumentError(
+                    used[1],
+                    f"not allowed with argument {used[0].name()}"
+                )
+
+            if group.required and not used:
+                names = " ".join(action.name() for action in group.actions)
+                raise ArgumentError(
+                    None,
+                    f"one of the arguments {names} is required"
+                )
+
+    def convert(self, action: _Action, value: str):
+        if action.type is None:
+            return value
+
+        try:
+            return action.type(value)
+
+        except ArgumentTypeError as error:
+            raise ArgumentError(action, str(error))
+
+        except (TypeError, ValueError):
+            type_name = getattr(action.type, "__name__", repr(action.type))
+            raise ArgumentError(
+                action,
+                f"invalid {type_name} value: {value!r}"
+            )
+
+    def check_choice(self, action: _Action, value) -> None:
+        if action.choices is not None and value not in action.choices:
+            choices = ", ".join(repr(choice) for choice in action.choices)
+            raise ArgumentError(
+                action,
+                f"invalid choice: {value!r} (choose from {choices})"
+            )
+
+    def take_action(
+        self,
+        action: _Action,
+        values: list,
+        namespace: Namespace
+    ) -> None:
+        kind = action.action
+
+        if kind == "help":
+            self.print_help()
+            self.exit()
+
+        if kind == "version":
+            print(action.version)
+            self.exit()
+
+        if kind in ("store_const", "store_true", "store_false"):
+            setattr(namespace, action.dest, action.const)
+            return
+
+        if kind == "count":
+            count = getattr(namespace, action.dest, None) or 0
+            setattr(namespace, action.dest, count + 1)
+            return
+
+        if kind == "append_const":
+            items = list(getattr(namespace, action.dest, None) or [])
+            setattr(namespace, action.dest, items + [action.const])
+            return
+
+        converted = [self.convert(action, value) for value in values]
+        for value in converted:
+            self.check_choice(action, value)
+
+        if action.nargs is None:
+            value = converted[0]
+        elif action.nargs == OPTIONAL:
+            value = converted[0] if converted else action.const
+        else:
+            value = converted
+
+        if kind == "store":
+            setattr(namespace, action.dest, value)
+            return
+
+        items = list(getattr(namespace, action.dest, None) or [])
+        if kind == "append":
+            items.append(value)
+        else:
+            items.extend(value)
+
+        setattr(namespace, action.dest, items)
+
+    """
+    Help and errors
+    """
+
+    def format_usage(self) -> str:
+        if self.usage is not None:
+            return f"usage: {self.usage % {'prog': self.prog}}\n"
+
+        options = []
+        positionals = []
+        for action in self.actions:
+            if action.help is SUPPRESS:
+                continue
+
+            if not action.option_strings:
+                positionals.append(action.format_values())
+                continue
+
+            part = action.option_strings[0]
+            if action.nargs != 0:
+                part += " " + action.format_values()
+
+            options.append(part if action.required else f"[{part}]")
+
+        return "usage: " + " ".join([self.prog] + options + positionals) + "\n"
+
+    def format_help(self) -> str:
+        def format_entry(name: str, help) -> str:
+            if not help:
+                return f"  {name}\n"
+
+            if len(name) > 20:
+                return f"  {name}\n{' ' * 24}{help}\n"
+
+            return f"  {name:<22}{help}\n"
+
+        positionals = []
+        options = []
+        for action in self.actions:
+            if action.help is SUPPRESS:
+                continue
+
+            if action.option_strings:
+                name = ", ".join(action.option_strings)
+                if action.nargs != 0:
+                    name = ", ".join(
+                        f"{option} {action.format_values()}"
+                        for option in action.option_strings
+                    )
+
+                options.append(format_entry(name, action.help))
+
+            elif action is self.subparsers:
+                positionals.append(
+                    format_entry(action.metavar_name(), action.help)
+                )
+                for name, help in action.helps:
+                    positionals.append(format_entry("  " + name, help))
+
+            else:
+                positionals.append(
+                    format_entry(action.metavar_name(), action.help)
+                )
+
+        text = self.format_usage()
+        if self.description:
+            text += f"\n{self.description}\n"
+
+        if positionals:
+            text += "\npositional arguments:\n" + "".join(positionals)
+
+        if options:
+            text += "\noptions:\n" + "".join(options)
+
+        if self.epilog:
+            text += f"\n{self.epilog}\n"
+
+        return text
+
+    def print_usage(self, file=None) -> None:
+        (file or sys.stdout).write(self.format_usage())
+
+    def print_help(self, file=None) -> None:
+        (file or sys.stdout).write(self.format_help())
+
+    def exit(self, status: int = 0, message=None) -> None:
+        if message:
+            sys.stderr.write(message)
+
+        sys.exit(status)
+
+    def error(self, message: str) -> None:
+        self.print_usage(sys.stderr)
+        self.exit(2, f"{self.prog}: error: {message}\n")
@@ -31,6 +31,5 @@ setup(
         "Development Status :: 5 - Production/Stable"
     ],
     python_requires=">=3.7",
-    package_dir={"": "."},
-    py_modules=["klarg"]
+    packages=["klarg"]
 )
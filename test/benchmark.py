@@ -0,0 +1,90 @@
+"""
+Measures how long klarg takes to import, and how long and how much memory
+it takes to index a very long list of arguments, run with:
+
+python benchmark.py
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+import subprocess
+
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def import_time(module: str, runs: int = 20) -> float:
+    """
+    Returns the smallest time in microseconds that `python -X importtime`
+    reports for importing `module` in a new interpreter.
+    """
+
+    environment = dict(os.environ, PYTHONPATH=PACKAGE_DIR)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=environment,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        ).stderr
+
+        # The last line is the module itself, with the time of its imports
+        cumulative = output.strip().splitlines()[-1].split("|")[1]
+        times.append(int(cumulative))
+
+    return min(times)
+
+
+def bench_import() -> None:
+    print("--------------- Import time ---------------")
+    for module in ["klarg", "klarg.compat", "argparse"]:
+        print(f"{module:<20}{import_time(module):>10} us")
+
+
+def make_args(size: int) -> list:
+    """
+    Returns `size` arguments that are a mix of values, long flags, short
+    flags and stacked short flags.
+    """
+
+    pattern = ["--input", "file-{}.txt", "-v", "--tag", "tag-{}", "-vvv"]
+    return [
+        pattern[number % len(pattern)].format(number)
+        for number in range(size)
+    ]
+
+
+def bench_index(size: int = 1000000) -> None:
+    sys.path.insert(0, PACKAGE_DIR)
+    import klarg
+
+    args_list = make_args(size)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    klarg._reindex(args_list)
+    seconds = time.perf_counter() - start
+    index_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Without tracemalloc slowing it down
+    start = time.perf_counter()
+    klarg._reindex(args_list)
+    untraced_seconds = time.perf_counter() - start
+
+    print("--------------- Index of 1M arguments ---------------")
+    print(f"{'arguments':<20}{size:>12}")
+    print(f"{'build time':<20}{untraced_seconds * 1000:>12.1f} ms")
+    print(f"{'traced build time':<20}{seconds * 1000:>12.1f} ms")
+    print(f"{'index memory':<20}{index_bytes:>12} bytes")
+    print(f"{'peak memory':<20}{peak_bytes:>12} bytes")
+    print(f"{'per argument':<20}{index_bytes / size:>12.2f} bytes")
+
+
+if __name__ == "__main__":
+    bench_import()
+    bench_index()
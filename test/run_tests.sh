@@ -14,6 +14,22 @@ python test_klarg_command.py --this-should-not-work test --some-number 10 --not-
 echo ""
 echo ""
 
+# Test klarg.parser functions
+echo "--------------- Testing klarg.parser functions ---------------"
+echo ""
+echo ""
+python test_klarg_parser.py
+echo ""
+echo ""
+
+# Test klarg.compat functions
+echo "--------------- Testing klarg.compat functions ---------------"
+echo ""
+echo ""
+python test_klarg_compat.py
+echo ""
+echo ""
+
 echo "--------------- End Tests ---------------"
 # Remove __pycache__ folder (for some reason, __pycache__ folders deeply annoy me)
 rm -rfv __pycache__
@@ -1,5 +1,7 @@
 import sys
 import os
+import pickle
+import tempfile
 sys.path.append(
     os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -23,6 +25,23 @@ class TestKlarg():
         self.test_exists()
         self.test_get_str()
         self.test_get_num()
+        self.test_get_count()
+        self.test_get_list()
+        self.test_iter_paths()
+        self.test_validate()
+        self.test_cache_parse()
+        self.test_get_parsed()
+        self.test_configure()
+        self.test_prefix_schemes()
+        self.test_codegen()
+        self.test_find_plugins()
+        self.test_cli()
+        self.test_get_into()
+        self.test_export_parsed()
+        self.test_serve()
+        self.test_get_file()
+        self.test_index_workers()
+        self.test_changed_in_place()
 
     def test_get_all(self):
         """
@@ -32,6 +51,9 @@ class TestKlarg():
 
         assert klarg.get_all() == ALL_ARGS
 
+        # Tests that ALL_ARGS is copied from sys.argv when it is first used
+        assert klarg.ALL_ARGS == ALL_ARGS
+
     def test_get_bool(self):
         """
         Tests that klarg.get_bool() returns if the argument exists or not.
@@ -130,5 +152,816 @@ class TestKlarg():
         assert should_raise_errors is None
 
 
+    def test_get_count(self):
+        """
+        Tests that klarg.get_count() counts every occurrence of a flag,
+        including stacked short flags.
+        """
+
+        assert klarg.get_count("some-number") == 1
+
+        assert klarg.get_count("non-existent-args", "n") == 1
+
+        assert klarg.get_count("non-existent-args", "s") == 0
+
+        # Tests that stacked short flags count once for every letter
+        stacked_args = ["-vvv", "--verbose", "file.txt", "-v"]
+        assert klarg.base_get_count("verbose", stacked_args, "v") == 5
+
+    def test_get_list(self):
+        """
+        Tests that klarg.get_list() collects the value of every occurrence
+        of a flag in order, and raises ERR_NONE for missing values.
+        """
+
+        def handle_err_none():
+            print("HANDLE_ERR_NONE works")
+
+        handle_errors = {
+            "ERR_NONE": handle_err_none
+        }
+
+        assert klarg.get_list("some-number") == ["10"]
+
+        assert klarg.get_list("non-existent-args") == []
+
+        # This should raise ERR_NONE
+        should_raise_none = klarg.get_list(
+            "number-no-args",
+            on_error=handle_errors
+        )
+        assert should_raise_none == []
+
+        repeated_args = ["--tag", "a", "-t", "b", "--other", "--tag", "c"]
+        assert klarg.base_get_list("tag", repeated_args, "t") == [
+            "a",
+            "b",
+            "c"
+        ]
+
+
+    def test_iter_paths(self):
+        """
+        Tests that klarg.iter_paths() expands patterns, including `**`,
+        and leaves arguments without patterns alone.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["a.gz", "b.txt", "deep/c.gz", "deep/er/d.gz"]:
+                path = os.path.join(directory, name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, "w").close()
+
+            def expand(*parts: str) -> list:
+                pattern = os.path.join(directory, *parts)
+                paths = klarg.iter_paths(pattern, sort=True)
+                return [os.path.relpath(path, directory) for path in paths]
+
+            assert expand("*.gz") == ["a.gz"]
+
+            assert expand("**", "*.gz") == [
+                "a.gz",
+                os.path.join("deep", "c.gz"),
+                os.path.join("deep", "er", "d.gz")
+            ]
+
+            assert expand("*", "?.gz") == [os.path.join("deep", "c.gz")]
+
+            assert expand("*.zip") == []
+
+            # Tests that a pattern ending with a separator only matches
+            # directories
+            assert list(klarg.iter_paths(
+                os.path.join(directory, "*", ""),
+                sort=True
+            )) == [os.path.join(directory, "deep", "")]
+            assert expand("**", "") == ["deep", os.path.join("deep", "er")]
+
+        assert list(klarg.iter_paths(["plain.txt", "10"])) == [
+            "plain.txt",
+            "10"
+        ]
+
+
+    def test_validate(self):
+        """
+        Tests that klarg.validate() checks every value, and handles
+        ERR_VALID in the order of the checks.
+        """
+
+        invalid_values = []
+
+        def handle_err_valid(value):
+            invalid_values.append(value)
+
+        handle_errors = {
+            "ERR_VALID": handle_err_valid
+        }
+
+        def is_number(value: str) -> bool:
+            return value.isdigit()
+
+        def always_fails(value: str) -> bool:
+            raise OSError("Could not check")
+
+        all_valid = klarg.validate(
+            [
+                (klarg.get_str("some-number"), is_number),
+                (klarg.get_str("not-number"), is_number),
+                (klarg.get_str("non-existent-args"), always_fails),
+                (["1", "b", "3", "d"], is_number),
+                ("e", always_fails)
+            ],
+            on_error=handle_errors
+        )
+
+        assert all_valid is False
+        assert invalid_values == ["1a", "b", "d", "e"]
+
+        assert klarg.validate([(klarg.get_list("some-number"), is_number)])
+
+
+    def test_cache_parse(self):
+        """
+        Tests that klarg.cache_parse() only runs the parse function again
+        when something in its key changes.
+        """
+
+        parse_calls = []
+
+        def parse_arguments():
+            parse_calls.append(True)
+            return {"some-number": klarg.get_num("some-number")}
+
+        with tempfile.TemporaryDirectory() as directory:
+            watched_file = os.path.join(directory, "watched.cfg")
+            open(watched_file, "w").close()
+
+            def cached_parse(schema: str = "1") -> dict:
+                return klarg.cache_parse(
+                    parse_arguments,
+                    schema=schema,
+                    files=[watched_file],
+                    cache_dir=directory
+                )
+
+            assert cached_parse() == {"some-number": 10}
+            assert cached_parse() == {"some-number": 10}
+            assert len(parse_calls) == 1
+
+            # Tests that changing the schema parses again
+            cached_parse(schema="2")
+            assert len(parse_calls) == 2
+
+            # Tests that changing a watched file parses again
+            os.utime(watched_file, ns=(0, 0))
+            cached_parse()
+            assert len(parse_calls) == 3
+
+            # Tests that running in another directory parses again
+            old_directory = os.getcwd()
+            os.chdir(directory)
+            try:
+                cached_parse()
+            finally:
+                os.chdir(old_directory)
+            assert len(parse_calls) == 4
+
+            # Tests that only the newest results are kept
+            max_results = klarg._cache._MAX_RESULTS
+            klarg._cache._MAX_RESULTS = 2
+            try:
+                cached_parse(schema="3")
+            finally:
+                klarg._cache._MAX_RESULTS = max_results
+            assert len([
+                name for name in os.listdir(directory)
+                if name.endswith(".pickle")
+            ]) == 2
+
+            # Tests that a result that can't be pickled is still returned,
+            # without leaving anything behind
+            def unpicklable():
+                return lambda: 10
+
+            saved = sorted(os.listdir(directory))
+            result = klarg.cache_parse(unpicklable, cache_dir=directory)
+            assert result() == 10
+            assert sorted(os.listdir(directory)) == saved
+
+    def test_get_parsed(self):
+        """
+        Tests that klarg.get_parsed() collects every flag in a schema into a
+        result that can't be changed and survives being pickled.
+        """
+
+        arguments = klarg.get_parsed({
+            "some-number": "num",
+            "not-number": ("str", "x"),
+            "number-no-args": "bool",
+            "non-existent-args": ("count", "n"),
+            "tag": "list"
+        })
+
+        assert arguments.some_number == 10
+        assert arguments["not-number"] == "1a"
+        assert arguments.number_no_args is True
+        assert arguments.non_existent_args == 1
+        assert arguments.tag == ()
+        assert arguments.get("missing", "default") == "default"
+
+        try:
+            arguments.some_number = 11
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("The parsed result was changed")
+
+        assert pickle.loads(pickle.dumps(arguments)) == arguments
+
+
+    def test_configure(self):
+        """
+        Tests that klarg.configure() changes the settings, and that lookups
+        use the new settings whether they were changed with configure() or
+        by setting a key of CONFIG.
+        """
+
+        args_list = ["+plus", "value", "--minus", "-vv"]
+
+        assert klarg.base_get_bool("plus", args_list) is False
+        assert klarg.base_get_count("minus", args_list) == 1
+
+        klarg.configure(long_prefix="+", short_prefix="!")
+        try:
+            assert klarg.base_get_str("plus", args_list) == "value"
+            assert klarg.base_get_bool("minus", args_list) is False
+            assert klarg.base_get_str(
+                "plus",
+                [os.fsencode(arg) for arg in args_list]
+            ) == b"value"
+        finally:
+            klarg.CONFIG["long_prefix"] = "--"
+            klarg.CONFIG["short_prefix"] = "-"
+
+        assert klarg.base_get_bool("plus", args_list) is False
+        assert klarg.base_get_count("v", args_list, "v") == 2
+
+        try:
+            klarg.configure(long_prefx="+")
+        except Exception:
+            pass
+        else:
+            raise AssertionError("An unknown setting was accepted")
+
+        try:
+            klarg.configure(help_flag=None)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("Settings that can't be used were accepted")
+
+        assert klarg.CONFIG["help_flag"] == ("--help", "-h")
+
+
+    def test_prefix_schemes(self):
+        """
+        Tests that flags given with the prefixes in "prefix_schemes" are
+        found under the long or short prefix, and that get_bool() is False
+        when the last time a flag was given it was turned off.
+        """
+
+        args_list = ["/name", "klarg", "+v", "-q", "+q", "-v", "+www"]
+
+        klarg.configure(prefix_schemes={
+            "/": "long",
+            "+": "short",
+            "-": ("short", False)
+        })
+        try:
+            assert klarg.base_get_str("name", args_list) == "klarg"
+            assert klarg.base_exists("--name", args_list) is True
+            assert klarg.base_exists("/name", args_list) is True
+            assert klarg.base_get_bool("v", args_list, "v") is False
+            assert klarg.base_get_bool("q", args_list, "q") is True
+            assert klarg.base_get_count("w", args_list, "w") == 3
+
+            command_parser = klarg.parser()
+            command_parser.parse(["/name"])
+            command_parser.append("+v")
+            command_parser.append("-v")
+            assert command_parser.get_bool("v", "v") is False
+            command_parser.pop()
+            assert command_parser.get_bool("v", "v") is True
+        finally:
+            klarg.configure(prefix_schemes={})
+
+        assert klarg.base_exists("--name", args_list) is False
+
+        # Tests that the schemes in CONFIG can't be changed in place, where
+        # the change would not be seen
+        schemes = {"/": "long"}
+        klarg.CONFIG["prefix_schemes"] = schemes
+        try:
+            schemes["+"] = "short"
+            assert "+" not in klarg.CONFIG["prefix_schemes"]
+            try:
+                klarg.CONFIG["prefix_schemes"]["+"] = "short"
+                assert False
+            except TypeError:
+                pass
+            assert klarg.base_get_str("name", ["/name", "x"]) == "x"
+        finally:
+            klarg.configure(prefix_schemes={})
+
+
+    def test_codegen(self):
+        """
+        Tests that the parser klarg.codegen() writes returns the same result
+        as klarg.get_parsed(), and that python -m klarg codegen --check finds
+        out when a generated file is out of date.
+        """
+
+        from klarg.__main__ import main
+
+        schema = {
+            "some-number": "num",
+            "not-number": ("str", "x"),
+            "number-no-args": "bool",
+            "non-existent-args": ("count", "n"),
+            "tag": "list"
+        }
+
+        generated = {}
+        exec(klarg.codegen(schema, ["build"]), generated)
+
+        arguments = generated["parse"]()
+        assert arguments == klarg.get_parsed(schema)
+        assert generated["get_command"](["-n", "build"]) == "build"
+
+        with tempfile.TemporaryDirectory() as directory:
+            sys.path.insert(0, directory)
+            schema_path = os.path.join(directory, "codegen_schema.py")
+            output = os.path.join(directory, "fast_cli.py")
+
+            try:
+                with open(schema_path, "w") as schema_file:
+                    schema_file.write(f"SCHEMA = {schema!r}\n")
+
+                args_list = [
+                    "codegen",
+                    "--schema",
+                    "codegen_schema:SCHEMA",
+                    "--output",
+                    output
+                ]
+                assert main(args_list) == 0
+                assert main(args_list + ["--check"]) == 0
+
+                with open(output, "a") as output_file:
+                    output_file.write("# Changed\n")
+                assert main(args_list + ["--check"]) == 1
+            finally:
+                sys.path.remove(directory)
+
+
+    def test_find_plugins(self):
+        """
+        Tests that klarg.find_plugins() finds the entry points of installed
+        packages, finds them again when a package is installed, and that
+        only the plugin that is run gets imported.
+        """
+
+        def install(directory: str, name: str) -> None:
+            dist_info = os.path.join(directory, f"{name}-1.0.dist-info")
+            os.mkdir(dist_info)
+            with open(os.path.join(dist_info, "METADATA"), "w") as file:
+                file.write(f"Metadata-Version: 2.1\nName: {name}\n")
+            entry_points = os.path.join(dist_info, "entry_points.txt")
+            with open(entry_points, "w") as file:
+                file.write(f"[klarg_tests.commands]\n{name} = {name}:main\n")
+            with open(os.path.join(directory, f"{name}.py"), "w") as file:
+                file.write("def main(command):\n")
+                file.write("    return command.get_str('name', 'n')\n")
+
+        with tempfile.TemporaryDirectory() as directory:
+            packages = os.path.join(directory, "packages")
+            cache_dir = os.path.join(directory, "cache")
+            os.mkdir(packages)
+            install(packages, "klarg_plugin_one")
+            sys.path.insert(0, packages)
+
+            try:
+                plugins = klarg.find_plugins("klarg_tests.commands", cache_dir)
+                assert list(plugins) == ["klarg_plugin_one"]
+                assert os.listdir(cache_dir) == [
+                    "plugins-klarg_tests.commands.marshal"
+                ]
+
+                install(packages, "klarg_plugin_two")
+                plugins = klarg.find_plugins("klarg_tests.commands", cache_dir)
+                assert sorted(plugins) == [
+                    "klarg_plugin_one",
+                    "klarg_plugin_two"
+                ]
+
+                assert klarg.base_dispatch(
+                    plugins,
+                    ["klarg_plugin_two", "-n", "klarg"]
+                ) == "klarg"
+                assert "klarg_plugin_two" in sys.modules
+                assert "klarg_plugin_one" not in sys.modules
+
+                # Entry points rewritten in place are found again
+                entry_points = os.path.join(
+                    packages,
+                    "klarg_plugin_one-1.0.dist-info",
+                    "entry_points.txt"
+                )
+                with open(entry_points, "a") as file:
+                    file.write("klarg_plugin_three = klarg_plugin_one:main\n")
+                changed = os.stat(entry_points).st_mtime_ns + 10 ** 9
+                os.utime(entry_points, ns=(changed, changed))
+                plugins = klarg.find_plugins("klarg_tests.commands", cache_dir)
+                assert "klarg_plugin_three" in plugins
+            finally:
+                sys.path.remove(packages)
+                sys.modules.pop("klarg_plugin_two", None)
+
+
+    def test_cli(self):
+        """
+        Tests that klarg.cli() collects the parameters of a function from
+        the arguments, and that the commands it makes are run by dispatch.
+        """
+
+        @klarg.cli
+        def main(some_number: int, *, not_number: str = "", tag: list = []):
+            return some_number, not_number, tag
+
+        assert main.run(["--not-number", "1a", "10"]) == (10, "1a", [])
+        assert main(1, tag=["a"]) == (1, "", ["a"])
+        assert main.binding is not None
+
+        @klarg.cli(name="build", short={"jobs": "j"})
+        def build(target, *, jobs: float = 1, dry_run: bool = False):
+            return target, jobs, dry_run
+
+        @klarg.cli(name="clean")
+        async def clean(*paths):
+            return paths
+
+        try:
+            assert build.binding is None
+            assert klarg.base_dispatch(
+                None,
+                ["build", "-j", "2.5", "--dry-run", "app"]
+            ) == ("app", 2.5, True)
+            assert clean.binding is None
+
+            assert klarg.base_dispatch(
+                None,
+                ["clean", "build", "dist"]
+            ) == ("build", "dist")
+
+            errors = []
+            build.on_error = {"ERR_NUM": errors.append}
+            build.run(["-j", "many", "app"])
+            assert errors == ["many"]
+        finally:
+            klarg.command.handlers.clear()
+
+        # Tests that partials, bound methods and callable objects are read
+        # from their signature
+        import functools
+
+        def scale(factor: float, value: int, *, unit: str = "m"):
+            return factor * value, unit
+
+        class Runner():
+            def run(self, target: str, *, jobs: int = 1):
+                return target, jobs
+
+            def __call__(self, target: str, *, jobs: int = 1):
+                return self.run(target, jobs=jobs)
+
+        try:
+            scaled = klarg.cli(functools.partial(scale, 2), name="scale")
+            assert scaled.run(["3", "--unit", "km"]) == (6, "km")
+
+            runner = Runner()
+            for function in (runner.run, runner):
+                command = klarg.cli(function, name="run")
+                assert command.run(["--jobs", "4", "app"]) == ("app", 4)
+        finally:
+            klarg.command.handlers.clear()
+
+    def test_get_into(self):
+        """
+        Tests that klarg.base_get_into() makes dataclasses and NamedTuples
+        from the arguments, with the defaults of the fields that are not
+        given.
+        """
+
+        import dataclasses
+        import typing
+
+        @dataclasses.dataclass(frozen=True)
+        class Options:
+            some_number: int
+            not_number: str = ""
+            tags: list = dataclasses.field(default_factory=list)
+            verbose: bool = dataclasses.field(
+                default=False,
+                metadata={"short": "v"}
+            )
+
+        options = klarg.base_get_into(
+            Options,
+            ["--some-number", "10", "-v", "--tags", "a", "--tags", "b"]
+        )
+        assert options == Options(10, "", ["a", "b"], True)
+        assert klarg.base_get_into(Options, ["--some-number", "1"]).tags == []
+
+        errors = []
+        klarg.base_get_into(Options, [], on_error={"ERR_NONE": (
+            lambda: errors.append("none")
+        )})
+        assert errors == ["none"]
+
+        class Point(typing.NamedTuple):
+            x: float
+            y: float = 0.0
+
+        assert klarg.base_get_into(Point, ["--x", "1.5"]) == (1.5, 0.0)
+        command = klarg.command("point", ["point", "--x", "1", "--y", "2"])
+        assert command.get_into(Point) == (1.0, 2.0)
+
+    def test_export_parsed(self):
+        """
+        Tests that klarg.base_export_parsed() hands a result to
+        base_get_parsed() for the same schema and arguments, and that
+        anything else is parsed again.
+        """
+
+        schema = {"some-number": "num", "tag": "list", "verbose": "count"}
+        args_list = ["--some-number", "10", "--tag", "a", "--verbose"]
+
+        try:
+            result = klarg.base_get_parsed(schema, args_list)
+            assert not result.inherited
+            klarg.base_export_parsed(result, schema, args_list)
+
+            other_schema = {"some-number": "str"}
+            other = klarg.base_get_parsed(other_schema, args_list)
+            klarg.base_export_parsed(other, other_schema, args_list)
+
+            inherited = klarg.base_get_parsed(schema, args_list)
+            assert inherited.inherited and inherited == result
+            assert klarg.base_get_parsed(other_schema, args_list).inherited
+
+            changed = klarg.base_get_parsed(schema, ["--some-number", "2"])
+            assert not changed.inherited and changed.some_number == 2
+
+            os.environ["KLARG_PARSED"] = "not base64"
+            assert not klarg.base_get_parsed(schema, args_list).inherited
+            os.environ["KLARG_PARSED"] = "SzEoOTk5OTk5OTk5Og=="
+            assert not klarg.base_get_parsed(schema, args_list).inherited
+        finally:
+            os.environ.pop("KLARG_PARSED", None)
+
+        # Only a hash of many arguments is handed down, so child processes
+        # can still be started
+        import subprocess
+
+        args_list = ["--verbose", "--some-number", "10"]
+        args_list += [f"file-{number}.txt" for number in range(5000)]
+        child = (
+            "import sys\n"
+            f"sys.path.insert(0, {os.path.dirname(klarg.__path__[0])!r})\n"
+            "import klarg\n"
+            f"result = klarg.base_get_parsed({schema!r}, sys.argv[1:])\n"
+            "print(result.inherited, result.some_number)\n"
+        )
+
+        try:
+            result = klarg.base_get_parsed(schema, args_list)
+            value = klarg.base_export_parsed(result, schema, args_list)
+            assert value is not None and len(value) < 1024
+
+            output = subprocess.run(
+                [sys.executable, "-c", child, *args_list],
+                stdout=subprocess.PIPE,
+                check=True
+            ).stdout
+            assert output.split() == [b"True", b"10"]
+
+            # Values too large to hand down are not exported
+            tags = []
+            for number in range(5000):
+                tags += ["--tag", f"tag-{number}"]
+            large = klarg.base_get_parsed(schema, tags)
+            assert klarg.base_export_parsed(large, schema, tags) is None
+            assert os.environ["KLARG_PARSED"] == value
+        finally:
+            os.environ.pop("KLARG_PARSED", None)
+
+    def test_serve(self):
+        """
+        Tests that klarg.client() runs a command in a klarg.serve() server,
+        with the arguments, directory, environment and standard streams of
+        the client, and returns its exit code, even while another client
+        sends nothing, and that requests that fail are shown to the client.
+        """
+
+        import marshal
+        import signal
+        import socket
+
+        if not hasattr(os, "fork"):
+            return
+
+        def build(command):
+            jobs = command.get_num("jobs", "j")
+            print(f"{os.getcwd()} {jobs} {os.environ['KLARG_TEST']}")
+            return jobs
+
+        def fail(command):
+            sys.exit("failed")
+
+        with tempfile.TemporaryDirectory() as directory:
+            socket_path = os.path.join(directory, "klarg.sock")
+
+            ready_read, ready_write = os.pipe()
+
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    os.close(ready_read)
+                    klarg.serve(
+                        socket_path,
+                        {"build": build, "fail": fail},
+                        ready=lambda: os.write(ready_write, b"1")
+                    )
+                finally:
+                    os._exit(0)
+
+            os.close(ready_write)
+            silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                # Nothing is read if the server stopped before it was ready
+                ready = os.read(ready_read, 1)
+                os.close(ready_read)
+                assert ready == b"1"
+
+                silent.connect(socket_path)
+
+                output_path = os.path.join(directory, "output")
+                old_directory = os.getcwd()
+                os.environ["KLARG_TEST"] = "from the client"
+                with open(output_path, "w+") as output:
+                    os.chdir(directory)
+                    try:
+                        stdio = (0, output.fileno(), output.fileno())
+                        assert klarg.client(
+                            socket_path,
+                            ["build", "-j", "3"],
+                            stdio
+                        ) == 3
+                        assert klarg.client(socket_path, ["fail"], stdio) == 1
+                    finally:
+                        os.chdir(old_directory)
+                        os.environ.pop("KLARG_TEST")
+
+                    output.seek(0)
+                    assert output.read() == (
+                        f"{os.path.realpath(directory)} 3 from the client\n"
+                        "failed\n"
+                    )
+
+                    # A request the server can't run gets an exit code and
+                    # the error, instead of nothing
+                    output.seek(0)
+                    output.truncate()
+                    with socket.socket(socket.AF_UNIX) as connection:
+                        connection.connect(socket_path)
+                        klarg._daemon._send_request(
+                            connection,
+                            marshal.dumps((0, ["build"], directory, {})),
+                            stdio
+                        )
+                        connection.shutdown(socket.SHUT_WR)
+                        assert marshal.loads(connection.recv(64)) == 1
+
+                    output.seek(0)
+                    assert "Unknown klarg client protocol 0" in output.read()
+
+            finally:
+                silent.close()
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+
+            assert not os.path.exists(socket_path)
+
+    def test_get_file(self):
+        """
+        Tests that klarg.base_get_file() only opens @path values when they
+        are used, and gives the same value through every accessor.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "keys.txt")
+            with open(path, "wb") as keys_file:
+                keys_file.write(b"first\nsecond\nthird")
+
+            keys = klarg.base_get_file("keys", ["--keys", "@" + path], "k")
+            assert keys.path == path and keys.map is None
+            assert len(keys) == 18 and keys.map is None
+
+            with keys:
+                assert list(keys.lines()) == [b"first", b"second", b"third"]
+                assert keys.map is not None
+                with keys.view() as view:
+                    assert view[:5] == b"first"
+                assert keys.text() == "first\nsecond\nthird"
+            assert keys.map is None
+
+            assert pickle.loads(pickle.dumps(keys)).bytes() == keys.bytes()
+
+            empty_path = os.path.join(directory, "empty")
+            open(empty_path, "wb").close()
+            empty = klarg.base_get_file("keys", ["--keys", "@" + empty_path])
+            assert empty.bytes() == b"" and list(empty.lines()) == []
+
+        inline = klarg.base_get_file("keys", ["--keys", "@@home"])
+        assert inline.path is None and inline.text() == "@home"
+        assert pickle.loads(pickle.dumps(inline)).text() == "@home"
+        assert klarg.base_get_file("keys", []) is None
+        assert klarg.base_get_file("keys", [b"--keys", b"raw"]).bytes() == (
+            b"raw"
+        )
+
+        # Arguments that were not valid UTF-8 are given back as they were
+        name = os.fsdecode(b"caf\xe9.json")
+        assert klarg.base_get_file("keys", ["--keys", name]).bytes() == (
+            b"caf\xe9.json"
+        )
+
+    def test_index_workers(self):
+        """
+        Tests that an argument list indexed in parts at the same time with
+        "index_workers" is indexed exactly like it is in one pass, with
+        flags and their values in different parts.
+        """
+
+        args_list = []
+        for number in range(50):
+            args_list += [f"--flag-{number % 7}", str(number), "-vv", "x"]
+
+        serial = klarg._ArgIndex(args_list)
+
+        # Indexed in parts even with one CPU
+        chunk = klarg._INDEX_CHUNK
+        usable_cpus = klarg._usable_cpus
+        klarg._INDEX_CHUNK = 5
+        klarg._usable_cpus = lambda: 3
+        try:
+            klarg.configure(index_workers=3)
+            parallel = klarg._ArgIndex(args_list)
+            assert parallel.kinds == serial.kinds
+            assert list(parallel.positions) == list(serial.positions)
+            for flag, positions in serial.positions.items():
+                assert parallel.positions[flag] == positions
+            assert parallel.counts == serial.counts
+
+            assert klarg.base_get_list("flag-3", args_list) == [
+                str(number) for number in range(3, 50, 7)
+            ]
+            assert klarg.base_get_count("v", args_list, "v") == 100
+
+            try:
+                klarg.configure(index_workers=0)
+                assert False
+            except Exception as error:
+                assert "index_workers" in str(error)
+        finally:
+            klarg._INDEX_CHUNK = chunk
+            klarg._usable_cpus = usable_cpus
+            klarg.configure(index_workers=1)
+
+    def test_changed_in_place(self):
+        """
+        Tests that changing the list get_all() returns doesn't change the
+        arguments that are looked up.
+        """
+
+        command = klarg.command("a", ["a", "--level", "1"])
+        arguments = command.get_all()
+        arguments[1] = "2"
+        assert command.get_num("level") == 1
+        assert command.get_all() == ["--level", "1"]
+        assert klarg.get_all() is not klarg.get_all()
+
+
 TestKlarg()
 print("All Tests Passed")
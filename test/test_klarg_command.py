@@ -25,6 +25,9 @@ class TestKlarg():
         self.test_exists()
         self.test_get_str()
         self.test_get_num()
+        self.test_get_count()
+        self.test_get_list()
+        self.test_dispatch()
 
     def test_get_all(self):
         """
@@ -136,5 +139,110 @@ class TestKlarg():
         assert should_raise_errors is None
 
 
+    def test_get_count(self):
+        """
+        Tests that klarg.get_count() counts every occurrence of a flag,
+        including stacked short flags.
+        """
+
+        assert self.test_command.get_count("some-number") == 1
+
+        assert self.test_command.get_count("non-existent-args", "n") == 1
+
+        assert self.test_command.get_count("non-existent-args", "s") == 0
+
+        # Tests that stacked short flags count once for every letter
+        stacked_args = ["-vvv", "--verbose", "file.txt", "-v"]
+        assert klarg.base_get_count("verbose", stacked_args, "v") == 5
+
+    def test_get_list(self):
+        """
+        Tests that klarg.get_list() collects the value of every occurrence
+        of a flag in order, and raises ERR_NONE for missing values.
+        """
+
+        def handle_err_none():
+            print("HANDLE_ERR_NONE works")
+
+        handle_errors = {
+            "ERR_NONE": handle_err_none
+        }
+
+        assert self.test_command.get_list("some-number") == ["10"]
+
+        assert self.test_command.get_list("non-existent-args") == []
+
+        # This should raise ERR_NONE
+        should_raise_none = self.test_command.get_list(
+            "number-no-args",
+            on_error=handle_errors
+        )
+        assert should_raise_none == []
+
+        repeated_args = ["--tag", "a", "-t", "b", "--other", "--tag", "c"]
+        assert klarg.base_get_list("tag", repeated_args, "t") == [
+            "a",
+            "b",
+            "c"
+        ]
+
+
+    def test_dispatch(self):
+        """
+        Tests that klarg.dispatch() runs the handler of the command that
+        was given, with the values of the resolvers, for both normal and
+        async functions.
+        """
+
+        def other_handler(command):
+            raise AssertionError("The wrong handler was run")
+
+        def handler(command, number):
+            return (command.get_all(), number)
+
+        def get_number(command):
+            return command.get_num("some-number")
+
+        assert klarg.dispatch(
+            {"other": other_handler, "test": handler},
+            resolvers={"number": get_number}
+        ) == (ALL_ARGS, 10)
+
+        async def async_get_number(command):
+            return command.get_num("some-number")
+
+        async def async_handler(command, number, same_number):
+            return (await number) + (await same_number)
+
+        assert klarg.dispatch(
+            {"test": async_handler},
+            resolvers={"number": async_get_number, "same_number": get_number}
+        ) == 20
+
+        assert klarg.dispatch({"other": other_handler}) is None
+
+        # Async functions behind a functools.partial or in a __call__
+        # method are run too, instead of returning a coroutine
+        import functools
+
+        async def scaled(command, scale):
+            return command.get_num("some-number") * scale
+
+        class Handler():
+            async def __call__(self, command, number):
+                return await number
+
+        assert klarg.dispatch(
+            {"test": functools.partial(scaled, scale=3)}
+        ) == 30
+        assert klarg.dispatch(
+            {"test": Handler()},
+            resolvers={"number": functools.partial(async_get_number)}
+        ) == 10
+        assert klarg.dispatch(
+            {"test": lambda command: scaled(command, 2)}
+        ) == 20
+
+
 TestKlarg()
 print("All Tests Passed")
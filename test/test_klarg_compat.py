@@ -0,0 +1,151 @@
+import sys
+import os
+import io
+import contextlib
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from klarg.compat import ArgumentParser, Namespace
+
+
+class TestKlargCompat():
+
+    def __init__(self):
+        self.test_options()
+        self.test_positionals()
+        self.test_subparsers()
+        self.test_errors()
+        self.test_unsupported()
+
+    def make_parser(self) -> ArgumentParser:
+        parser = ArgumentParser(prog="tool")
+        parser.add_argument("-v", "--verbose", action="count")
+        parser.add_argument("-q", "--quiet", action="store_true")
+        parser.add_argument("-n", "--number", type=int, default="3")
+        parser.add_argument("--tag", action="append")
+        parser.add_argument("--mode", choices=["fast", "slow"])
+        parser.add_argument("source")
+        parser.add_argument("targets", nargs="*")
+        return parser
+
+    def test_options(self):
+        """
+        Tests that options are parsed like argparse parses them.
+        """
+
+        parser = self.make_parser()
+
+        assert parser.parse_args(["src"]) == Namespace(
+            verbose=None,
+            quiet=False,
+            number=3,
+            tag=None,
+            mode=None,
+            source="src",
+            targets=[]
+        )
+
+        arguments = parser.parse_args(
+            ["-vv", "--tag", "a", "--number=5", "src", "--tag", "b", "-qv"]
+        )
+        assert arguments.verbose == 3
+        assert arguments.quiet is True
+        assert arguments.number == 5
+        assert arguments.tag == ["a", "b"]
+
+        # Tests that unique prefixes of long options are accepted
+        assert parser.parse_args(["--mo", "fast", "src"]).mode == "fast"
+
+        # Tests that short options can have their value attached
+        assert parser.parse_args(["-n-4", "src"]).number == -4
+
+    def test_positionals(self):
+        """
+        Tests that positional arguments are shared out like argparse.
+        """
+
+        parser = self.make_parser()
+
+        arguments = parser.parse_args(["src", "a", "-q", "b", "--", "-c"])
+        assert arguments.source == "src"
+        assert arguments.targets == ["a", "b", "-c"]
+
+    def test_subparsers(self):
+        """
+        Tests that subcommands get the arguments after their name, like
+        klarg.command.
+        """
+
+        parser = ArgumentParser(prog="tool")
+        parser.add_argument("--debug", action="store_true")
+        subparsers = parser.add_subparsers(dest="command", required=True)
+
+        add_parser = subparsers.add_parser("add", aliases=["a"])
+        add_parser.add_argument("item")
+        add_parser.add_argument("-f", "--force", action="store_true")
+        add_parser.set_defaults(handler="add")
+
+        arguments = parser.parse_args(["--debug", "a", "thing", "-f"])
+        assert arguments == Namespace(
+            debug=True,
+            command="a",
+            item="thing",
+            force=True,
+            handler="add"
+        )
+
+    def test_errors(self):
+        """
+        Tests that errors exit with code 2 and the argparse message.
+        """
+
+        parser = self.make_parser()
+
+        def error_for(args: list) -> str:
+            errors = io.StringIO()
+            with contextlib.redirect_stderr(errors):
+                try:
+                    parser.parse_args(args)
+                except SystemExit as exit:
+                    assert exit.code == 2
+                    return errors.getvalue().splitlines()[-1]
+
+            raise AssertionError(f"{args} did not exit")
+
+        assert error_for([]) == (
+            "tool: error: the following arguments are required: source"
+        )
+
+        assert error_for(["-n", "ten", "src"]) == (
+            "tool: error: argument -n/--number: invalid int value: 'ten'"
+        )
+
+        assert error_for(["--mode", "medium", "src"]) == (
+            "tool: error: argument --mode: invalid choice: 'medium' "
+            "(choose from 'fast', 'slow')"
+        )
+
+        assert error_for(["src", "--unknown"]) == (
+            "tool: error: unrecognized arguments: --unknown"
+        )
+
+    def test_unsupported(self):
+        """
+        Tests that parts of argparse that are not supported raise errors
+        instead of being ignored.
+        """
+
+        parser = ArgumentParser(prog="tool")
+
+        for kwargs in [{"nargs": "..."}, {"deprecated": True}]:
+            try:
+                parser.add_argument("--option", **kwargs)
+            except NotImplementedError:
+                continue
+
+            raise AssertionError(f"{kwargs} was accepted")
+
+
+TestKlargCompat()
+print("All Tests Passed")
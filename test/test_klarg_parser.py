@@ -0,0 +1,126 @@
+import sys
+import os
+import tempfile
+
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import klarg
+
+COMMANDS = ["add", "remove", "list"]
+
+
+class TestKlargParser():
+
+    def __init__(self):
+        self.test_parser = klarg.parser(COMMANDS)
+        self.test_parse()
+        self.test_get_command()
+        self.test_append()
+        self.test_pop()
+        self.test_bytes()
+
+    def test_parse(self):
+        """
+        Tests that klarg.parser.parse() replaces the arguments that the
+        accessors work on.
+        """
+
+        self.test_parser.parse(["add", "--name", "klarg", "-vv"])
+        assert self.test_parser.get_str("name") == "klarg"
+        assert self.test_parser.get_count("verbose", "v") == 2
+
+        self.test_parser.parse(["list", "--all"])
+        assert self.test_parser.get_all() == ["list", "--all"]
+        assert self.test_parser.get_str("name") is None
+        assert self.test_parser.get_bool("all") is True
+        assert self.test_parser.get_count("verbose", "v") == 0
+
+    def test_get_command(self):
+        """
+        Tests that klarg.parser.get_command() returns the first registered
+        command, or None.
+        """
+
+        self.test_parser.parse(["--quiet", "remove", "add"])
+        assert self.test_parser.get_command() == "remove"
+
+        self.test_parser.parse(["--quiet", "unknown"])
+        assert self.test_parser.get_command() is None
+
+    def test_append(self):
+        """
+        Tests that klarg.parser.append() keeps the index up to date.
+        """
+
+        self.test_parser.parse(["add"])
+        self.test_parser.append("--tag")
+        self.test_parser.append("a")
+        self.test_parser.append("-v")
+        self.test_parser.append("--tag")
+        self.test_parser.append("b")
+
+        assert self.test_parser.get_list("tag") == ["a", "b"]
+        assert self.test_parser.get_count("verbose", "v") == 1
+        assert self.test_parser.exists("--tag") is True
+
+    def test_pop(self):
+        """
+        Tests that klarg.parser.pop() keeps the index up to date when
+        removing the last argument, or any other argument.
+        """
+
+        self.test_parser.parse(["add", "-vvv", "--tag", "a", "--tag", "b"])
+
+        assert self.test_parser.pop() == "b"
+        assert self.test_parser.pop() == "--tag"
+        assert self.test_parser.get_list("tag") == ["a"]
+
+        assert self.test_parser.pop(1) == "-vvv"
+        assert self.test_parser.get_count("verbose", "v") == 0
+        assert self.test_parser.get_str("tag") == "a"
+        assert self.test_parser.get_all() == ["add", "--tag", "a"]
+
+
+    def test_bytes(self):
+        """
+        Tests that arguments read as bytes, which don't have to be valid
+        UTF-8, are parsed and returned as bytes.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            response_path = os.path.join(directory, "arguments.txt")
+            with open(response_path, "wb") as response_file:
+                response_file.write(
+                    b"add\n--name\ncaf\xe9.txt\n-vv\n--size\n12\n--tag\nb"
+                )
+
+            self.test_parser.parse(klarg.read_args(response_path))
+
+        assert self.test_parser.get_command() == b"add"
+        assert self.test_parser.get_str("name") == b"caf\xe9.txt"
+        assert self.test_parser.get_num("size") == 12
+        assert self.test_parser.get_count("verbose", "v") == 2
+        assert self.test_parser.get_bool("size") is True
+        assert self.test_parser.exists("--name") is True
+
+        self.test_parser.pop()
+        self.test_parser.append(b"c")
+        assert self.test_parser.get_list("tag") == [b"c"]
+
+        # Tests that commands are found with their names as text
+        args_list = list(self.test_parser.all_arguments)
+        assert klarg.command("add", args_list).get_num("size") == 12
+        handled = klarg.base_dispatch(
+            {"add": lambda command: command.get_str("name")},
+            args_list
+        )
+        assert handled == b"caf\xe9.txt"
+
+        # Tests that going back to text arguments works
+        self.test_parser.parse(["add", "--name", "klarg"])
+        assert self.test_parser.get_str("name") == "klarg"
+
+
+TestKlargParser()
+print("All Tests Passed")